@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark do formato em disco do cache persistente
+
+Monta os DataFrames de cada categoria a partir dos surveys sintéticos do
+servidor local (lime_stub_server.py, todas as colunas) e compara o formato
+antigo (surveys_cache.json, JSON de cada DataFrame dentro de outro JSON)
+com os arquivos colunares por categoria (pickle protocolo 5 com buffers
+fora de banda): tempo de gravação, tempo de leitura, tamanho em disco e
+preservação dos dtypes.
+
+Uso:
+    python bench_cache.py [escala ...]
+
+Exemplo:
+    python bench_cache.py 1 10
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import pandas as pd
+
+from config.settings import Config
+from utils import columnar_store
+from lime_stub_server import synthetic_surveys
+
+# Repetições de cada medida (vale a melhor)
+RODADAS = 3
+
+
+def montar_dados(escala: float) -> dict:
+    """DataFrames por categoria como o carregador os monta (id numérico, form_origem)"""
+    surveys = synthetic_surveys(escala)
+    dados = {}
+    for categoria, ids in Config.SURVEY_IDS.items():
+        frames = []
+        for survey_id in (ids if isinstance(ids, list) else [ids]):
+            df = pd.DataFrame(list(surveys[str(survey_id)].iter_responses()))
+            df['form_origem'] = str(survey_id)
+            df['id'] = pd.to_numeric(df['id'], errors='coerce')
+            frames.append(df)
+        dados[categoria] = pd.concat(frames, ignore_index=True)
+    return dados
+
+
+def gravar_json(diretorio: Path, dados: dict) -> int:
+    path = diretorio / 'surveys_cache.json'
+    columnar_store.dump_legacy_json(path, dados)
+    return path.stat().st_size
+
+
+def ler_json(diretorio: Path) -> dict:
+    return columnar_store.load_legacy_json(diretorio / 'surveys_cache.json')
+
+
+def gravar_colunar(diretorio: Path, dados: dict) -> int:
+    return sum(columnar_store.write_frame(diretorio / f'{categoria}{columnar_store.EXTENSION}', df)
+               for categoria, df in dados.items())
+
+
+def ler_colunar(diretorio: Path) -> dict:
+    return {categoria: columnar_store.read_frame(diretorio / f'{categoria}{columnar_store.EXTENSION}')
+            for categoria in Config.SURVEY_IDS}
+
+
+def medir(gravar, ler, dados: dict) -> dict:
+    gravacoes, leituras = [], []
+    for _ in range(RODADAS):
+        diretorio = Path(tempfile.mkdtemp(prefix='bench_cache_'))
+        try:
+            inicio = time.perf_counter()
+            tamanho = gravar(diretorio, dados)
+            gravacoes.append(time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            lidos = ler(diretorio)
+            leituras.append(time.perf_counter() - inicio)
+        finally:
+            shutil.rmtree(diretorio)
+    dtypes = sum(1 for categoria, df in dados.items()
+                 for coluna in df.columns if lidos[categoria][coluna].dtype != df[coluna].dtype)
+    return {'gravar': min(gravacoes), 'ler': min(leituras), 'tamanho': tamanho, 'dtypes': dtypes}
+
+
+def bench_escala(escala: float):
+    dados = montar_dados(escala)
+    respostas = sum(len(df) for df in dados.values())
+    colunas = sum(df.shape[1] for df in dados.values())
+    print(f"\n📊 Escala {escala:g}x ({respostas} respostas, {colunas} colunas em {len(dados)} categorias)")
+
+    resultados = {
+        'json': medir(gravar_json, ler_json, dados),
+        'colunar': medir(gravar_colunar, ler_colunar, dados),
+    }
+    mib = 2 ** 20
+    for formato, r in resultados.items():
+        print(f"   • {formato:<8} gravar {r['gravar']:6.2f}s   ler {r['ler']:6.2f}s   "
+              f"{r['tamanho'] / mib:7.1f} MiB   {r['dtypes']} colunas com dtype alterado")
+    json_, colunar = resultados['json'], resultados['colunar']
+    print(f"   → colunar: gravação {json_['gravar'] / colunar['gravar']:.1f}x, "
+          f"leitura {json_['ler'] / colunar['ler']:.1f}x mais rápidas, "
+          f"{json_['tamanho'] / colunar['tamanho']:.1f}x menor")
+
+
+def main():
+    escalas = [float(a) for a in sys.argv[1:] if not a.startswith('--')] or [1.0]
+    print("🚀 BENCHMARK DO FORMATO DO CACHE EM DISCO")
+    print("=" * 50)
+    for escala in escalas:
+        bench_escala(escala)
+
+
+if __name__ == "__main__":
+    main()
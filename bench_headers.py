@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da normalização dos cabeçalhos das exportações
+
+Compara o pipeline anterior (question_map.get + cadeia de .str.replace +
+limpar_html por coluna) com o mapeamento de colunas calculado uma vez e
+guardado junto com o question_map, em um survey sintético com a largura
+do maior survey de processo (perguntas com HTML, quebras de linha e
+espaços não separáveis, além das subperguntas P4Q8[SQ...]).
+
+Uso:
+    python bench_headers.py [n_perguntas] [n_respostas] [repetições]
+"""
+
+import sys
+import os
+import re
+import time
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from data.lime_api import LimeSurveyAPI
+from utils.question_map_cache import QuestionMapCache
+
+SURVEY_ID = '917441'
+METADADOS = ['id', 'submitdate', 'lastpage', 'startlanguage', 'seed', 'startdate', 'datestamp']
+
+
+def limpar_html_anterior(texto):
+    if pd.isna(texto):
+        return texto
+    texto = str(texto)
+    texto = re.sub(r'<[^>]+>', '', texto)
+    return texto.strip()
+
+
+def cabecalhos_anteriores(colunas, question_map: dict) -> pd.Index:
+    """Etapa dos cabeçalhos do pipeline anterior (referência)"""
+    colunas = pd.Index([question_map.get(col, col) for col in colunas])
+    colunas = colunas.str.strip().str.replace(r'\s+', ' ', regex=True).str.replace('\xa0', '', regex=False)
+    colunas = pd.Index([limpar_html_anterior(col) for col in colunas])
+    return colunas.str.strip()
+
+
+def finalize_frame_anterior(df: pd.DataFrame, survey_id: str, question_map: dict) -> pd.DataFrame:
+    """Pipeline de cabeçalhos antes do mapeamento em cache (referência)"""
+    df.columns = [question_map.get(col, col) for col in df.columns]
+    df['form_origem'] = survey_id
+    if 'id' in df.columns:
+        df['id'] = pd.to_numeric(df['id'], errors='coerce')
+    df.columns = df.columns.str.strip().str.replace(r'\s+', ' ', regex=True).str.replace('\xa0', '', regex=False)
+    df.columns = [limpar_html_anterior(col) for col in df.columns]
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def survey_largo(n_perguntas: int, n_respostas: int) -> tuple:
+    """Retorna (question_map, DataFrame bruto) de um survey de processo largo"""
+    question_map = {}
+    colunas = list(METADADOS)
+    for q in range(n_perguntas):
+        codigo = f'P{q % 10}Q{q}'
+        texto = f'<p><strong>Pergunta {q}</strong>&nbsp;sobre o\xa0processo</p>\n<br />  detalhes {q}'
+        question_map[codigo] = f'{codigo}. {texto}'
+        colunas.append(codigo)
+        # Perguntas de múltipla escolha exportam uma coluna por subpergunta
+        if q % 8 == 0:
+            colunas.extend(f'{codigo}[SQ{s:03d}]' for s in range(1, 9))
+    linhas = [[str(r + 1)] + ['A1'] * (len(colunas) - 1) for r in range(n_respostas)]
+    return question_map, pd.DataFrame(linhas, columns=colunas)
+
+
+def medir(funcao, repeticoes: int, preparar=None) -> float:
+    """Menor tempo entre as repetições, em milissegundos (sem contar preparar)"""
+    tempos = []
+    for _ in range(repeticoes):
+        argumento = preparar() if preparar else None
+        inicio = time.perf_counter()
+        funcao(argumento)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def main():
+    argumentos = [int(a) for a in sys.argv[1:]]
+    n_perguntas, n_respostas, repeticoes = (argumentos + [180, 2000, 20][len(argumentos):])[:3]
+
+    question_map, bruto = survey_largo(n_perguntas, n_respostas)
+    print("🚀 BENCHMARK DOS CABEÇALHOS")
+    print("=" * 50)
+    print(f"   {len(bruto.columns)} colunas, {len(bruto)} respostas, {repeticoes} repetições")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        api = LimeSurveyAPI.__new__(LimeSurveyAPI)
+        api.question_maps = QuestionMapCache(Path(diretorio))
+        api.question_maps.set(SURVEY_ID, 'bench', question_map)
+
+        referencia = finalize_frame_anterior(bruto.copy(), SURVEY_ID, question_map)
+        novo = api.normalize_frame(bruto.copy(), SURVEY_ID, question_map)
+        assert list(novo.columns) == list(referencia.columns), "Colunas divergentes do pipeline anterior"
+
+        def descartar_mapeamento():
+            # Primeira exportação após mudar a estrutura: o mapeamento ainda não existe
+            api.question_maps.set(SURVEY_ID, 'bench', question_map)
+            return bruto.copy()
+
+        anterior = medir(lambda df: finalize_frame_anterior(df, SURVEY_ID, question_map),
+                         repeticoes, bruto.copy)
+        frio = medir(lambda df: api.normalize_frame(df, SURVEY_ID, question_map),
+                     repeticoes, descartar_mapeamento)
+        quente = medir(lambda df: api.normalize_frame(df, SURVEY_ID, question_map),
+                       repeticoes, bruto.copy)
+
+        # Só a etapa dos cabeçalhos, sem form_origem e conversão do id
+        cabecalhos_anterior = medir(lambda _: cabecalhos_anteriores(bruto.columns, question_map), repeticoes)
+        header_map = api.question_maps.get_header_map(SURVEY_ID, question_map)
+        cabecalhos_cache = medir(lambda _: [header_map.get(col, col) for col in bruto.columns], repeticoes)
+
+    print("   Cabeçalhos:")
+    print(f"   • anterior        {cabecalhos_anterior:8.2f} ms")
+    print(f"   • mapa em cache   {cabecalhos_cache:8.2f} ms   ({cabecalhos_anterior / cabecalhos_cache:5.1f}x)")
+    print("   Finalização completa do DataFrame:")
+    print(f"   • anterior        {anterior:8.2f} ms")
+    print(f"   • mapa frio       {frio:8.2f} ms   ({anterior / frio:5.1f}x, inclui gravar o mapa)")
+    print(f"   • mapa em cache   {quente:8.2f} ms   ({anterior / quente:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark da ingestão das exportações do LimeSurvey
+
+Gera uma exportação sintética no formato devolvido por export_responses e
+compara tempo e pico de memória (tracemalloc) entre os caminhos de decodificação.
+
+Uso:
+    python bench_ingest.py [respostas] [colunas]
+"""
+
+import sys
+import os
+import gc
+import time
+import json
+import csv
+import io
+import base64
+import random
+import tracemalloc
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.response_decoder import decode_csv_export, decode_json_export, decode_json_export_legacy
+
+
+def gerar_respostas(n_respostas: int, n_colunas: int, seed: int = 42) -> list:
+    """Gera respostas sintéticas parecidas com as do survey de processo"""
+    rng = random.Random(seed)
+    respostas = []
+    for i in range(1, n_respostas + 1):
+        resposta = {
+            'id': i,
+            'submitdate': f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00',
+            'P0Q0': rng.choice(['João Silva', 'Maria Souza', 'Ana Costa']),
+            'P0Q1': f'{rng.randint(1, 9999)}R0{rng.randint(1, 9)}',
+            'P0Q2': f'{rng.randint(1000000, 9999999)}-89.2023.8.26.0001',
+        }
+        for c in range(n_colunas):
+            resposta[f'P{c % 10}Q{c}'] = rng.choice([None, 'Sim', 'Não', 'Não se aplica', str(rng.randint(0, 99))])
+        respostas.append(resposta)
+    return respostas
+
+
+def gerar_payload_json(respostas: list) -> str:
+    """Codifica as respostas como export_responses faz com o formato 'json'"""
+    documento = json.dumps({'responses': respostas}, ensure_ascii=False)
+    return base64.b64encode(documento.encode('utf-8')).decode('ascii')
+
+
+def gerar_payload_csv(respostas: list) -> str:
+    """Codifica as respostas como export_responses faz com o formato 'csv'"""
+    colunas = list(dict.fromkeys(coluna for resposta in respostas for coluna in resposta))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=colunas, quoting=csv.QUOTE_ALL)
+    writer.writeheader()
+    writer.writerows(respostas)
+    return base64.b64encode(('\ufeff' + buffer.getvalue()).encode('utf-8')).decode('ascii')
+
+
+def medir(nome: str, funcao, payload: str) -> dict:
+    """Executa funcao(payload) medindo tempo e pico de memória"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    df = funcao(payload)
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tamanho_df = df.memory_usage(deep=True).sum()
+    print(f"   • {nome:<22} {duracao:7.2f}s   pico {pico / 2**20:8.1f} MiB   "
+          f"DataFrame {tamanho_df / 2**20:7.1f} MiB   ({pico / tamanho_df:.1f}x)")
+    return {'tempo': duracao, 'pico': pico, 'df': df}
+
+
+def bench_json_streaming(n_respostas: int, n_colunas: int):
+    """Compara a decodificação original com a decodificação em streaming"""
+    print(f"\n📊 JSON: {n_respostas} respostas x {n_colunas} colunas")
+    payload = gerar_payload_json(gerar_respostas(n_respostas, n_colunas))
+    print(f"   Payload base64: {len(payload) / 2**20:.1f} MiB")
+
+    legado = medir('json (original)', decode_json_export_legacy, payload)
+    streaming = medir('json (streaming)', decode_json_export, payload)
+
+    assert legado['df'].equals(streaming['df']), "Os dois caminhos devem produzir o mesmo DataFrame"
+    print(f"   Redução do pico de memória: {1 - streaming['pico'] / legado['pico']:.0%}")
+
+
+def bench_csv(n_respostas: int, n_colunas: int):
+    """Compara o caminho JSON com o CSV lido pelo parser C, sobre as mesmas respostas"""
+    print(f"\n📊 JSON x CSV: {n_respostas} respostas x {n_colunas} colunas")
+    respostas = gerar_respostas(n_respostas, n_colunas)
+    payload_json = gerar_payload_json(respostas)
+    payload_csv = gerar_payload_csv(respostas)
+    del respostas
+    print(f"   Payload base64: JSON {len(payload_json) / 2**20:.1f} MiB, CSV {len(payload_csv) / 2**20:.1f} MiB")
+
+    json_original = medir('json (original)', decode_json_export_legacy, payload_json)
+    json_streaming = medir('json (streaming)', decode_json_export, payload_json)
+    csv_c = medir('csv (parser C)', decode_csv_export, payload_csv)
+
+    assert csv_c['df'].shape == json_original['df'].shape, "CSV e JSON devem ter o mesmo formato"
+    for nome, resultado in (('original', json_original), ('streaming', json_streaming)):
+        print(f"   CSV vs JSON {nome}: {resultado['tempo'] / csv_c['tempo']:.1f}x mais rápido, "
+              f"pico {1 - csv_c['pico'] / resultado['pico']:.0%} menor")
+
+
+def main():
+    n_respostas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_colunas = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    print("🚀 BENCHMARK DE INGESTÃO")
+    print("=" * 50)
+    bench_json_streaming(n_respostas, n_colunas)
+    bench_csv(n_respostas, n_colunas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ponta a ponta do carregamento de dados (DataLoaderService._load_all_data)
+
+Sobe o servidor local do LimeSurvey (lime_stub_server.py) em outro processo,
+com surveys sintéticos em várias escalas do volume atual, e mede a carga
+completa nos modos em threads e asyncio: exportação, decodificação,
+montagem dos DataFrames e gravação do cache em disco.
+
+Uso:
+    python bench_loader.py [escala ...] [--latencia=ms] [--banda=MB/s]
+
+Exemplo:
+    python bench_loader.py 1 10 100 --latencia=50 --banda=10
+"""
+
+import sys
+import os
+import io
+import time
+import logging
+import resource
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+
+# Adicionar o diretório src ao path
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from config.settings import Config
+
+
+def iniciar_servidor(escala: float, latencia_ms: float, banda: float = 0.0) -> tuple:
+    """Inicia o servidor local em um subprocesso e retorna (processo, url)"""
+    processo = subprocess.Popen(
+        [sys.executable, os.path.join(RAIZ, 'lime_stub_server.py'), '0', str(escala), str(latencia_ms),
+         '0', str(banda)],
+        stdout=subprocess.PIPE, text=True
+    )
+    linha = processo.stdout.readline()
+    if ' em http' not in linha:
+        processo.kill()
+        raise RuntimeError(f"Servidor local não iniciou: {linha!r}")
+    print(f"   {linha.strip()}")
+    return processo, linha.split(' em ')[1].split()[0]
+
+
+def carregar(service, modo: str) -> dict:
+    """Executa uma carga completa, com caches do cliente vazios"""
+    Config.ASYNC_LOADER = modo == 'async'
+    service.cache.clear_cache()
+    service.lime_api.question_maps.clear()
+
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        service._load_all_data()
+    duracao = time.perf_counter() - inicio
+
+    dados = service.cache.get_data()
+    return {
+        'tempo': duracao,
+        'respostas': sum(len(df) for df in dados.values()),
+        'requisicoes': service.last_transport_stats.get('requests', 0),
+        'payload': service.last_payload_stats.get('total', {}),
+        'erro': service.cache.load_error,
+    }
+
+
+def bench_escala(service, escala: float, latencia_ms: float, banda: float = 0.0):
+    print(f"\n📊 Escala {escala:g}x (latência {latencia_ms:g} ms"
+          f"{f', banda {banda:g} MB/s' if banda else ''})")
+    processo, url = iniciar_servidor(escala, latencia_ms, banda)
+    Config.LIME_API_URL = service.lime_api.api_url = url
+    try:
+        for modo in ('threads', 'async'):
+            # Primeira carga apenas aquece o cache de exportações do servidor
+            carregar(service, modo)
+            resultado = carregar(service, modo)
+            if resultado['erro']:
+                print(f"   ❌ {modo}: {resultado['erro']}")
+                continue
+            print(f"   • {modo:<8} {resultado['tempo']:7.2f}s   {resultado['respostas']:>8} respostas   "
+                  f"{resultado['respostas'] / resultado['tempo']:>9.0f} respostas/s   "
+                  f"{resultado['requisicoes']:>5} requisições")
+            payload = resultado['payload']
+            if payload:
+                print(f"     {payload['bytes'] / 2**20:8.1f} MiB em {payload['wire_bytes'] / 2**20:.1f} MiB "
+                      f"transferidos (compressão {payload['ratio']:.1f}x)")
+    finally:
+        service.lime_api.sessions.shutdown()
+        processo.kill()
+        processo.wait()
+
+
+def main():
+    escalas = [float(a) for a in sys.argv[1:] if not a.startswith('--')] or [1.0, 10.0]
+    latencia_ms = next((float(a.split('=', 1)[1]) for a in sys.argv[1:] if a.startswith('--latencia=')), 0.0)
+    banda = next((float(a.split('=', 1)[1]) for a in sys.argv[1:] if a.startswith('--banda=')), 0.0)
+
+    # Cache em diretório temporário para não tocar no data_cache da aplicação
+    os.chdir(tempfile.mkdtemp(prefix='bench_loader_'))
+    logging.disable(logging.INFO)
+    from utils.data_service_optimized import DataLoaderService
+
+    print("🚀 BENCHMARK DO CARREGAMENTO")
+    print("=" * 50)
+    print(f"   Workers: {Config.LOADER_MAX_WORKERS or 'um por survey'}, chamadas assíncronas: "
+          f"{Config.LIME_MAX_INFLIGHT}, blocos de {Config.EXPORT_CHUNK_SIZE} respostas")
+
+    service = DataLoaderService()
+    for escala in escalas:
+        bench_escala(service, escala, latencia_ms, banda)
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\n   Pico de memória do processo: {pico:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
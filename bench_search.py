@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark da latência da busca durante um recarregamento
+
+Sobe o servidor local do LimeSurvey (lime_stub_server.py) em outro processo,
+faz uma carga inicial e então mede a latência de buscas repetidas (o mesmo
+caminho do callback handle_search: filtro, limpeza, resumo e validações)
+sem carga em andamento e durante recarregamentos completos, com a
+decodificação das exportações na thread do carregador (INGEST_PROCESSES=0)
+e em processos separados.
+
+Uso:
+    python bench_search.py [escala] [--latencia=ms] [--processos=N] [--colunas=todas]
+
+Exemplo:
+    python bench_search.py 1 --processos=2 --colunas=todas
+"""
+
+import sys
+import os
+import io
+import time
+import logging
+import tempfile
+import threading
+import statistics
+from contextlib import redirect_stdout
+
+# Adicionar o diretório src ao path
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from config.settings import Config
+from utils import columnar_store
+from bench_loader import iniciar_servidor
+
+# Intervalo entre buscas consecutivas (um usuário clicando em "Buscar")
+INTERVALO_BUSCAS = 0.02
+
+# Recarregamentos medidos em cada modo
+RODADAS = 5
+
+
+def alvos_de_busca(dados: dict) -> dict:
+    """Coluna e valor buscados em cada categoria (primeira pergunta da primeira resposta)"""
+    alvos = {}
+    for categoria, df in dados.items():
+        colunas = [c for c in df.columns if c not in ('id', 'submitdate', 'lastpage', 'startlanguage', 'form_origem')]
+        if colunas and not df.empty:
+            alvos[categoria] = (colunas[0], df[colunas[0]].iloc[0])
+    return alvos
+
+
+def buscar(cache, processor, validator, alvos: dict):
+    """Mesmo trabalho de handle_search sobre os dados em cache"""
+    dados = {}
+    for categoria, df in cache.get_data().items():
+        if categoria in alvos and alvos[categoria][0] in df.columns:
+            coluna, valor = alvos[categoria]
+            dados[categoria] = processor.clean_data(columnar_store.materialize(df[df[coluna].isin([valor])]))
+    processor.get_processo_summary(dados)
+    validator.validate_all(dados)
+
+
+def medir_buscas(cache, processor, validator, alvos: dict, ativo) -> list:
+    """Executa buscas enquanto ativo() for verdadeiro e retorna as latências em ms"""
+    latencias = []
+    while ativo():
+        inicio = time.perf_counter()
+        buscar(cache, processor, validator, alvos)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        time.sleep(INTERVALO_BUSCAS)
+    return latencias
+
+
+def resumo(latencias: list) -> str:
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))]
+    return (f"p50 {statistics.median(ordenadas):7.1f} ms   p95 {p95:7.1f} ms   "
+            f"máx {ordenadas[-1]:7.1f} ms   ({len(ordenadas)} buscas)")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    escala = float(args[0]) if args else 1.0
+    latencia_ms = next((float(a.split('=', 1)[1]) for a in sys.argv[1:] if a.startswith('--latencia=')), 0.0)
+    processos = next((int(a.split('=', 1)[1]) for a in sys.argv[1:] if a.startswith('--processos=')),
+                     Config.INGEST_PROCESSES or 2)
+    if '--colunas=todas' in sys.argv:
+        Config.COLUMN_PROJECTION = False
+
+    # Cache em diretório temporário para não tocar no data_cache da aplicação
+    os.chdir(tempfile.mkdtemp(prefix='bench_search_'))
+    logging.disable(logging.INFO)
+    from utils.data_service_optimized import data_service
+    from data.data_processor import DataProcessor
+    from data.ingest_pool import get_ingest_pool
+    from validation.conjunto_validator import ConjuntoValidator
+
+    print("🚀 BENCHMARK DA BUSCA DURANTE O RECARREGAMENTO")
+    print("=" * 50)
+    processo, url = iniciar_servidor(escala, latencia_ms)
+    Config.LIME_API_URL = data_service.lime_api.api_url = url
+    # Todo recarregamento exporta todos os surveys de novo, sem apagar os dados em cache
+    Config.INCREMENTAL_SYNC = False
+    Config.CHANGE_PROBE = False
+
+    pool = get_ingest_pool()
+    cache = data_service.cache
+    processor, validator = DataProcessor(), ConjuntoValidator()
+    try:
+        cache.clear_cache()
+        with redirect_stdout(io.StringIO()):
+            data_service._load_all_data()
+        alvos = alvos_de_busca(cache.get_data())
+        total = sum(len(df) for df in cache.get_data().values())
+        print(f"   {total} respostas em cache, buscas a cada {INTERVALO_BUSCAS * 1000:.0f} ms\n")
+
+        fim_ocioso = time.perf_counter() + 2
+        with redirect_stdout(io.StringIO()):
+            ociosas = medir_buscas(cache, processor, validator, alvos, lambda: time.perf_counter() < fim_ocioso)
+        print(f"   • sem carga               {resumo(ociosas)}")
+
+        for n in (0, processos):
+            pool.shutdown()
+            pool.processes = n
+            pool.start()
+            latencias, duracoes = [], []
+            for rodada in range(RODADAS + 1):
+                carga = threading.Thread(target=data_service._load_all_data)
+                saida = io.StringIO()
+                with redirect_stdout(saida):
+                    inicio = time.perf_counter()
+                    carga.start()
+                    medidas = medir_buscas(cache, processor, validator, alvos, carga.is_alive)
+                    carga.join()
+                    duracao = time.perf_counter() - inicio
+                if cache.load_error:
+                    print(f"     ❌ {cache.load_error}")
+                # A primeira rodada aquece o pool e o cache de exportações do servidor
+                if rodada:
+                    latencias += medidas
+                    duracoes.append(duracao)
+            rotulo = 'na thread' if n == 0 else f'{n} processos'
+            print(f"   • recarga ({rotulo:<11})  {resumo(latencias)}   "
+                  f"recarga {statistics.mean(duracoes):5.2f}s")
+    finally:
+        pool.shutdown()
+        data_service.lime_api.sessions.shutdown()
+        processo.kill()
+        processo.wait()
+
+
+if __name__ == "__main__":
+    main()
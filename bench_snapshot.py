@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark da memória de vários workers servindo o mesmo cache
+
+Grava o cache de dados sintéticos (mesmos DataFrames de bench_cache.py) e
+sobe N processos que carregam o cache como um worker da aplicação faria
+(PersistentDataCache) e percorrem todas as colunas, como uma busca. Com
+todos carregados, cada worker lê /proc/self/smaps_rollup: memória privada
+(só dele), compartilhada (páginas do arquivo mapeadas também por outros
+processos) e PSS (compartilhada dividida entre os processos que a usam).
+
+Compara o cache lido para memória própria (SHARED_SNAPSHOT=False) com o
+snapshot mapeado (SHARED_SNAPSHOT=True). Só funciona no Linux.
+
+Uso:
+    python bench_snapshot.py [escala] [--workers=N]
+
+Exemplo:
+    python bench_snapshot.py 5 --workers=4
+"""
+
+import sys
+import os
+import tempfile
+import multiprocessing
+
+# Adicionar o diretório src ao path
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+
+def ler_smaps() -> dict:
+    """Campos de /proc/self/smaps_rollup em MiB"""
+    campos = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for linha in f:
+            partes = linha.split()
+            if len(partes) == 3 and partes[2] == 'kB':
+                campos[partes[0].rstrip(':')] = int(partes[1]) / 1024
+    return campos
+
+
+def worker(diretorio: str, compartilhado: bool, barreira, fila):
+    """Carrega o cache como um worker da aplicação e mede a memória com todos carregados"""
+    sys.path.insert(0, os.path.join(RAIZ, 'src'))
+    os.chdir(diretorio)
+    import logging
+    logging.disable(logging.INFO)
+    import pandas as pd
+    from config.settings import Config
+    Config.SHARED_SNAPSHOT = compartilhado
+
+    antes = ler_smaps()
+    from utils.persistent_data_cache import PersistentDataCache
+    dados = PersistentDataCache().get_data()
+    # Tocar todas as colunas, como a busca faz ao filtrar
+    for df in dados.values():
+        for i in range(df.shape[1]):
+            serie = df.iloc[:, i]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                serie.array.codes.sum()
+            else:
+                serie.isna().sum()
+    barreira.wait()
+    depois = ler_smaps()
+    fila.put({
+        'privada': (depois['Private_Clean'] + depois['Private_Dirty'])
+                   - (antes['Private_Clean'] + antes['Private_Dirty']),
+        'compartilhada': depois['Shared_Clean'] + depois['Shared_Dirty'],
+        'rss': depois['Rss'],
+        'pss': depois['Pss'],
+    })
+    barreira.wait()
+
+
+def medir(diretorio: str, compartilhado: bool, n_workers: int) -> list:
+    contexto = multiprocessing.get_context('spawn')
+    barreira = contexto.Barrier(n_workers)
+    fila = contexto.Queue()
+    processos = [contexto.Process(target=worker, args=(diretorio, compartilhado, barreira, fila))
+                 for _ in range(n_workers)]
+    for p in processos:
+        p.start()
+    resultados = [fila.get() for _ in processos]
+    for p in processos:
+        p.join()
+    return resultados
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    escala = float(args[0]) if args else 1.0
+    n_workers = next((int(a.split('=', 1)[1]) for a in sys.argv[1:] if a.startswith('--workers=')), 4)
+
+    diretorio = tempfile.mkdtemp(prefix='bench_snapshot_')
+    os.chdir(diretorio)
+    import logging
+    logging.disable(logging.INFO)
+    from bench_cache import montar_dados
+    from utils.persistent_data_cache import PersistentDataCache
+
+    print("🚀 BENCHMARK DA MEMÓRIA DOS WORKERS")
+    print("=" * 50)
+    dados = montar_dados(escala)
+    respostas = sum(len(df) for df in dados.values())
+    PersistentDataCache().set_data(dados)
+    del dados
+    tamanho = sum(f.stat().st_size for f in PersistentDataCache().frames_dir.iterdir()) / 2**20
+    print(f"   Escala {escala:g}x: {respostas} respostas, {tamanho:.1f} MiB em disco, {n_workers} workers\n")
+
+    for compartilhado in (False, True):
+        resultados = medir(diretorio, compartilhado, n_workers)
+        privada = sum(r['privada'] for r in resultados) / n_workers
+        compartilhada = max(r['compartilhada'] for r in resultados)
+        pss = sum(r['pss'] for r in resultados)
+        rotulo = 'snapshot mapeado' if compartilhado else 'memória própria'
+        print(f"   • {rotulo:<17} privada/worker {privada:7.1f} MiB   compartilhada {compartilhada:7.1f} MiB   "
+              f"PSS total {pss:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a API RemoteControl (JSON-RPC) do LimeSurvey
+
+Serve surveys sintéticos ou gravados da API real para que testes e
+benchmarks da carga de dados rodem sem acessar a instância de produção.
+Latência, largura de banda e erros HTTP podem ser injetados.
+
+Uso:
+    python lime_stub_server.py [porta] [escala|diretório] [latência_ms] [taxa_de_erro] [banda_MBps]
+    python lime_stub_server.py gravar <diretório> [survey_id ...]
+
+Com uma escala, serve surveys sintéticos para todos os ids de
+Config.SURVEY_IDS (escala 1 ≈ volume atual). Com um diretório, serve as
+fixtures gravadas pelo comando "gravar". Aponte LIME_API_URL para o
+endereço exibido.
+"""
+
+import sys
+import os
+import io
+import csv
+import json
+import time
+import gzip
+import zlib
+import base64
+import random
+import itertools
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+
+# Respostas e colunas por survey na escala 1, por categoria
+VOLUME_BASE = {
+    'processo': (1500, 180),
+    'reu': (1200, 150),
+    'vitima': (800, 60),
+    'provas': (800, 80),
+}
+
+# Bytes de exportações codificadas mantidos em memória por survey
+EXPORT_CACHE_BYTES = 256 * 2**20
+
+# Respostas menores que isso não são comprimidas (como no mod_deflate)
+COMPRESSION_MIN_BYTES = 1024
+
+
+class StubSurvey:
+    """Survey servido pelo servidor local, sintético ou gravado da API real"""
+
+    def __init__(self, survey_id: str, groups: List[Dict], questions: Dict[str, List[Dict]],
+                 responses: Optional[List[Dict]] = None, total: int = 0, seed: int = 0,
+                 properties: Optional[Dict] = None, title: Optional[str] = None):
+        self.survey_id = str(survey_id)
+        self.groups = groups
+        self.questions = questions  # gid (str) -> resultado de list_questions
+        self.properties = properties or {'active': 'Y', 'lastmodified': '2024-01-01 00:00:00'}
+        self.title = title or f'Survey {survey_id}'
+        self._responses = responses
+        self._total = total
+        self._seed = seed
+        self._codes = [q['title'] for gid in questions for q in questions[gid]]
+        self._exports: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def synthetic(cls, survey_id: str, n_respostas: int, n_colunas: int,
+                  n_grupos: int = 10, seed: int = 0) -> 'StubSurvey':
+        """
+        Survey sintético; as respostas são geradas sob demanda a partir do id
+
+        Args:
+            survey_id: ID do survey
+            n_respostas: Número de respostas completas (ids 1..n)
+            n_colunas: Número de perguntas
+            n_grupos: Número de grupos de perguntas
+            seed: Semente para gerar respostas reprodutíveis
+        """
+        groups = [{'gid': g + 1, 'group_name': f'Grupo {g + 1}'} for g in range(n_grupos)]
+        questions = {str(g['gid']): [] for g in groups}
+        for c in range(n_colunas):
+            g = c % n_grupos
+            code = f'P{g}Q{c}'
+            questions[str(g + 1)].append({
+                'qid': c + 1, 'gid': g + 1, 'title': code,
+                'question': f'<p>Pergunta {c} do grupo {g + 1}</p>\n'
+            })
+        return cls(survey_id, groups, questions, total=n_respostas, seed=seed)
+
+    @classmethod
+    def load(cls, path: Path) -> 'StubSurvey':
+        """Carrega uma fixture gravada com save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        return cls(fixture['survey_id'], fixture['groups'], fixture['questions'],
+                   responses=fixture['responses'], properties=fixture.get('properties'),
+                   title=fixture.get('title'))
+
+    def save(self, path: Path):
+        """Grava o survey como fixture JSON"""
+        fixture = {
+            'survey_id': self.survey_id,
+            'groups': self.groups,
+            'questions': self.questions,
+            'properties': self.properties,
+            'title': self.title,
+            'responses': list(self.iter_responses()),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False)
+
+    @classmethod
+    def record(cls, api, survey_id: str) -> 'StubSurvey':
+        """
+        Grava um survey da API real
+
+        Args:
+            api: Instância de LimeSurveyAPI já configurada
+            survey_id: ID do survey
+        """
+        from data.response_decoder import decode_json_export_legacy
+
+        groups = api.limesurvey_api_request('list_groups', [api.session_key, survey_id]).get('result')
+        groups = groups if isinstance(groups, list) else []
+        questions = {}
+        for group in groups:
+            result = api.limesurvey_api_request(
+                'list_questions', [api.session_key, survey_id, group['gid'], 'pt-BR']
+            ).get('result')
+            questions[str(group['gid'])] = result if isinstance(result, list) else []
+        properties = api.limesurvey_api_request(
+            'get_survey_properties', [api.session_key, survey_id, ['active', 'lastmodified']]
+        ).get('result')
+        language = api.limesurvey_api_request(
+            'get_language_properties', [api.session_key, survey_id, ['surveyls_title']]
+        ).get('result')
+        export = api.limesurvey_api_request(
+            'export_responses',
+            [api.session_key, survey_id, 'json', 'pt-BR', 'complete', 'long', 'long', None, None]
+        ).get('result')
+        responses = []
+        if isinstance(export, str):
+            df = decode_json_export_legacy(export)
+            responses = json.loads(df.to_json(orient='records', force_ascii=False))
+        return cls(survey_id, groups, questions, responses=responses,
+                   properties=properties if isinstance(properties, dict) else None,
+                   title=language.get('surveyls_title') if isinstance(language, dict) else None)
+
+    def _synthetic_response(self, response_id: int) -> Dict:
+        rng = random.Random(self._seed * 1_000_003 + response_id)
+        resposta = {
+            'id': response_id,
+            'submitdate': f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00',
+            'lastpage': 1,
+            'startlanguage': 'pt-BR',
+        }
+        for code in self._codes:
+            resposta[code] = rng.choice([None, 'Sim', 'Não', 'Não se aplica', str(rng.randint(0, 99))])
+        if self._codes:
+            resposta[self._codes[0]] = f'{rng.randint(1000000, 9999999)}-89.2023.8.26.0001'
+        return resposta
+
+    def add_responses(self, n_respostas: int):
+        """Simula o envio de novas respostas completas"""
+        with self._lock:
+            if self._responses is not None:
+                proximo = max((int(r['id']) for r in self._responses), default=0) + 1
+                self._responses.extend(self._synthetic_response(i) for i in range(proximo, proximo + n_respostas))
+            else:
+                self._total += n_respostas
+            self._exports.clear()
+
+    @property
+    def total(self) -> int:
+        return len(self._responses) if self._responses is not None else self._total
+
+    def iter_responses(self, from_id: Optional[int] = None, to_id: Optional[int] = None) -> Iterator[Dict]:
+        """Respostas com from_id <= id <= to_id"""
+        if self._responses is not None:
+            for resposta in self._responses:
+                response_id = int(resposta['id'])
+                if (from_id is None or response_id >= from_id) and (to_id is None or response_id <= to_id):
+                    yield resposta
+            return
+        inicio = max(1, from_id or 1)
+        fim = min(self._total, to_id if to_id is not None else self._total)
+        for response_id in range(inicio, fim + 1):
+            yield self._synthetic_response(response_id)
+
+    def export_columns(self, fields: List[str]) -> set:
+        """
+        Colunas (cabeçalhos por código) correspondentes aos campos de aFields
+
+        Campos no formato {sid}X{gid}X{qid}[sufixo] viram o código da pergunta,
+        ou CÓDIGO[sufixo] para subperguntas e "Outros"; os demais (id,
+        submitdate...) são nomes de colunas de controle.
+        """
+        titulos = {str(q['qid']): q['title'] for gid in self.questions for q in self.questions[gid]}
+        prefixo = f'{self.survey_id}X'
+        colunas = set()
+        for field in fields:
+            if not field.startswith(prefixo):
+                colunas.add(field)
+                continue
+            _, _, resto = field[len(prefixo):].partition('X')
+            qid = ''.join(itertools.takewhile(str.isdigit, resto))
+            if qid in titulos:
+                sufixo = resto[len(qid):]
+                colunas.add(f'{titulos[qid]}[{sufixo}]' if sufixo else titulos[qid])
+        return colunas
+
+    def export(self, formato: str, from_id: Optional[int] = None, to_id: Optional[int] = None,
+               fields: Optional[List[str]] = None):
+        """
+        Resultado de export_responses: payload base64 ou status sem respostas
+
+        As exportações mais recentes ficam em cache para que o custo de gerá-las
+        não entre nas medições dos benchmarks.
+        """
+        chave = (formato, from_id, to_id, tuple(fields) if fields else None)
+        with self._lock:
+            if chave in self._exports:
+                self._exports.move_to_end(chave)
+                return self._exports[chave]
+
+        respostas = self.iter_responses(from_id, to_id)
+        if fields:
+            campos = self.export_columns(fields) | {'id'}
+            respostas = ({k: v for k, v in r.items() if k in campos} for r in respostas)
+        respostas = list(respostas)
+
+        if not respostas:
+            resultado = {'status': 'No Response found'}
+        elif formato == 'csv':
+            buffer = io.StringIO()
+            colunas = list(dict.fromkeys(k for r in respostas for k in r))
+            writer = csv.DictWriter(buffer, fieldnames=colunas, quoting=csv.QUOTE_ALL)
+            writer.writeheader()
+            writer.writerows(respostas)
+            resultado = base64.b64encode(('\ufeff' + buffer.getvalue()).encode('utf-8')).decode('ascii')
+        else:
+            documento = json.dumps({'responses': respostas}, ensure_ascii=False)
+            resultado = base64.b64encode(documento.encode('utf-8')).decode('ascii')
+
+        with self._lock:
+            self._exports[chave] = resultado
+            while len(self._exports) > 1 and sum(map(len, self._exports.values())) > EXPORT_CACHE_BYTES:
+                self._exports.popitem(last=False)
+        return resultado
+
+
+def synthetic_surveys(scale: float = 1.0, survey_ids: Optional[Dict] = None) -> Dict[str, StubSurvey]:
+    """
+    Surveys sintéticos para todos os ids configurados
+
+    Args:
+        scale: Multiplicador do número de respostas em relação a VOLUME_BASE
+        survey_ids: Mapa categoria -> id(s) (padrão: Config.SURVEY_IDS)
+    """
+    surveys = {}
+    for categoria, ids in (survey_ids or Config.SURVEY_IDS).items():
+        n_respostas, n_colunas = VOLUME_BASE.get(categoria, (1000, 100))
+        for survey_id in (ids if isinstance(ids, list) else [ids]):
+            surveys[str(survey_id)] = StubSurvey.synthetic(
+                survey_id, max(1, int(n_respostas * scale)), n_colunas, seed=int(survey_id)
+            )
+    return surveys
+
+
+def load_fixtures(directory: Path) -> Dict[str, StubSurvey]:
+    """Carrega todas as fixtures <survey_id>.json de um diretório"""
+    surveys = {}
+    for path in sorted(Path(directory).glob('*.json')):
+        survey = StubSurvey.load(path)
+        surveys[survey.survey_id] = survey
+    return surveys
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo saem em escritas separadas; sem isso o ACK atrasado
+    # do TCP acrescenta ~40 ms a cada resposta
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        stub: 'LimeStubServer' = self.server.stub
+        corpo = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        metodo, params = corpo.get('method'), corpo.get('params') or []
+
+        if not stub.admit():
+            self._enviar(429, b'')
+            return
+        try:
+            if stub.latency:
+                time.sleep(stub.latency)
+            if stub.should_fail(metodo):
+                self._enviar(stub.error_status, b'')
+                return
+
+            saida = json.dumps({'id': corpo.get('id'), 'result': stub.dispatch(metodo, params), 'error': None})
+            saida = saida.encode('utf-8')
+            codificacao = stub.encoding_for(self.headers.get('Accept-Encoding', ''), len(saida))
+            if codificacao == 'gzip':
+                saida = gzip.compress(saida, compresslevel=6)
+            elif codificacao == 'deflate':
+                saida = zlib.compress(saida, 6)
+            if stub.bandwidth:
+                time.sleep(len(saida) / stub.bandwidth)
+            self._enviar(200, saida, codificacao)
+        finally:
+            stub.leave()
+
+    def _enviar(self, status: int, saida: bytes, codificacao: Optional[str] = None):
+        chunk_size = self.server.stub.chunk_size
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if codificacao:
+            self.send_header('Content-Encoding', codificacao)
+        if not chunk_size:
+            self.send_header('Content-Length', str(len(saida)))
+            self.end_headers()
+            self.wfile.write(saida)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for inicio in range(0, len(saida), chunk_size):
+            bloco = saida[inicio:inicio + chunk_size]
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(bloco), bloco))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+class LimeStubServer:
+    """Servidor JSON-RPC local com injeção de latência e de erros"""
+
+    def __init__(self, surveys: Dict[str, StubSurvey], latency: float = 0.0, bandwidth: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 error_methods: Optional[set] = None, max_concurrent: int = 0,
+                 seed: Optional[int] = None, compression: bool = True, chunk_size: int = 0):
+        """
+        Args:
+            surveys: Surveys servidos, por id
+            latency: Atraso fixo por requisição, em segundos
+            bandwidth: Bytes por segundo da resposta (0 = sem limite)
+            error_rate: Probabilidade de responder com error_status
+            error_status: Status HTTP das falhas injetadas
+            error_methods: Métodos sujeitos às falhas (None = todos)
+            max_concurrent: Requisições simultâneas aceitas; as excedentes recebem 429 (0 = sem limite)
+            seed: Semente do sorteio das falhas
+            compression: Comprimir respostas com gzip/deflate quando o cliente aceita
+            chunk_size: Enviar as respostas em Transfer-Encoding: chunked, em blocos
+                deste tamanho (0 = corpo inteiro com Content-Length)
+        """
+        self.surveys = surveys
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_methods = error_methods
+        self.max_concurrent = max_concurrent
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.calls: Counter = Counter()
+        self.errors_injected = 0
+        self.logins = 0
+        self.rejected = 0
+        self.peak_concurrent = 0
+        self._active = 0
+        self._sessions = set()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Inicia o servidor em uma thread e retorna a URL do endpoint"""
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        threading.Thread(target=self._httpd.serve_forever, daemon=True, name='lime-stub').start()
+        return self.url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'LimeStubServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def encoding_for(self, accept_encoding: str, size: int) -> Optional[str]:
+        """Codificação da resposta conforme o Accept-Encoding do cliente (None = sem compressão)"""
+        if not self.compression or size < COMPRESSION_MIN_BYTES:
+            return None
+        aceitas = {parte.split(';')[0].strip().lower() for parte in accept_encoding.split(',')}
+        for codificacao in ('gzip', 'deflate'):
+            if codificacao in aceitas:
+                return codificacao
+        return None
+
+    def invalidate_sessions(self):
+        """Faz todas as chaves emitidas até agora serem recusadas como expiradas"""
+        with self._lock:
+            self._sessions.clear()
+
+    def admit(self) -> bool:
+        """Registra uma requisição em andamento, recusando as que excedem max_concurrent"""
+        with self._lock:
+            if self.max_concurrent and self._active >= self.max_concurrent:
+                self.rejected += 1
+                return False
+            self._active += 1
+            self.peak_concurrent = max(self.peak_concurrent, self._active)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def should_fail(self, metodo: str) -> bool:
+        if not self.error_rate or (self.error_methods and metodo not in self.error_methods):
+            return False
+        with self._lock:
+            falhar = self._random.random() < self.error_rate
+            if falhar:
+                self.errors_injected += 1
+        return falhar
+
+    def dispatch(self, metodo: str, params: List):
+        """Executa o método JSON-RPC e retorna o campo result"""
+        with self._lock:
+            self.calls[metodo] += 1
+            if metodo == 'get_session_key':
+                self.logins += 1
+                chave = f'stub-{self.logins}-{self._random.getrandbits(32):08x}'
+                self._sessions.add(chave)
+                return chave
+            sessao_valida = bool(params) and params[0] in self._sessions
+            if metodo == 'release_session_key':
+                self._sessions.discard(params[0] if params else None)
+                return 'OK'
+        if not sessao_valida:
+            return {'status': 'Invalid session key'}
+
+        survey = self.surveys.get(str(params[1])) if len(params) > 1 else None
+        if survey is None:
+            return {'status': 'Error: Invalid survey ID'}
+
+        if metodo == 'list_groups':
+            return survey.groups
+        if metodo == 'list_questions':
+            return survey.questions.get(str(params[2])) or {'status': 'No questions found'}
+        if metodo == 'get_survey_properties':
+            pedidas = params[2] if len(params) > 2 and params[2] else list(survey.properties)
+            return {p: survey.properties.get(p) for p in pedidas}
+        if metodo == 'get_language_properties':
+            return {'surveyls_title': survey.title}
+        if metodo == 'get_summary':
+            resumo = {'completed_responses': str(survey.total), 'incomplete_responses': '0',
+                      'full_responses': str(survey.total)}
+            estatistica = params[2] if len(params) > 2 and params[2] else 'all'
+            return resumo if estatistica == 'all' else resumo.get(estatistica)
+        if metodo == 'export_responses':
+            extra = (list(params[7:10]) + [None] * 3)[:3]
+            return survey.export(params[2] if len(params) > 2 else 'json', *extra)
+        return {'status': f'Método não suportado pelo servidor local: {metodo}'}
+
+
+def _gravar(directory: str, survey_ids: List[str]):
+    """Grava fixtures dos surveys a partir da API configurada em LIME_API_URL"""
+    from data.lime_api import LimeSurveyAPI
+
+    api = LimeSurveyAPI()
+    if not api.get_session_key():
+        print("❌ Falha na conexão com LimeSurvey")
+        sys.exit(1)
+    if not survey_ids:
+        survey_ids = [str(s) for ids in Config.SURVEY_IDS.values() for s in (ids if isinstance(ids, list) else [ids])]
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    for survey_id in survey_ids:
+        survey = StubSurvey.record(api, survey_id)
+        survey.save(Path(directory) / f'{survey_id}.json')
+        print(f"💾 Survey {survey_id}: {survey.total} respostas gravadas")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'gravar':
+        if len(sys.argv) < 3:
+            print(__doc__)
+            sys.exit(1)
+        _gravar(sys.argv[2], sys.argv[3:])
+        return
+
+    porta = int(sys.argv[1]) if len(sys.argv) > 1 else 8099
+    origem = sys.argv[2] if len(sys.argv) > 2 else '1'
+    latencia = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+    taxa_erro = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    banda = float(sys.argv[5]) * 2**20 if len(sys.argv) > 5 else 0.0
+
+    if Path(origem).is_dir():
+        surveys = load_fixtures(Path(origem))
+    else:
+        surveys = synthetic_surveys(float(origem))
+
+    stub = LimeStubServer(surveys, latency=latencia, error_rate=taxa_erro, bandwidth=banda)
+    url = stub.start(port=porta)
+    print(f"🧪 Servidor local do LimeSurvey em {url} ({len(surveys)} surveys, "
+          f"{sum(s.total for s in surveys.values())} respostas)", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
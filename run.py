@@ -41,8 +41,10 @@ if missing:
 
 if __name__ == "__main__":
     try:
-        # Importar e executar a aplicação
-        from app import app
+        # Criar a aplicação e iniciar o carregamento dos dados
+        from app import create_app, init
+        app = create_app()
+        init()
         
         print("🚀 Iniciando aplicação...")
         print("   Acesse: http://localhost:8050")
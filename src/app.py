@@ -1,42 +1,60 @@
 """
 Aplicação Dash para verificação de erros em pesquisa MJ
+
+A criação da aplicação e o carregamento dos dados ficam em create_app() e
+init(), não no nível do módulo: os processos de decodificação (IngestPool,
+contexto spawn) importam de novo o módulo principal e, com
+`python src/app.py`, cada um repetiria a aplicação Dash, a leitura do cache
+e o carregamento em background.
 """
 
-import dash
-from dash import html, dcc
 import logging
-from layouts.main_layout import create_main_layout
-from callbacks.main_callbacks import register_callbacks
-from utils.data_service_optimized import data_service
 from config.settings import Config
 
-# Configurar logging em produção apenas para warnings e erros
-if not Config.DEBUG:
-    logging.getLogger('werkzeug').setLevel(logging.WARNING)
-    logging.getLogger('dash').setLevel(logging.WARNING)
 
-# Inicializar a aplicação Dash
-app = dash.Dash(
-    __name__,
-    external_stylesheets=[
-        'https://codepen.io/chriddyp/pen/bWLwgP.css',
-        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
-    ],
-    suppress_callback_exceptions=True
-)
+def create_app():
+    """Cria a aplicação Dash com o layout e os callbacks"""
+    import dash
+    from layouts.main_layout import create_main_layout
+    from callbacks.main_callbacks import register_callbacks
+
+    # Configurar logging em produção apenas para warnings e erros
+    if not Config.DEBUG:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        logging.getLogger('dash').setLevel(logging.WARNING)
+
+    # Inicializar a aplicação Dash
+    app = dash.Dash(
+        __name__,
+        external_stylesheets=[
+            'https://codepen.io/chriddyp/pen/bWLwgP.css',
+            'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
+        ],
+        suppress_callback_exceptions=True
+    )
+
+    app.title = "Verificador de Pesquisa MJ"
+
+    # Definir o layout principal
+    app.layout = create_main_layout()
+
+    # Registrar callbacks
+    register_callbacks(app)
+    return app
 
-app.title = "Verificador de Pesquisa MJ"
 
-# Iniciar carregamento dos dados em background
-print("🚀 Iniciando carregamento dos dados dos formulários...")
-data_service.start_background_loading()
+def init():
+    """Inicia o carregamento dos dados em background e a verificação periódica do líder"""
+    from utils.data_service_optimized import data_service
 
-# Definir o layout principal
-app.layout = create_main_layout()
+    print("🚀 Iniciando carregamento dos dados dos formulários...")
+    data_service.start_background_loading()
+    # Verificação periódica: recarrega no líder e assume os recarregamentos se ele terminar
+    data_service.start_leader_watch()
 
-# Registrar callbacks
-register_callbacks(app)
 
 if __name__ == '__main__':
+    app = create_app()
+    init()
     # Usar configurações do ambiente definidas em Config
     app.run(debug=Config.DEBUG, host=Config.HOST, port=Config.PORT)
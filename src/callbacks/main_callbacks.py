@@ -111,11 +111,12 @@ def register_callbacks(app):
             status = data_processor.get_cache_status()
 
             # Se o cache expirou e não está carregando, iniciar reload em background
+            # (recusado enquanto o disjuntor de falhas estiver aberto)
             if not status.get('is_valid') and not status.get('is_loading'):
                 try:
-                    data_service.start_background_loading()
-                    # Refletir novo estado imediatamente
-                    status['is_loading'] = True
+                    if data_service.start_background_loading():
+                        # Refletir novo estado imediatamente
+                        status['is_loading'] = True
                 except Exception as e:
                     # Se falhar ao iniciar reload, registrar e mostrar erro no status
                     return create_data_status_error(f"Falha ao iniciar recarregamento: {e}")
@@ -286,16 +287,17 @@ def create_data_status_component(status):
     Returns:
         Componente Dash com status
     """
-    if status.get('error'):
-        return create_data_status_error(status['error'])
+    if status.get('error') and not status.get('is_loading'):
+        return create_data_status_error(status['error'], status)
     
-    # Se temos dados e não está carregando, mostrar sucesso
-    if status.get('has_data') and not status.get('is_loading'):
+    # Se temos dados e não está carregando, mostrar sucesso; com dados de uma carga
+    # anterior, eles continuam servidos (e o sucesso exibido) durante a atualização
+    if status.get('has_data') and (not status.get('is_loading') or status.get('last_update')):
         return create_data_status_success(status)
     
-    # Se está carregando, mostrar loading
+    # Se está carregando, mostrar loading com a situação de cada formulário
     if status.get('is_loading'):
-        return create_data_status_loading()
+        return create_data_status_loading(status)
     
     # Se não tem dados mas o cache é válido, mostrar aguardando
     if status.get('is_valid'):
@@ -304,14 +306,101 @@ def create_data_status_component(status):
     # Em outros casos, mostrar loading
     return create_data_status_loading()
 
-def create_data_status_loading():
-    """Cria status de carregamento"""
+# Rótulos da situação de cada formulário durante o carregamento
+ESTADOS_SURVEY = {
+    'aguardando': 'aguardando',
+    'pronto': 'pronto',
+    'inalterado': 'sem mudanças',
+    'vazio': 'sem respostas novas',
+    'falhou': 'falhou',
+}
+
+def rotulo_survey(survey_id, categoria, catalogo=None):
+    """Título do formulário segundo o catálogo, ou categoria e id quando desconhecido"""
+    titulos = {e['survey_id']: e.get('title') for e in catalogo or []}
+    return titulos.get(str(survey_id)) or f"{categoria.title()} {survey_id}"
+
+def resumo_catalogo(catalogo):
+    """Formulários ativos e última modificação segundo o catálogo de surveys"""
+    if not catalogo:
+        return None
+    ativos = sum(1 for e in catalogo if e.get('active'))
+    texto = f"{len(catalogo)} formulários ({ativos} ativos)"
+    modificacoes = [e['lastmodified'] for e in catalogo if e.get('lastmodified')]
+    if modificacoes:
+        ultima = max(modificacoes)
+        try:
+            ultima = datetime.fromisoformat(ultima).strftime('%d/%m/%Y %H:%M')
+        except ValueError:
+            pass
+        texto += f" · última modificação em {ultima}"
+    return texto
+
+def idade_dados(last_update, agora=None):
+    """Tempo desde a última carga completa, por extenso"""
+    segundos = max(0, int(((agora or datetime.now()) - last_update).total_seconds()))
+    if segundos < 60:
+        return f"{segundos}s"
+    if segundos < 3600:
+        return f"{segundos // 60} min"
+    return f"{segundos // 3600}h{segundos % 3600 // 60:02d}"
+
+def resumo_atualizacao(status):
+    """Idade e geração dos dados servidos e, se houver, a atualização em andamento"""
+    textos = []
+    last_update = status.get('last_update')
+    if isinstance(last_update, datetime):
+        textos.append(f"Dados servidos: geração {status.get('generation', 0)}, "
+                      f"carregados há {idade_dados(last_update)}")
+    if status.get('refreshing'):
+        texto = "Atualização em andamento; os dados atuais continuam disponíveis"
+        surveys = status.get('surveys') or []
+        if status.get('is_loading') and surveys:
+            prontos = sum(1 for s in surveys if s['estado'] != 'aguardando')
+            texto += f" ({prontos} de {len(surveys)} formulários prontos)"
+        textos.append(texto)
+    return textos
+
+def resumo_lider(leader):
+    """Processo que recarrega o cache compartilhado e desde quando"""
+    if not leader or not leader.get('enabled') or not leader.get('pid'):
+        return None
+    quem = "este processo" if leader.get('is_leader') else f"processo {leader['pid']} em {leader.get('host')}"
+    texto = f"Recarregamentos: {quem}"
+    if leader.get('since'):
+        texto += f", líder desde {leader['since'].strftime('%d/%m %H:%M:%S')}"
+    return texto
+
+def create_data_status_loading(status=None):
+    """Cria status de carregamento, com os formulários já disponíveis para busca"""
+    surveys = (status or {}).get('surveys') or []
+    catalogo = (status or {}).get('catalog')
+    detalhes = []
+    if surveys:
+        prontos = [s for s in surveys if s['estado'] != 'aguardando']
+        detalhes.append(f"{len(prontos)} de {len(surveys)} formulários prontos")
+        
+        # Categorias cujos formulários já chegaram podem ser buscadas
+        categorias = dict.fromkeys(s['categoria'] for s in surveys)
+        disponiveis = [c.title() for c in categorias
+                       if all(s['estado'] != 'aguardando' for s in surveys if s['categoria'] == c)]
+        if disponiveis and status.get('has_data'):
+            detalhes.append(f"Busca disponível: {', '.join(disponiveis)}")
+        
+        detalhes.append(" · ".join(
+            f"{rotulo_survey(s['survey_id'], s['categoria'], catalogo)}: {ESTADOS_SURVEY.get(s['estado'], s['estado'])}"
+            + (f" ({s['respostas']})" if s.get('respostas') else "")
+            for s in surveys
+        ))
+    
     return html.Div([
         html.Div([
             html.I(className="fas fa-spinner fa-spin", 
                    style={"fontSize": "18px", "marginRight": "10px", "color": "#007bff"}),
             html.Span("Carregando dados dos formulários...", 
-                     style={"color": "#007bff", "fontWeight": "500"})
+                     style={"color": "#007bff", "fontWeight": "500"}),
+            *[item for texto in detalhes
+              for item in (html.Br(), html.Span(texto, style={"color": "#666", "fontSize": "14px"}))]
         ])
     ], style={
         "backgroundColor": "#d1ecf1",
@@ -349,6 +438,35 @@ def create_data_status_success(status):
             update_text = f"Última atualização: {last_update}"
             next_update_text = "Próxima atualização: em 12 horas"
     
+    # Resultado da sondagem de mudanças da última carga
+    probe = status.get('probe') or {}
+    probe_text = None
+    if probe.get('surveys'):
+        probe_text = (f"{probe.get('skipped', 0)} de {probe['surveys']} formulários sem mudanças "
+                      f"(sondagem em {probe.get('seconds', 0):.1f}s)")
+    
+    # Catálogo de surveys: situação e última modificação dos formulários
+    catalog_text = resumo_catalogo(status.get('catalog'))
+    
+    # Idade do snapshot servido e atualização em segundo plano
+    refresh_texts = resumo_atualizacao(status)
+    
+    # Processo líder dos recarregamentos entre os que compartilham o cache
+    leader_text = resumo_lider(status.get('leader'))
+    
+    # Controle adaptativo de requisições simultâneas ao LimeSurvey
+    concurrency = status.get('concurrency') or {}
+    concurrency_text = None
+    if concurrency:
+        eventos = concurrency.get('throttle_events', 0) + concurrency.get('latency_spikes', 0)
+        concurrency_text = f"Requisições simultâneas: {concurrency['limit']} (máx. {concurrency['max']})"
+        if eventos:
+            concurrency_text += f" · {eventos} limitações, última: {concurrency.get('last_event')}"
+    
+    # Pedidos de recarga agrupados a uma execução em andamento
+    coalesced = (status.get('single_flight') or {}).get('coalesced', 0)
+    coalesced_text = f"{coalesced} pedidos agrupados a carregamentos em andamento" if coalesced else None
+    
     return html.Div([
         html.Div([
             # Ícone e título
@@ -364,7 +482,14 @@ def create_data_status_success(status):
                 html.Br(),
                 html.Span(update_text),
                 html.Br(),
-                html.Span(next_update_text, style={"color": "#666"})
+                html.Span(next_update_text, style={"color": "#666"}),
+                *[item for texto in refresh_texts
+                  for item in (html.Br(), html.Span(texto, style={"color": "#666"}))],
+                *([html.Br(), html.Span(probe_text, style={"color": "#666"})] if probe_text else []),
+                *([html.Br(), html.Span(catalog_text, style={"color": "#666"})] if catalog_text else []),
+                *([html.Br(), html.Span(leader_text, style={"color": "#666"})] if leader_text else []),
+                *([html.Br(), html.Span(concurrency_text, style={"color": "#666"})] if concurrency_text else []),
+                *([html.Br(), html.Span(coalesced_text, style={"color": "#666"})] if coalesced_text else [])
             ], style={"marginTop": "10px"}),
             
             # Detalhes por categoria
@@ -383,14 +508,29 @@ def create_data_status_success(status):
         "textAlign": "center"
     })
 
-def create_data_status_error(error_msg):
-    """Cria status de erro"""
+def create_data_status_error(error_msg, status=None):
+    """Cria status de erro, com a próxima tentativa e os dados ainda em uso"""
+    status = status or {}
+    detalhes = []
+    
+    # Disjuntor aberto: horário da próxima tentativa automática
+    next_attempt = (status.get('breaker') or {}).get('next_attempt')
+    if next_attempt:
+        detalhes.append(f"Próxima tentativa: {next_attempt.strftime('%H:%M:%S')}")
+    
+    # Últimos dados carregados com sucesso continuam disponíveis para busca
+    last_update = status.get('last_update')
+    if status.get('has_data') and last_update:
+        detalhes.append(f"Exibindo {status.get('total_respostas', 0)} respostas carregadas em "
+                        f"{last_update.strftime('%d/%m %H:%M:%S')}")
+    
     return html.Div([
         html.Div([
             html.I(className="fas fa-exclamation-triangle", 
                    style={"fontSize": "18px", "marginRight": "10px", "color": "#dc3545"}),
             html.Span(f"Erro ao carregar dados: {error_msg}", 
-                     style={"color": "#721c24", "fontWeight": "500"})
+                     style={"color": "#721c24", "fontWeight": "500"}),
+            *[item for texto in detalhes for item in (html.Br(), html.Span(texto, style={"color": "#666"}))]
         ])
     ], style={
         "backgroundColor": "#f8d7da",
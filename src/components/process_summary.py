@@ -6,6 +6,46 @@ from dash import html, dash_table
 import pandas as pd
 from typing import Dict
 
+# Colunas do preview das respostas de cada categoria
+PREVIEW_COLUMNS = {
+    'processo': [
+        'form_origem',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q1A. Número de controle para casos em que há mais de uma vítima:',
+        'P0Q2. Número do Processo:',
+        'P0Q3. Estado em que ocorreu o crime (Formato: Unidade Federativa em letra maiúscula como SP, MG)',
+        'P0Q14. Número de réus no processo:',
+        'P0Q014. Número de réus que tiveram decisão com trânsito em julgado neste processo', 
+        'P0Q18. Qual o número de vítimas no processo?'
+    ],
+    'vitima': [
+        'form_origem',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
+    ],
+    'reu': [
+        'form_origem',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
+    ],
+    'provas': [
+        'form_origem',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
+    ]
+}
+
+# Colunas da seção de observações do bolsista (formulário de processo)
+OBSERVACOES_COLUMNS = [
+    'id',
+    'P0Q1. Número de controle (dado pela equipe)',
+    'P9Q3. Este processo, por qualquer motivo, se destacou/diferenciou das demais?( *humilhação, ofensa, julgamento moral, diligência na produção de provas, relato de violência detalhado etc_ .) Se sim, por que este caso se destacou/diferenciou das demais?'
+]
+
 def create_process_summary(processo_data: Dict, all_data: Dict[str, pd.DataFrame]):
     """
     Cria o componente de resumo do processo
@@ -172,40 +212,9 @@ def create_category_data_preview(all_data: Dict[str, pd.DataFrame]):
         if df.empty:
             continue
         
-        # Definir colunas específicas para cada categoria
-        if categoria == 'processo':
-            preview_cols = [
-                'form_origem',
-                'P0Q0. Pesquisador responsável pelo preenchimento:',
-                'P0Q1. Número de controle (dado pela equipe)',
-                'P0Q1A. Número de controle para casos em que há mais de uma vítima:',
-                'P0Q2. Número do Processo:',
-                'P0Q3. Estado em que ocorreu o crime (Formato: Unidade Federativa em letra maiúscula como SP, MG)',
-                'P0Q14. Número de réus no processo:',
-                'P0Q014. Número de réus que tiveram decisão com trânsito em julgado neste processo', 
-                'P0Q18. Qual o número de vítimas no processo?'
-            ]
-        elif categoria == 'vitima':
-            preview_cols = [
-                'form_origem',
-                'P0Q0. Pesquisador responsável pelo preenchimento:',
-                'P0Q1. Número de controle (dado pela equipe)',
-                'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
-            ]
-        elif categoria == 'reu':
-            preview_cols = [
-                'form_origem',
-                'P0Q0. Pesquisador responsável pelo preenchimento:',
-                'P0Q1. Número de controle (dado pela equipe)',
-                'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
-            ]
-        elif categoria == 'provas':
-            preview_cols = [
-                'form_origem',
-                'P0Q0. Pesquisador responsável pelo preenchimento:',
-                'P0Q1. Número de controle (dado pela equipe)',
-                'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
-            ]
+        # Colunas específicas de cada categoria
+        if categoria in PREVIEW_COLUMNS:
+            preview_cols = list(PREVIEW_COLUMNS[categoria])
         else:
             # Lógica anterior para outras categorias não especificadas
             preview_cols = []
@@ -272,11 +281,7 @@ def create_observacoes_bolsista(all_data: Dict[str, pd.DataFrame]):
     df_processo = all_data['processo']
     
     # Colunas que queremos mostrar
-    colunas_observacoes = [
-        'id',
-        'P0Q1. Número de controle (dado pela equipe)',
-        'P9Q3. Este processo, por qualquer motivo, se destacou/diferenciou das demais?( *humilhação, ofensa, julgamento moral, diligência na produção de provas, relato de violência detalhado etc_ .) Se sim, por que este caso se destacou/diferenciou das demais?'
-    ]
+    colunas_observacoes = OBSERVACOES_COLUMNS
     
     # Filtrar apenas colunas que existem no DataFrame
     colunas_existentes = [col for col in colunas_observacoes if col in df_processo.columns]
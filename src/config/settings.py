@@ -28,7 +28,90 @@ class Config:
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 8050))
     
+    # Configurações de transporte HTTP da API LimeSurvey
+    LIME_POOL_SIZE = int(os.getenv('LIME_POOL_SIZE', 4))  # Conexões mantidas no pool
+    LIME_CONNECT_TIMEOUT = float(os.getenv('LIME_CONNECT_TIMEOUT', 5))
+    LIME_READ_TIMEOUT = float(os.getenv('LIME_READ_TIMEOUT', 30))
+    LIME_EXPORT_READ_TIMEOUT = float(os.getenv('LIME_EXPORT_READ_TIMEOUT', 300))
+    LIME_MAX_RETRIES = int(os.getenv('LIME_MAX_RETRIES', 3))
+    LIME_BACKOFF_BASE = float(os.getenv('LIME_BACKOFF_BASE', 0.5))  # segundos
+    LIME_BACKOFF_MAX = float(os.getenv('LIME_BACKOFF_MAX', 10))  # segundos
+    # Codificações aceitas nas respostas; vazio desativa a compressão (identity)
+    LIME_ACCEPT_ENCODING = os.getenv('LIME_ACCEPT_ENCODING', 'gzip, deflate')
+    
+    # Chave de sessão reutilizada por até LIME_SESSION_TTL segundos e renovada
+    # LIME_SESSION_REFRESH_MARGIN segundos antes de expirar
+    LIME_SESSION_TTL = float(os.getenv('LIME_SESSION_TTL', 3600))
+    LIME_SESSION_REFRESH_MARGIN = float(os.getenv('LIME_SESSION_REFRESH_MARGIN', 300))
+    
+    # Workers do carregamento em threads; 0 usa um worker por survey
+    LOADER_MAX_WORKERS = int(os.getenv('LOADER_MAX_WORKERS', 4))
+    
+    # Disjuntor dos recarregamentos: após RELOAD_FAILURE_THRESHOLD falhas seguidas, novas
+    # tentativas esperam RELOAD_BACKOFF_BASE segundos, dobrando a cada falha até RELOAD_BACKOFF_MAX
+    RELOAD_FAILURE_THRESHOLD = int(os.getenv('RELOAD_FAILURE_THRESHOLD', 1))
+    RELOAD_BACKOFF_BASE = float(os.getenv('RELOAD_BACKOFF_BASE', 30))  # segundos
+    RELOAD_BACKOFF_MAX = float(os.getenv('RELOAD_BACKOFF_MAX', 900))  # segundos
+    
+    # Controle adaptativo (AIMD) das requisições simultâneas: parte de LOADER_MAX_WORKERS,
+    # cresce até LIME_MAX_CONCURRENCY enquanto a latência se mantém estável e cai pela
+    # metade com 429/5xx, timeouts ou latência LIME_LATENCY_SPIKE_FACTOR vezes acima da média
+    ADAPTIVE_CONCURRENCY = os.getenv('ADAPTIVE_CONCURRENCY', 'True').lower() == 'true'
+    LIME_MIN_CONCURRENCY = int(os.getenv('LIME_MIN_CONCURRENCY', 1))
+    LIME_MAX_CONCURRENCY = int(os.getenv('LIME_MAX_CONCURRENCY', 16))
+    LIME_LATENCY_SPIKE_FACTOR = float(os.getenv('LIME_LATENCY_SPIKE_FACTOR', 3.0))
+    
+    # Carregamento com o cliente asyncio: todas as chamadas de todos os surveys são
+    # disparadas juntas, com no máximo LIME_MAX_INFLIGHT requisições em andamento
+    ASYNC_LOADER = os.getenv('ASYNC_LOADER', 'False').lower() == 'true'
+    LIME_MAX_INFLIGHT = int(os.getenv('LIME_MAX_INFLIGHT', 8))
+    
+    # Exportação em blocos: surveys com mais respostas que EXPORT_CHUNK_SIZE são baixados
+    # em intervalos de ids em paralelo (0 desativa); no máximo EXPORT_CHUNK_CONCURRENCY
+    # blocos do mesmo survey ficam em andamento ao mesmo tempo
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+    EXPORT_CHUNK_CONCURRENCY = int(os.getenv('EXPORT_CHUNK_CONCURRENCY', 4))
+    
+    # Decodificação em streaming das exportações (reduz o pico de memória na carga)
+    STREAMING_DECODE = os.getenv('STREAMING_DECODE', 'True').lower() == 'true'
+    
+    # Processos que decodificam as exportações e montam os DataFrames fora do processo
+    # web, para que a carga não dispute o GIL com os callbacks (0 = na própria thread)
+    INGEST_PROCESSES = int(os.getenv('INGEST_PROCESSES', 2))
+    
+    # Formato pedido a export_responses: 'json' ou 'csv' (lido pelo parser C do pandas).
+    # EXPORT_FORMAT_BY_SURVEY permite escolher por survey, ex.: "917441:csv,345978:json"
+    EXPORT_FORMAT = os.getenv('EXPORT_FORMAT', 'json').lower()
+    EXPORT_FORMAT_BY_SURVEY = dict(
+        item.strip().split(':', 1) for item in os.getenv('EXPORT_FORMAT_BY_SURVEY', '').split(',') if ':' in item
+    )
+    
     # Configurações de cache
+    # Sincronização incremental: só baixa respostas com id acima da última marca d'água.
+    # Respostas editadas só são atualizadas na ressincronização completa periódica.
+    INCREMENTAL_SYNC = os.getenv('INCREMENTAL_SYNC', 'True').lower() == 'true'
+    FULL_SYNC_INTERVAL_HOURS = int(os.getenv('FULL_SYNC_INTERVAL_HOURS', 24))
+    
+    # Sondagem de mudanças: antes de exportar, compara o número de respostas completas
+    # e a data de modificação de cada survey com a carga anterior e pula os inalterados
+    # (exceto na ressincronização completa periódica)
+    CHANGE_PROBE = os.getenv('CHANGE_PROBE', 'True').lower() == 'true'
+    # Catálogo dos surveys (título, situação, respostas e data de modificação): consultado
+    # em paralelo e reaproveitado por este tempo, em segundos, pela interface e pelos mapas de perguntas
+    SURVEY_CATALOG_TTL = int(os.getenv('SURVEY_CATALOG_TTL', 300))
+    # Projeção de colunas: exporta só as perguntas usadas pelos validadores e pelo resumo
+    # do processo (False = todas as colunas, como nas exportações para pesquisa)
+    COLUMN_PROJECTION = os.getenv('COLUMN_PROJECTION', 'True').lower() == 'true'
+    # Snapshot compartilhado: os arquivos do cache são mapeados em memória, e os processos
+    # da aplicação (vários workers) usam as mesmas páginas em vez de uma cópia dos dados cada
+    SHARED_SNAPSHOT = os.getenv('SHARED_SNAPSHOT', 'True').lower() == 'true'
+    # Eleição do recarregador: entre os processos que usam o mesmo diretório de cache, só o
+    # que detém o lock de data_cache/reload.lock recarrega; os demais adotam o snapshot publicado
+    RELOAD_LEADER_ELECTION = os.getenv('RELOAD_LEADER_ELECTION', 'True').lower() == 'true'
+    # Intervalo, em segundos, com que cada processo verifica o cache e tenta assumir os recarregamentos
+    RELOAD_LEADER_INTERVAL = int(os.getenv('RELOAD_LEADER_INTERVAL', 60))
+    QUESTION_MAP_MAX_AGE_HOURS = int(os.getenv('QUESTION_MAP_MAX_AGE_HOURS', 24))  # Revalidação forçada do mapa de perguntas
+    QUESTION_MAP_CACHE_DIR = os.getenv('QUESTION_MAP_CACHE_DIR', 'data_cache/question_maps')  # Diretório dos mapas de perguntas em cache
     CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 300))  # 5 minutos
     
     # Configurações de validação
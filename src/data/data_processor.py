@@ -46,7 +46,9 @@ class DataProcessor:
         """
         # Obter cache diretamente
         cache = PersistentDataCache()
-        cached_data = cache.get_data()
+        # Dados, geração e horário do mesmo snapshot, mesmo durante um recarregamento
+        snapshot = cache.snapshot()
+        cached_data = snapshot.data
         
         total_respostas = 0
         categorias_info = {}
@@ -64,12 +66,21 @@ class DataProcessor:
         
         return {
             'is_loading': cache.is_loading,
-            'last_update': cache.last_update,
+            'refreshing': data_service.is_refreshing(),
+            'generation': snapshot.generation,
+            'last_update': snapshot.last_update,
             'error': cache.load_error,
             'is_valid': cache.is_cache_valid(),
             'total_respostas': total_respostas,
             'categorias': categorias_info,
-            'has_data': total_respostas > 0
+            'has_data': total_respostas > 0,
+            'probe': data_service.last_probe_stats,
+            'concurrency': data_service.concurrency_status(),
+            'single_flight': data_service.flights.snapshot(),
+            'breaker': data_service.breaker.snapshot(),
+            'surveys': data_service.progress_status(),
+            'catalog': data_service.lime_api.catalog.snapshot(),
+            'leader': data_service.leader.snapshot()
         }
     
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
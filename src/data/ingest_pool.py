@@ -0,0 +1,198 @@
+"""
+Decodificação das exportações em processos separados
+
+Decodificar o base64, interpretar o JSON (ou CSV) e montar as colunas do
+DataFrame é trabalho de CPU puro que, feito na thread de carregamento,
+disputa o GIL com os callbacks do Dash. O IngestPool executa essa etapa em
+um pool de processos e devolve ao processo web uma forma colunar compacta:
+cada coluna de texto chega como códigos inteiros mais a lista de valores
+distintos, de modo que o processo web só reconstrói os valores com um take
+em vez de decodificar e criar cada string de novo.
+
+As requisições HTTP continuam nas threads (ou no asyncio) do carregador.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from data.response_decoder import decode_csv_export, decode_json_export, decode_json_export_legacy
+
+logger = logging.getLogger(__name__)
+
+# Prioridade extra (nice) dos processos de decodificação em relação ao processo web
+INGEST_NICE = 10
+
+
+def decode_export(payload: str, formato: str, streaming: bool = True) -> pd.DataFrame:
+    """Decodifica o payload base64 de export_responses no formato pedido"""
+    if formato == 'csv':
+        return decode_csv_export(payload)
+    if streaming:
+        return decode_json_export(payload)
+    return decode_json_export_legacy(payload)
+
+
+def pack_frame(df: pd.DataFrame) -> Dict:
+    """
+    Converte um DataFrame para a forma colunar enviada entre processos
+
+    Colunas de texto (ou object) viram (códigos int32, valores distintos);
+    as demais seguem como o próprio array. Ausentes recebem o código -1.
+    """
+    colunas = []
+    for nome in df.columns:
+        serie = df[nome]
+        if serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype):
+            codes, uniques = pd.factorize(serie)
+            colunas.append((nome, str(serie.dtype), codes.astype(np.int32, copy=False),
+                            np.asarray(uniques, dtype=object)))
+        else:
+            colunas.append((nome, None, serie.array, None))
+    return {'rows': len(df), 'columns': colunas}
+
+
+def unpack_frame(packed: Dict) -> pd.DataFrame:
+    """Reconstrói o DataFrame gerado por pack_frame"""
+    dados = {}
+    for nome, dtype, valores, uniques in packed['columns']:
+        if dtype is None:
+            dados[nome] = pd.Series(valores)
+        else:
+            # O código -1 (ausente) seleciona o None acrescentado ao final
+            dados[nome] = pd.Series(np.append(uniques, None).take(valores), dtype=dtype)
+    if not dados:
+        return pd.DataFrame(index=pd.RangeIndex(packed['rows']))
+    return pd.DataFrame(dados)
+
+
+def _decode_packed(payload: str, formato: str, streaming: bool) -> tuple:
+    """Tarefa executada nos processos do pool: decodifica e empacota a exportação"""
+    inicio = time.perf_counter()
+    packed = pack_frame(decode_export(payload, formato, streaming))
+    return packed, time.perf_counter() - inicio
+
+
+def _warm_up():
+    """
+    Inicializador dos processos: reduz a prioridade (o processo web deve ganhar a
+    CPU quando há poucos núcleos) e importa o pandas antes da primeira tarefa
+    """
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(INGEST_NICE)
+        except OSError:
+            pass
+    pd.DataFrame({'id': [1]})
+
+
+class IngestPool:
+    """
+    Pool de processos para decodificar exportações
+
+    Com zero processos, decodifica na própria thread do chamador. Se um
+    processo do pool morrer, o pool é recriado e a exportação afetada é
+    decodificada localmente.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = Config.INGEST_PROCESSES if processes is None else max(0, processes)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.decoded = 0
+        self.local_decodes = 0
+        self.failures = 0
+        self.worker_seconds = 0.0
+        self.unpack_seconds = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: o processo web tem threads (Dash, carregador, sessão) e fork não é seguro
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_up
+                )
+            return self._executor
+
+    def start(self):
+        """Cria o pool antecipadamente, para que a primeira carga não pague o início dos processos"""
+        if self.processes:
+            self._pool()
+
+    def decode(self, payload: str, formato: str) -> pd.DataFrame:
+        """
+        Decodifica uma exportação (bloqueia até o resultado)
+
+        Raises:
+            ValueError: se o payload está truncado ou malformado
+        """
+        streaming = Config.STREAMING_DECODE
+        if not self.processes:
+            with self._lock:
+                self.local_decodes += 1
+            return decode_export(payload, formato, streaming)
+
+        executor = self._pool()
+        try:
+            packed, segundos = executor.submit(_decode_packed, payload, formato, streaming).result()
+        except BrokenProcessPool:
+            logger.warning("Processo de decodificação encerrado; recriando o pool e decodificando localmente")
+            with self._lock:
+                self.failures += 1
+                self.local_decodes += 1
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return decode_export(payload, formato, streaming)
+
+        inicio = time.perf_counter()
+        df = unpack_frame(packed)
+        with self._lock:
+            self.decoded += 1
+            self.worker_seconds += segundos
+            self.unpack_seconds += time.perf_counter() - inicio
+        return df
+
+    def snapshot(self) -> Dict:
+        """Contadores para o status e o log do carregamento"""
+        with self._lock:
+            return {
+                'processes': self.processes,
+                'decoded': self.decoded,
+                'local_decodes': self.local_decodes,
+                'failures': self.failures,
+                'worker_seconds': round(self.worker_seconds, 3),
+                'unpack_seconds': round(self.unpack_seconds, 3),
+            }
+
+    def shutdown(self):
+        """Encerra os processos do pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_ingest_pool: Optional[IngestPool] = None
+_ingest_pool_lock = threading.Lock()
+
+
+def get_ingest_pool() -> IngestPool:
+    """Retorna o pool de decodificação compartilhado, criando-o na primeira chamada"""
+    global _ingest_pool
+    with _ingest_pool_lock:
+        if _ingest_pool is None:
+            _ingest_pool = IngestPool()
+            atexit.register(_ingest_pool.shutdown)
+        return _ingest_pool
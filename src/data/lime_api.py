@@ -2,48 +2,101 @@
 Módulo para conexão com a API do LimeSurvey
 """
 
-import requests
 import pandas as pd
 import json
-import base64
+import hashlib
 import re
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 from config.settings import Config
+from data.lime_transport import get_transport
+from data.session_manager import get_session_manager
+from data.ingest_pool import get_ingest_pool
+from data.response_decoder import decode_json_export
+from utils.question_map_cache import QuestionMapCache, get_question_map_cache
+from utils.survey_catalog import get_survey_catalog, survey_tasks_from
+from utils.column_projection import METADATA_COLUMNS
+
+# Métodos RemoteControl cujo segundo parâmetro é o id do survey
+SURVEY_METHODS = {'export_responses', 'list_groups', 'list_questions', 'get_survey_properties',
+                  'get_language_properties', 'get_summary'}
+
+_HTML_TAG = re.compile(r'<[^>]+>')
+_ESPACOS = re.compile(r'\s+')
 
 def limpar_html(texto):
     """Remove tags HTML do texto"""
     if pd.isna(texto):
         return texto
     texto = str(texto)
-    texto = re.sub(r'<[^>]+>', '', texto)
+    texto = _HTML_TAG.sub('', texto)
     return texto.strip()
 
+def normalizar_cabecalho(coluna: str, question_map: Dict[str, str]) -> str:
+    """
+    Nome final de uma coluna exportada: texto da pergunta (CÓDIGO. TEXTO),
+    espaços colapsados, sem caracteres ocultos nem tags HTML
+    """
+    nome = question_map.get(coluna, coluna)
+    if not isinstance(nome, str):
+        return nome
+    nome = _ESPACOS.sub(' ', nome.strip()).replace('\xa0', '')
+    return limpar_html(nome).strip()
+
 class LimeSurveyAPI:
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None, question_maps: Optional[QuestionMapCache] = None):
         self.api_url = Config.LIME_API_URL
         self.username = Config.LIME_USERNAME
         self.password = Config.LIME_PASSWORD
-        self.session_key = None
+        
+        # Chave de sessão compartilhada entre instâncias, threads e recarregamentos
+        self.sessions = get_session_manager()
+        
+        # Pool de conexões compartilhado entre todas as instâncias
+        self.transport = get_transport(pool_size)
+        
+        # Mapas código -> texto das perguntas, persistidos em disco e compartilhados
+        # (ou um cache próprio, em outro diretório)
+        self.question_maps = question_maps or get_question_map_cache()
+        
+        # Decodificação das exportações em processos separados, compartilhada
+        self.ingest = get_ingest_pool()
+        
+        # Título, situação, respostas e data de modificação de cada survey
+        self.catalog = get_survey_catalog()
         
         # IDs dos surveys conforme sua configuração
         self.survey_ids = Config.SURVEY_IDS
         
-    def limesurvey_api_request(self, method: str, params: List, session_key: Optional[str] = None, id_: int = 1) -> Dict:
+    @property
+    def session_key(self) -> Optional[str]:
+        """Chave de sessão emprestada pelo gerenciador (faz login se necessário)"""
+        return self.sessions.lease(self._login, self._release)
+    
+    @staticmethod
+    def survey_of(method: str, params: List) -> Optional[str]:
+        """Survey de uma chamada (segundo parâmetro, depois da chave de sessão)"""
+        if method in SURVEY_METHODS and len(params) > 1:
+            return str(params[1])
+        return None
+    
+    def limesurvey_api_request(self, method: str, params: List, session_key: Optional[str] = None, id_: int = 1,
+                               _renovar_sessao: bool = True) -> Dict:
         """Faz requisição para a API do LimeSurvey"""
         if not self.api_url:
             print("❌ URL da API do LimeSurvey não configurada")
             return {'error': 'URL da API não configurada'}
             
-        headers = {'Content-Type': 'application/json'}
+        # Nova lista de parâmetros: a lista do chamador nunca é alterada, o que
+        # permite reutilizá-la entre threads
+        params = [session_key, *params] if session_key else list(params)
         payload = {'method': method, 'params': params, 'id': id_}
-        # Inserir session_key nos params quando fornecida
-        if session_key:
-            payload['params'].insert(0, session_key)
         try:
             #print(f"📡 Enviando requisição para {self.api_url}")
             #print(f"📦 Payload: {json.dumps(payload)}")
             
-            response = requests.post(self.api_url, data=json.dumps(payload), headers=headers)
+            response = self.transport.post(self.api_url, method, json.dumps(payload),
+                                           survey_id=self.survey_of(method, params))
 
             #print(f"📥 Status code: {response.status_code}")
             #print(f"📄 Resposta: {response.text[:200]}...")  # Mostrar primeiros 200 caracteres
@@ -51,8 +104,21 @@ class LimeSurveyAPI:
             if response.status_code != 200:
                 print(f"❌ Erro HTTP: {response.status_code}")
                 return {'error': f'HTTP Error: {response.status_code}'}
+            
+            resultado = response.json()
+            
+            # Sessão expirada no servidor: renovar a chave e repetir uma vez
+            if _renovar_sessao and payload['params'] and self._sessao_invalida(resultado):
+                chave_antiga = payload['params'][0]
+                print("🔑 Sessão inválida, renovando chave...")
+                self.sessions.invalidate(chave_antiga)
+                chave_nova = self.session_key
+                if chave_nova and chave_nova != chave_antiga:
+                    return self.limesurvey_api_request(
+                        method, [chave_nova] + list(payload['params'][1:]), id_=id_, _renovar_sessao=False
+                    )
                 
-            return response.json()
+            return resultado
         except json.JSONDecodeError as e:
             print(f"❌ Erro ao decodificar JSON: {e}")
             print(f"📄 Resposta recebida: {response.text}")
@@ -60,18 +126,25 @@ class LimeSurveyAPI:
         except Exception as e:
             print(f"❌ Erro na requisição API: {e}")
             return {'error': str(e)}
+    
+    @staticmethod
+    def _sessao_invalida(resultado: Dict) -> bool:
+        """Verifica se a API respondeu que a chave de sessão é inválida"""
+        result = resultado.get('result') if isinstance(resultado, dict) else None
+        return isinstance(result, dict) and 'invalid session' in str(result.get('status', '')).lower()
         
-    def get_session_key(self) -> Optional[str]:
-        """Obtém a chave de sessão da API"""
+    def _login(self) -> Optional[str]:
+        """Faz login na API e retorna uma nova chave de sessão"""
         try:
-            login_response = self.limesurvey_api_request('get_session_key', [self.username, self.password])
+            login_response = self.limesurvey_api_request(
+                'get_session_key', [self.username, self.password], _renovar_sessao=False
+            )
             session_key = login_response.get('result')
             
-            if not session_key:
-                print(f"Erro ao obter chave de sessão: {login_response.get('error')}")
+            if not session_key or not isinstance(session_key, str):
+                print(f"Erro ao obter chave de sessão: {login_response.get('error') or session_key}")
                 return None
                 
-            self.session_key = session_key
             print(f'✅ Sessão iniciada com chave: {session_key}')
             return session_key
                 
@@ -79,80 +152,368 @@ class LimeSurveyAPI:
             print(f"Erro na conexão com LimeSurvey: {e}")
             return None
     
+    def _release(self, session_key: str):
+        """Libera uma chave de sessão na API (melhor esforço, sem novas tentativas)"""
+        if self.api_url:
+            payload = {'method': 'release_session_key', 'params': [session_key], 'id': 1}
+            self.transport.post_once(self.api_url, 'release_session_key', json.dumps(payload))
+    
+    def get_session_key(self) -> Optional[str]:
+        """Obtém a chave de sessão da API (reutiliza a chave compartilhada enquanto válida)"""
+        return self.session_key
+    
     def release_session_key(self):
-        """Libera a chave de sessão"""
-        if self.session_key:
-            try:
-                self.limesurvey_api_request('release_session_key', [self.session_key])
-            except Exception as e:
-                print(f"Erro ao liberar session key: {e}")
+        """
+        Mantida por compatibilidade; não libera a chave
+        
+        A chave é compartilhada por todas as threads e recarregamentos do
+        processo, e liberá-la aqui derrubaria os downloads em andamento. Ela é
+        liberada no encerramento do processo (SessionKeyManager.shutdown).
+        """
     
-    def download_survey_data(self, survey_id: str) -> pd.DataFrame:
+    def download_survey_data(self, survey_id: str, from_id: Optional[int] = None,
+                             to_id: Optional[int] = None,
+                             question_map: Optional[Dict[str, str]] = None,
+                             columns: Optional[Iterable[str]] = None,
+                             strict: bool = False) -> pd.DataFrame:
         """
         Baixa dados de um survey específico
         
         Args:
             survey_id: ID do survey
+            from_id: Se fornecido, exporta apenas respostas com id >= from_id
+            to_id: Se fornecido, exporta apenas respostas com id <= to_id
+            question_map: Mapa de perguntas já obtido (evita buscá-lo a cada bloco)
+            columns: Códigos das perguntas a exportar (None = todas as colunas)
+            strict: Propagar as falhas em vez de devolver um DataFrame vazio, que
+                passa a significar só "sem respostas no intervalo"
             
         Returns:
             DataFrame com os dados do survey
         """
         if not self.session_key:
-            self.get_session_key()
-            
-        if not self.session_key:
+            if strict:
+                raise Exception("sem chave de sessão")
             return pd.DataFrame()
         
+        formato = self.export_format(survey_id)
         try:
+            # Com projeção, os campos pedidos saem do mapa de perguntas
+            fields = None
+            if columns is not None:
+                if question_map is None:
+                    question_map = self.get_question_map(survey_id)
+                fields = self.export_fields(survey_id, question_map, columns)
+            
             # Exportar respostas do formulário
             response = self.limesurvey_api_request(
-                'export_responses',
-                [self.session_key, survey_id, 'json', 'pt-BR', 'complete', 'long', 'long']
+                'export_responses', self.export_params(survey_id, formato, from_id, to_id, fields)
             )
 
             if response.get('error'):
                 print(f"Erro ao exportar respostas do survey {survey_id}: {response['error']}")
+                if strict:
+                    raise Exception(f"erro ao exportar respostas: {response['error']}")
+                return pd.DataFrame()
+            
+            # Sem respostas no intervalo pedido a API devolve apenas um status
+            if isinstance(response.get('result'), dict):
+                status = response['result'].get('status', 'sem respostas')
+                print(f"ℹ️ Survey {survey_id}: {status}")
+                if strict and status != 'No Response found':
+                    raise Exception(f"erro ao exportar respostas: {status}")
                 return pd.DataFrame()
 
-            # Decodificar dados
-            respostas = base64.b64decode(response['result']).decode('utf-8')
-            dados = json.loads(respostas)
-            df = pd.DataFrame(dados['responses'])
+            # Decodificar dados fora do processo web (o payload sai da resposta
+            # para ser liberado logo após o uso)
+            df = self.ingest.decode(response.pop('result'), formato)
 
             # Obter textos das perguntas (CÓDIGO. TEXTO COMPLETO)
-            question_map = {}
-            group_list = self.limesurvey_api_request('list_groups', [self.session_key, survey_id])
-            
-            if group_list.get('result'):
-                for group in group_list['result']:
-                    gid = group['gid']
-                    questions = self.limesurvey_api_request('list_questions', [self.session_key, survey_id, gid, 'pt-BR'])
-                    
-                    if questions.get('result'):
-                        for q in questions['result']:
-                            code = q['title']
-                            text = q['question'].replace('\n', ' ').strip()
-                            full = f"{code}. {text}"
-                            question_map[code] = full
+            if question_map is None:
+                question_map = self.get_question_map(survey_id)
 
-            # Renomear colunas do DataFrame
-            df.columns = [question_map.get(col, col) for col in df.columns]
-            
-            # Adicionar coluna de origem
-            df['form_origem'] = survey_id
-            
-            # Limpeza de caracteres ocultos e tags HTML
-            df.columns = df.columns.str.strip().str.replace(r'\s+', ' ', regex=True).str.replace('\xa0', '', regex=False)
-            df.columns = [limpar_html(col) for col in df.columns]
-            df.columns = df.columns.str.strip()
+            df = self.normalize_frame(df, survey_id, question_map)
             
             print(f'Formulário {survey_id} obtido com sucesso!')
             return df
             
         except Exception as e:
             print(f"Erro ao processar survey {survey_id}: {e}")
+            if strict:
+                raise
             return pd.DataFrame()
     
+    def export_params(self, survey_id: str, formato: str, from_id: Optional[int] = None,
+                      to_id: Optional[int] = None, fields: Optional[List[str]] = None) -> List:
+        """Parâmetros de export_responses; aFields só é enviado com projeção de colunas"""
+        params = [self.session_key, survey_id, formato, 'pt-BR', 'complete', 'long', 'long', from_id, to_id]
+        return params + [fields] if fields else params
+    
+    def export_fields(self, survey_id: str, question_map: Dict[str, str],
+                      columns: Iterable[str]) -> Optional[List[str]]:
+        """
+        Campos de export_responses para os códigos de perguntas pedidos
+        
+        Returns:
+            Lista de campos (colunas de controle incluídas), ou None para exportar
+            todas as colunas quando os campos do survey não são conhecidos
+        """
+        campos = self.question_maps.get_fields(survey_id, question_map)
+        if not campos:
+            return None
+        fields = list(METADATA_COLUMNS)
+        for code in sorted(columns):
+            fields.extend(campos.get(code, ()))
+        return fields
+    
+    @staticmethod
+    def header_mapping(columns, question_map: Dict[str, str],
+                       cached: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Mapeamento coluna exportada -> nome final, calculando só as colunas ainda não mapeadas
+        
+        Args:
+            columns: Colunas da exportação
+            question_map: Mapa código -> texto das perguntas
+            cached: Mapeamento já calculado para este question_map
+        """
+        mapping = dict(cached) if cached else {}
+        for col in columns:
+            if col not in mapping:
+                mapping[col] = normalizar_cabecalho(col, question_map)
+        return mapping
+    
+    def normalize_frame(self, df: pd.DataFrame, survey_id: str, question_map: Dict[str, str]) -> pd.DataFrame:
+        """
+        finalize_frame com o mapeamento de colunas guardado junto com o question_map
+        
+        O mapeamento é calculado uma vez por estrutura do survey e só é
+        regravado quando a exportação traz colunas novas.
+        """
+        cached = self.question_maps.get_header_map(survey_id, question_map)
+        header_map = self.header_mapping(df.columns, question_map, cached)
+        if cached is not None and len(header_map) > len(cached):
+            self.question_maps.update_header_map(survey_id, question_map, header_map)
+        return self.finalize_frame(df, survey_id, question_map, header_map)
+    
+    @staticmethod
+    def finalize_frame(df: pd.DataFrame, survey_id: str, question_map: Dict[str, str],
+                       header_map: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Renomeia as colunas com o texto das perguntas e marca a origem das respostas"""
+        # Texto da pergunta e limpeza de caracteres ocultos e tags HTML em uma única troca de colunas
+        if header_map is None:
+            header_map = LimeSurveyAPI.header_mapping(df.columns, question_map)
+        df.columns = [header_map.get(col, col) for col in df.columns]
+        
+        # Adicionar coluna de origem
+        df['form_origem'] = survey_id
+        
+        # id numérico para permitir comparação com a marca d'água da sincronização incremental
+        if 'id' in df.columns:
+            df['id'] = pd.to_numeric(df['id'], errors='coerce')
+        return df
+    
+    @staticmethod
+    def export_format(survey_id: str) -> str:
+        """Formato de exportação configurado para o survey ('json' ou 'csv')"""
+        formato = Config.EXPORT_FORMAT_BY_SURVEY.get(survey_id, Config.EXPORT_FORMAT).strip().lower()
+        return formato if formato in ('json', 'csv') else 'json'
+    
+    def get_response_count(self, survey_id: str) -> Optional[int]:
+        """Número de respostas completas do survey segundo get_summary"""
+        result = self.limesurvey_api_request(
+            'get_summary', [self.session_key, survey_id, 'completed_responses']
+        ).get('result')
+        # Versões antigas do LimeSurvey devolvem o dicionário completo
+        if isinstance(result, dict):
+            result = result.get('completed_responses')
+        try:
+            return int(result)
+        except (TypeError, ValueError):
+            return None
+    
+    def survey_overview(self, survey_id: str, title: Optional[str] = None,
+                        lastmodified: Optional[str] = None) -> Optional[Dict]:
+        """
+        Situação atual do survey para o catálogo e a sondagem de mudanças
+        
+        O título é uma propriedade de idioma e só é consultado quando ainda não
+        é conhecido ou quando o survey foi modificado desde a consulta anterior.
+        
+        Args:
+            survey_id: ID do survey
+            title: Título já conhecido
+            lastmodified: Data de modificação de quando o título foi obtido
+            
+        Returns:
+            Título, situação, número de respostas completas e data de modificação,
+            ou None se get_summary ou get_survey_properties falhar
+        """
+        summary = self.limesurvey_api_request('get_summary', [self.session_key, survey_id, 'all']).get('result')
+        props = self.limesurvey_api_request(
+            'get_survey_properties', [self.session_key, survey_id, ['active', 'lastmodified']]
+        ).get('result')
+        if not isinstance(summary, dict) or 'completed_responses' not in summary or not isinstance(props, dict):
+            return None
+        
+        if title is None or props.get('lastmodified') != lastmodified:
+            language = self.limesurvey_api_request(
+                'get_language_properties', [self.session_key, survey_id, ['surveyls_title']]
+            ).get('result')
+            if isinstance(language, dict) and language.get('surveyls_title'):
+                title = limpar_html(language['surveyls_title'])
+        return {
+            'title': title,
+            'active': props.get('active') == 'Y',
+            'completed_responses': str(summary['completed_responses']),
+            'lastmodified': props.get('lastmodified'),
+        }
+    
+    def list_response_ids(self, survey_id: str) -> List[int]:
+        """Exporta apenas a coluna id das respostas completas do survey"""
+        response = self.limesurvey_api_request(
+            'export_responses',
+            [self.session_key, survey_id, 'json', 'pt-BR', 'complete', 'code', 'short', None, None, ['id']]
+        )
+        if not isinstance(response.get('result'), str):
+            return []
+        df = decode_json_export(response['result'])
+        if 'id' not in df.columns:
+            return []
+        return sorted(int(i) for i in pd.to_numeric(df['id'], errors='coerce').dropna())
+    
+    def plan_export_chunks(self, survey_id: str, chunk_size: int) -> List[tuple]:
+        """
+        Divide a exportação do survey em intervalos de ids de resposta
+        
+        Args:
+            survey_id: ID do survey
+            chunk_size: Número aproximado de respostas por bloco
+            
+        Returns:
+            Lista de tuplas (from_id, to_id); [(None, None)] exporta o survey inteiro
+        """
+        count = self.get_response_count(survey_id)
+        if not chunk_size or count is None or count <= chunk_size:
+            return [(None, None)]
+        
+        ids = self.list_response_ids(survey_id)
+        if len(ids) <= chunk_size:
+            return [(None, None)]
+        
+        chunks = [(ids[i], ids[min(i + chunk_size, len(ids)) - 1]) for i in range(0, len(ids), chunk_size)]
+        # Último bloco sem limite superior para incluir respostas enviadas após o planejamento
+        chunks[-1] = (chunks[-1][0], None)
+        return chunks
+    
+    def get_question_map(self, survey_id: str) -> Dict[str, str]:
+        """
+        Obtém o mapa código -> "CÓDIGO. TEXTO COMPLETO" das perguntas do survey
+        
+        O mapa fica em cache em disco associado a uma impressão digital da
+        estrutura do survey e só é recarregado quando ela muda.
+        
+        Args:
+            survey_id: ID do survey
+            
+        Returns:
+            Dicionário com o texto completo de cada código de pergunta
+        """
+        group_list = self.limesurvey_api_request('list_groups', [self.session_key, survey_id])
+        groups = group_list.get('result')
+        if not isinstance(groups, list):
+            return {}
+        
+        fingerprint = self._survey_fingerprint(survey_id, groups)
+        question_map = self.question_maps.get(survey_id, fingerprint)
+        if question_map is not None:
+            return question_map
+        
+        question_map, completo, fields = self._fetch_question_map(survey_id, groups)
+        # Só persistir mapas completos; falhas parciais serão refeitas no próximo carregamento
+        if question_map and completo:
+            self.question_maps.set(survey_id, fingerprint, question_map, fields)
+        return question_map
+    
+    def _survey_fingerprint(self, survey_id: str, groups: List[Dict]) -> str:
+        """
+        Calcula a impressão digital da estrutura do survey
+        
+        A data de modificação vem do catálogo quando a entrada está dentro da
+        validade (a sondagem do carregador acabou de consultá-la).
+        """
+        entry = self.catalog.get(survey_id)
+        if entry is not None:
+            props = {'lastmodified': entry.get('lastmodified')}
+        else:
+            props = self.limesurvey_api_request(
+                'get_survey_properties', [self.session_key, survey_id, ['lastmodified']]
+            ).get('result')
+        return self.fingerprint_from(groups, props)
+    
+    @staticmethod
+    def fingerprint_from(groups: List[Dict], props) -> str:
+        """Impressão digital a partir de list_groups e da propriedade lastmodified"""
+        last_modified = props.get('lastmodified') if isinstance(props, dict) else None
+        base = json.dumps({'groups': groups, 'lastmodified': last_modified}, sort_keys=True, default=str)
+        return hashlib.sha1(base.encode('utf-8')).hexdigest()
+    
+    def _fetch_question_map(self, survey_id: str, groups: List[Dict]) -> tuple:
+        """Baixa as perguntas de todos os grupos em paralelo
+        
+        Returns:
+            Tupla (question_map, completo, fields) onde completo indica se todos os grupos
+            responderam e fields traz os campos de export_responses de cada código
+        """
+        def list_questions(gid):
+            return self.limesurvey_api_request('list_questions', [self.session_key, survey_id, gid, 'pt-BR'])
+        
+        gids = [group['gid'] for group in groups]
+        with ThreadPoolExecutor(max_workers=max(1, min(len(gids), self.transport.pool_size))) as executor:
+            responses = list(executor.map(list_questions, gids))
+        
+        question_map, completo = self.question_map_from(responses)
+        print(f"📝 Mapa de perguntas do survey {survey_id} atualizado ({len(question_map)} perguntas)")
+        return question_map, completo, self.export_fields_from(survey_id, responses)
+    
+    @staticmethod
+    def question_map_from(responses: List[Dict]) -> tuple:
+        """Monta o question_map a partir das respostas de list_questions de cada grupo"""
+        question_map = {}
+        completo = True
+        for questions in responses:
+            result = questions.get('result')
+            if not isinstance(result, list):
+                # Grupos vazios respondem com status 'No questions found'
+                if not (isinstance(result, dict) and result.get('status') == 'No questions found'):
+                    completo = False
+                continue
+            for q in result:
+                code = q['title']
+                text = q['question'].replace('\n', ' ').strip()
+                question_map[code] = f"{code}. {text}"
+        return question_map, completo
+    
+    @staticmethod
+    def export_fields_from(survey_id: str, responses: List[Dict]) -> Dict[str, List[str]]:
+        """
+        Campos de export_responses (nomes SGQA) de cada código de pergunta
+        
+        Perguntas simples exportam {sid}X{gid}X{qid}; subperguntas acrescentam o
+        código delas ao da pergunta pai e a opção "Outros" acrescenta 'other'.
+        """
+        questions = [q for r in responses if isinstance(r.get('result'), list) for q in r['result']]
+        pais = {str(q['qid']): q for q in questions if not int(q.get('parent_qid') or 0)}
+        fields = {}
+        for q in pais.values():
+            base = f"{survey_id}X{q['gid']}X{q['qid']}"
+            fields[q['title']] = [base] + ([f'{base}other'] if q.get('other') == 'Y' else [])
+        for q in questions:
+            pai = pais.get(str(q.get('parent_qid') or 0))
+            if pai is not None:
+                fields[pai['title']].append(f"{survey_id}X{pai['gid']}X{pai['qid']}{q['title']}")
+        return fields
+    
     def get_all_survey_data(self, processo_numero: Optional[str] = None) -> Dict[str, pd.DataFrame]:
         """
         Obtém dados de todos os surveys organizados por categoria
@@ -210,8 +571,6 @@ class LimeSurveyAPI:
         except Exception as e:
             print(f"Erro ao obter dados dos surveys: {e}")
             return {}
-        finally:
-            self.release_session_key()
     
     def _filter_by_processo_numero(self, all_data: Dict[str, pd.DataFrame], processo_numero: str) -> Dict[str, pd.DataFrame]:
         """Filtra os dados por número do processo"""
@@ -239,30 +598,30 @@ class LimeSurveyAPI:
         return filtered_data
     
     def get_survey_info(self) -> Dict:
-        """Obtém informações sobre os surveys"""
+        """
+        Obtém informações sobre os surveys a partir do catálogo
+        
+        Só as entradas vencidas são consultadas, todas em paralelo.
+        
+        Returns:
+            Dicionário categoria -> lista de surveys com id, título, situação,
+            número de respostas completas e data de modificação
+        """
         if not self.get_session_key():
             return {}
         
-        try:
-            survey_info = {}
-            
-            for categoria, survey_list in self.survey_ids.items():
-                survey_info[categoria] = []
-                
-                for survey_id in survey_list:
-                    response = self.limesurvey_api_request('get_survey_properties', [self.session_key, survey_id])
-                    
-                    if response.get('result'):
-                        survey_info[categoria].append({
-                            'id': survey_id,
-                            'title': response['result'].get('surveyls_title', f'Survey {survey_id}'),
-                            'active': response['result'].get('active', 'N')
-                        })
-            
-            return survey_info
-            
-        except Exception as e:
-            print(f"Erro ao obter informações dos surveys: {e}")
-            return {}
-        finally:
-            self.release_session_key()
+        surveys = survey_tasks_from(self.survey_ids)
+        entries = self.catalog.refresh(lambda: self, surveys)
+        survey_info = {}
+        for survey_id, categoria in surveys:
+            survey_info.setdefault(categoria, [])
+            entry = entries.get(survey_id)
+            if entry:
+                survey_info[categoria].append({
+                    'id': survey_id,
+                    'title': entry.get('title') or f'Survey {survey_id}',
+                    'active': 'Y' if entry.get('active') else 'N',
+                    'responses': int(entry['completed_responses']) if entry['completed_responses'].isdigit() else None,
+                    'lastmodified': entry.get('lastmodified')
+                })
+        return survey_info
@@ -0,0 +1,201 @@
+"""
+Cliente asyncio para a API RemoteControl do LimeSurvey
+
+Expõe os mesmos métodos do LimeSurveyAPI como corrotinas. Todas as chamadas
+passam por um semáforo global que limita quantas requisições ficam em
+andamento ao mesmo tempo, o que permite disparar de uma vez as exportações
+e as chamadas de metadados de todos os surveys sem exceder o limite.
+
+As requisições usam o mesmo transporte HTTP (pool, timeouts e novas
+tentativas) do cliente síncrono, executado em um pool de threads próprio do
+cliente com o mesmo tamanho do limite de chamadas em andamento.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+
+
+class AsyncLimeSurveyAPI:
+    """Cliente assíncrono com concorrência limitada por semáforo"""
+
+    def __init__(self, max_inflight: Optional[int] = None):
+        self.max_inflight = max_inflight or Config.LIME_MAX_INFLIGHT
+        # O cliente síncrono fornece transporte, chave de sessão compartilhada
+        # e cache de question maps
+        self._api = LimeSurveyAPI(pool_size=self.max_inflight)
+        self.survey_ids = self._api.survey_ids
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def session_key(self) -> Optional[str]:
+        """Chave já emprestada; use get_session_key() para fazer login sem bloquear o loop"""
+        return self._api.sessions.current()
+
+    @property
+    def transport(self):
+        return self._api.transport
+
+    def _bind_loop(self):
+        """Cria o semáforo e as threads de I/O no loop em execução"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_inflight,
+                                                thread_name_prefix='lime-async')
+
+    async def call(self, method: str, params: List) -> Dict:
+        """Executa uma chamada JSON-RPC respeitando o limite de chamadas em andamento"""
+        self._bind_loop()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._api.limesurvey_api_request, method, params
+            )
+
+    async def close(self):
+        """Libera as threads de I/O do cliente"""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._semaphore = None
+
+    async def get_session_key(self) -> Optional[str]:
+        """Obtém a chave de sessão compartilhada, fazendo login se necessário"""
+        self._bind_loop()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._api.get_session_key)
+
+    async def release_session_key(self):
+        """Mantida por compatibilidade; a chave compartilhada é liberada no encerramento"""
+        await asyncio.to_thread(self._api.release_session_key)
+
+    async def export_responses(self, survey_id: str, document_type: str = 'json',
+                               from_id: Optional[int] = None, to_id: Optional[int] = None,
+                               fields: Optional[List[str]] = None) -> Dict:
+        """Exporta as respostas completas do survey"""
+        return await self.call(
+            'export_responses', self._api.export_params(survey_id, document_type, from_id, to_id, fields)
+        )
+
+    async def list_groups(self, survey_id: str) -> Dict:
+        return await self.call('list_groups', [self.session_key, survey_id])
+
+    async def list_questions(self, survey_id: str, gid) -> Dict:
+        return await self.call('list_questions', [self.session_key, survey_id, gid, 'pt-BR'])
+
+    async def get_survey_properties(self, survey_id: str, properties: Optional[List[str]] = None) -> Dict:
+        params = [self.session_key, survey_id]
+        if properties:
+            params.append(properties)
+        return await self.call('get_survey_properties', params)
+
+    async def get_question_map(self, survey_id: str) -> Dict[str, str]:
+        """Mesmo contrato de LimeSurveyAPI.get_question_map, com as chamadas em paralelo"""
+        # Data de modificação do catálogo, se ainda válida; senão consultada junto com os grupos
+        entry = self._api.catalog.get(survey_id)
+        if entry is not None:
+            group_list = await self.list_groups(survey_id)
+            props = {'result': {'lastmodified': entry.get('lastmodified')}}
+        else:
+            group_list, props = await asyncio.gather(
+                self.list_groups(survey_id),
+                self.get_survey_properties(survey_id, ['lastmodified'])
+            )
+        groups = group_list.get('result')
+        if not isinstance(groups, list):
+            return {}
+
+        fingerprint = LimeSurveyAPI.fingerprint_from(groups, props.get('result'))
+        question_map = self._api.question_maps.get(survey_id, fingerprint)
+        if question_map is not None:
+            return question_map
+
+        responses = await asyncio.gather(*(self.list_questions(survey_id, g['gid']) for g in groups))
+        question_map, completo = LimeSurveyAPI.question_map_from(responses)
+        print(f"📝 Mapa de perguntas do survey {survey_id} atualizado ({len(question_map)} perguntas)")
+        if question_map and completo:
+            self._api.question_maps.set(survey_id, fingerprint, question_map,
+                                        LimeSurveyAPI.export_fields_from(survey_id, responses))
+        return question_map
+
+    async def plan_export_chunks(self, survey_id: str, chunk_size: int) -> List[tuple]:
+        """Mesmo contrato de LimeSurveyAPI.plan_export_chunks, sem bloquear o loop"""
+        self._bind_loop()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._api.plan_export_chunks, survey_id, chunk_size
+            )
+
+    async def _question_map(self, survey_id: str, question_map: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Mapa de perguntas recebido ou, na falta dele, obtido da API"""
+        if question_map is not None:
+            return question_map
+        return await self.get_question_map(survey_id)
+
+    async def download_survey_data(self, survey_id: str, from_id: Optional[int] = None,
+                                   to_id: Optional[int] = None,
+                                   question_map: Optional[Dict[str, str]] = None,
+                                   columns: Optional[Iterable[str]] = None,
+                                   strict: bool = False) -> pd.DataFrame:
+        """
+        Baixa dados de um survey, buscando exportação e metadados ao mesmo tempo
+
+        Args:
+            survey_id: ID do survey
+            from_id: Se fornecido, exporta apenas respostas com id >= from_id
+            to_id: Se fornecido, exporta apenas respostas com id <= to_id
+            question_map: Mapa de perguntas já obtido (evita buscá-lo a cada bloco)
+            columns: Códigos das perguntas a exportar (None = todas as colunas)
+            strict: Propagar as falhas em vez de devolver um DataFrame vazio
+
+        Returns:
+            DataFrame com os dados do survey (vazio em caso de erro, sem strict)
+        """
+        formato = LimeSurveyAPI.export_format(survey_id)
+        if not await self.get_session_key():
+            if strict:
+                raise Exception("sem chave de sessão")
+            return pd.DataFrame()
+        try:
+            inicio = time.perf_counter()
+            if columns is None:
+                response, question_map = await asyncio.gather(
+                    self.export_responses(survey_id, formato, from_id, to_id),
+                    self._question_map(survey_id, question_map)
+                )
+            else:
+                # Com projeção, os campos pedidos dependem do mapa de perguntas
+                question_map = await self._question_map(survey_id, question_map)
+                fields = self._api.export_fields(survey_id, question_map, columns)
+                response = await self.export_responses(survey_id, formato, from_id, to_id, fields)
+
+            if response.get('error'):
+                print(f"Erro ao exportar respostas do survey {survey_id}: {response['error']}")
+                if strict:
+                    raise Exception(f"erro ao exportar respostas: {response['error']}")
+                return pd.DataFrame()
+            if isinstance(response.get('result'), dict):
+                status = response['result'].get('status', 'sem respostas')
+                print(f"ℹ️ Survey {survey_id}: {status}")
+                if strict and status != 'No Response found':
+                    raise Exception(f"erro ao exportar respostas: {status}")
+                return pd.DataFrame()
+
+            # Decodificação no pool de processos, aguardada fora do loop de eventos
+            df = await asyncio.to_thread(self._api.ingest.decode, response.pop('result'), formato)
+            df = self._api.normalize_frame(df, survey_id, question_map)
+            print(f'Formulário {survey_id} obtido com sucesso! ({time.perf_counter() - inicio:.2f}s)')
+            return df
+        except Exception as e:
+            print(f"Erro ao processar survey {survey_id}: {e}")
+            if strict:
+                raise
+            return pd.DataFrame()
@@ -0,0 +1,388 @@
+"""
+Camada de transporte HTTP para a API RemoteControl do LimeSurvey
+
+Mantém um único pool de conexões keep-alive compartilhado por todas as
+instâncias de LimeSurveyAPI, aplica timeouts por método e repete
+requisições que falham de forma transitória com backoff exponencial.
+Negocia compressão gzip/deflate com o servidor e contabiliza os bytes
+recebidos (no fio e descomprimidos) por método e por survey.
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import defaultdict
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config.settings import Config
+from utils.adaptive_concurrency import get_concurrency_limiter
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP que indicam falha transitória e justificam nova tentativa
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Timeout de leitura por método (os demais usam Config.LIME_READ_TIMEOUT)
+METHOD_READ_TIMEOUTS = {
+    'export_responses': Config.LIME_EXPORT_READ_TIMEOUT,
+}
+
+
+class TransportStats:
+    """Contadores de uso do pool de conexões"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.retries = 0
+        self.failures = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Retorna uma cópia consistente dos contadores"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': max(self.requests - self.connections_opened, 0),
+                'retries': self.retries,
+                'failures': self.failures,
+            }
+
+
+class PayloadStats:
+    """Bytes das respostas por método e por survey, no fio e descomprimidos"""
+
+    FIELDS = ('responses', 'compressed_responses', 'wire_bytes', 'bytes', 'download_seconds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_method = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self._by_survey = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def record(self, method: str, survey_id: Optional[str], wire_bytes: int, size: int,
+               compressed: bool, download_seconds: float):
+        """
+        Registra uma resposta recebida
+
+        Args:
+            method: Método JSON-RPC
+            survey_id: Survey da chamada (None para chamadas sem survey)
+            wire_bytes: Bytes do corpo recebidos do servidor (comprimidos, se for o caso,
+                e com os delimitadores de Transfer-Encoding: chunked)
+            size: Bytes do corpo depois de descomprimido
+            compressed: Se o servidor respondeu com Content-Encoding
+            download_seconds: Tempo de leitura do corpo após os cabeçalhos
+        """
+        with self._lock:
+            for counters in (self._by_method[method], self._by_survey[survey_id] if survey_id else None):
+                if counters is None:
+                    continue
+                counters['responses'] += 1
+                counters['compressed_responses'] += int(compressed)
+                counters['wire_bytes'] += wire_bytes
+                counters['bytes'] += size
+                counters['download_seconds'] += download_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """Cópia dos contadores: {'by_method': {...}, 'by_survey': {...}}"""
+        with self._lock:
+            return {
+                'by_method': {k: dict(v) for k, v in self._by_method.items()},
+                'by_survey': {k: dict(v) for k, v in self._by_survey.items()},
+            }
+
+    @classmethod
+    def delta(cls, fim: Dict, inicio: Dict) -> Dict[str, Dict[str, dict]]:
+        """Diferença entre dois snapshots (o que foi recebido entre eles)"""
+        resultado = {}
+        for grupo, chaves in fim.items():
+            anteriores = inicio.get(grupo, {})
+            resultado[grupo] = {}
+            for chave, counters in chaves.items():
+                antes = anteriores.get(chave, {})
+                diff = {f: counters[f] - antes.get(f, 0) for f in cls.FIELDS}
+                if diff['responses']:
+                    resultado[grupo][chave] = diff
+        return resultado
+
+    @staticmethod
+    def summary(counters: Dict) -> Dict:
+        """
+        Totais de um snapshot (ou delta) com razão de compressão e tempo economizado
+
+        O tempo economizado é estimado pela vazão observada no download dos
+        corpos: bytes poupados / (bytes no fio / segundos de download).
+        """
+        total = dict.fromkeys(PayloadStats.FIELDS, 0)
+        for c in counters.get('by_method', {}).values():
+            for f in PayloadStats.FIELDS:
+                total[f] += c[f]
+        wire, size, segundos = total['wire_bytes'], total['bytes'], total['download_seconds']
+        total['ratio'] = round(size / wire, 2) if wire else 1.0
+        total['saved_seconds'] = round((size - wire) * segundos / wire, 3) if wire and segundos else 0.0
+        total['download_seconds'] = round(segundos, 3)
+        return total
+
+
+_stats = TransportStats()
+_payload_stats = PayloadStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _CountingReader:
+    """
+    Arquivo do socket de uma resposta que conta os bytes lidos
+
+    Fica abaixo do urllib3: conta o corpo como chegou, antes da
+    descompressão e com os delimitadores de Transfer-Encoding: chunked
+    (tell() do urllib3 2.x não avança nas respostas chunked).
+    """
+
+    def __init__(self, fp):
+        self._fp = fp
+        self.bytes_read = 0
+
+    def read(self, *args):
+        data = self._fp.read(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def read1(self, *args):
+        data = self._fp.read1(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self._fp.readline(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = self._fp.readinto(buffer)
+        self.bytes_read += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter que contabiliza as conexões novas e os bytes recebidos no fio"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+    def build_response(self, req, resp):
+        # O corpo ainda não foi lido (requests usa preload_content=False)
+        conexao = getattr(resp, '_fp', None)
+        contador = None
+        if getattr(conexao, 'fp', None) is not None:
+            contador = conexao.fp = _CountingReader(conexao.fp)
+        response = super().build_response(req, resp)
+        response.wire_counter = contador
+        return response
+
+
+class LimeTransport:
+    """Sessão HTTP com pool de conexões, timeouts e novas tentativas"""
+
+    def __init__(self, pool_size: int = Config.LIME_POOL_SIZE):
+        self.pool_size = pool_size
+        self.stats = _stats
+        self.payload_stats = _payload_stats
+        # Controle adaptativo de requisições simultâneas (None = só o limite do pool)
+        self.limiter = get_concurrency_limiter() if Config.ADAPTIVE_CONCURRENCY else None
+        self._local = threading.local()
+        self._mount(pool_size)
+
+    def _mount(self, pool_size: int):
+        # pool_block=True faz as threads excedentes aguardarem uma conexão livre
+        # em vez de abrir conexões descartáveis fora do pool
+        self._adapter = _PooledAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.pool_size = pool_size
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Sessão HTTP da thread atual
+
+        requests.Session não é garantidamente segura entre threads, então cada
+        thread tem a sua; todas montam o mesmo adapter e dividem o pool.
+        """
+        local = self._local
+        if getattr(local, 'session', None) is None:
+            local.session = requests.Session()
+            local.session.headers.update({'Content-Type': 'application/json'})
+        if getattr(local, 'adapter', None) is not self._adapter:
+            local.adapter = self._adapter
+            local.session.mount('http://', local.adapter)
+            local.session.mount('https://', local.adapter)
+        return local.session
+
+    def ensure_pool_size(self, pool_size: int):
+        """Aumenta o pool se for necessário atender mais workers"""
+        if pool_size > self.pool_size:
+            logger.info(f"Pool HTTP ampliado de {self.pool_size} para {pool_size} conexões")
+            anterior = self._adapter
+            self._mount(pool_size)
+            # Fecha as conexões ociosas do pool substituído; as que estão em uso
+            # são fechadas quando devolvidas a ele
+            anterior.close()
+
+    @staticmethod
+    def accept_encoding() -> str:
+        """Codificações aceitas nas respostas (identity = sem compressão)"""
+        return Config.LIME_ACCEPT_ENCODING.strip() or 'identity'
+
+    def _record_payload(self, response: requests.Response, method: str, survey_id: Optional[str],
+                        inicio: float):
+        """Contabiliza o corpo de uma resposta já lida"""
+        size = len(response.content)
+        contador = getattr(response, 'wire_counter', None)
+        wire_bytes = contador.bytes_read if contador is not None else size
+        download = max(time.perf_counter() - inicio - response.elapsed.total_seconds(), 0.0)
+        self.payload_stats.record(method, survey_id, wire_bytes, size,
+                                  bool(response.headers.get('Content-Encoding')), download)
+
+    @staticmethod
+    def timeout_for(method: str) -> tuple:
+        """Retorna o par (connect, read) de timeouts para o método"""
+        read_timeout = METHOD_READ_TIMEOUTS.get(method, Config.LIME_READ_TIMEOUT)
+        return (Config.LIME_CONNECT_TIMEOUT, read_timeout)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Backoff exponencial com jitter completo"""
+        ceiling = min(Config.LIME_BACKOFF_MAX, Config.LIME_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def post(self, url: str, method: str, body: str, survey_id: Optional[str] = None) -> requests.Response:
+        """
+        Envia uma chamada JSON-RPC, repetindo falhas transitórias
+
+        Args:
+            url: Endpoint RemoteControl
+            method: Nome do método JSON-RPC (define o timeout)
+            body: Corpo JSON já serializado
+            survey_id: Survey da chamada, para a contabilização de bytes
+
+        Returns:
+            Última resposta HTTP recebida
+
+        Raises:
+            requests.RequestException: se todas as tentativas falharem na conexão,
+                ou já na primeira tentativa para os demais erros (URL inválida,
+                corpo truncado ou mal codificado)
+        """
+        timeout = self.timeout_for(method)
+        attempts = Config.LIME_MAX_RETRIES + 1
+
+        for attempt in range(attempts):
+            self.stats.record_request()
+            permit = self.limiter.acquire() if self.limiter else None
+            # Sem resposta, qualquer exceção devolve a autorização como sobrecarga
+            liberacao = {'throttled': True, 'reason': f'{method}: sem resposta'}
+            inicio = time.perf_counter()
+            try:
+                response = self.session.post(url, data=body, timeout=timeout,
+                                             headers={'Accept-Encoding': self.accept_encoding()})
+                # elapsed mede até a chegada dos cabeçalhos, sem o download do corpo
+                liberacao = {'latency': response.elapsed.total_seconds(),
+                             'throttled': response.status_code in RETRY_STATUS,
+                             'reason': f'{method}: HTTP {response.status_code}'}
+            except (requests.ConnectionError, requests.Timeout) as e:
+                liberacao['reason'] = f'{method}: {type(e).__name__}'
+                if attempt + 1 >= attempts:
+                    self.stats.record_failure()
+                    raise
+                wait = self._backoff(attempt)
+                logger.warning(f"{method}: {type(e).__name__}, nova tentativa em {wait:.1f}s")
+            except Exception as e:
+                liberacao['reason'] = f'{method}: {type(e).__name__}'
+                raise
+            else:
+                if response.status_code not in RETRY_STATUS or attempt + 1 >= attempts:
+                    if response.status_code in RETRY_STATUS:
+                        self.stats.record_failure()
+                    else:
+                        self._record_payload(response, method, survey_id, inicio)
+                    return response
+                wait = self._backoff(attempt)
+                logger.warning(f"{method}: HTTP {response.status_code}, nova tentativa em {wait:.1f}s")
+                response.close()
+            finally:
+                if permit:
+                    self.limiter.release(permit, method, **liberacao)
+
+            self.stats.record_retry()
+            time.sleep(wait)
+
+    def post_once(self, url: str, method: str, body: str) -> requests.Response:
+        """
+        Envia uma única chamada fora do pool, sem novas tentativas
+
+        Usado na liberação da chave de sessão no encerramento do processo,
+        quando as conexões do pool podem já ter sido fechadas. Não entra em
+        self.stats: a conexão é aberta fora do pool contabilizado, e contá-la
+        inflaria connections_reused.
+        """
+        return requests.post(url, data=body, headers={'Content-Type': 'application/json'},
+                             timeout=(Config.LIME_CONNECT_TIMEOUT, Config.LIME_READ_TIMEOUT))
+
+
+_transport: Optional[LimeTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport(pool_size: Optional[int] = None) -> LimeTransport:
+    """
+    Retorna o transporte compartilhado, criando-o na primeira chamada
+
+    Args:
+        pool_size: Número mínimo de conexões que o pool deve comportar
+    """
+    global _transport
+    pool_size = pool_size or Config.LIME_POOL_SIZE
+    with _transport_lock:
+        if _transport is None:
+            _transport = LimeTransport(pool_size)
+        else:
+            _transport.ensure_pool_size(pool_size)
+        return _transport
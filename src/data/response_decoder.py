@@ -0,0 +1,172 @@
+"""
+Decodificação das exportações de respostas do LimeSurvey
+
+export_responses devolve o arquivo exportado em base64. Para o formato JSON,
+em vez de decodificar o payload inteiro, carregar o JSON completo e só então
+montar o DataFrame, as funções abaixo decodificam o base64 em blocos, extraem
+as respostas uma a uma do array "responses" e acumulam os valores por coluna,
+de modo que os grandes intermediários nunca ficam todos em memória ao mesmo
+tempo. O formato CSV é entregue diretamente ao parser C do pandas.
+"""
+
+import base64
+import codecs
+import io
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List
+
+import pandas as pd
+
+# Caracteres base64 decodificados por vez (múltiplo de 4)
+BASE64_CHUNK_CHARS = 1 << 20
+
+_decoder = json.JSONDecoder()
+
+# Tipos explícitos do CSV: id inteiro, demais colunas como texto (como no JSON)
+CSV_DTYPES = defaultdict(lambda: str, {'id': 'Int64'})
+
+
+def iter_base64_text(payload: str, chunk_chars: int = BASE64_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Decodifica um payload base64 com conteúdo UTF-8 em blocos de texto
+
+    Args:
+        payload: String base64 devolvida pela API
+        chunk_chars: Tamanho de cada bloco de entrada (arredondado para múltiplo de 4)
+    """
+    chunk_chars = max(4, chunk_chars - chunk_chars % 4)
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    for inicio in range(0, len(payload), chunk_chars):
+        texto = utf8.decode(base64.b64decode(payload[inicio:inicio + chunk_chars]))
+        if texto:
+            yield texto
+    final = utf8.decode(b'', final=True)
+    if final:
+        yield final
+
+
+def iter_json_responses(text_chunks: Iterable[str]) -> Iterator[dict]:
+    """
+    Extrai incrementalmente os objetos do array "responses" de uma exportação JSON
+
+    Args:
+        text_chunks: Blocos consecutivos do documento JSON
+
+    Raises:
+        ValueError: se o documento não contém o array "responses" ou está truncado
+    """
+    chunks = iter(text_chunks)
+    buffer = ''
+    pos = None  # posição logo após o '[' do array, quando encontrado
+
+    def ler_mais() -> bool:
+        nonlocal buffer
+        try:
+            buffer += next(chunks)
+            return True
+        except StopIteration:
+            return False
+
+    # Localizar o início do array de respostas
+    while pos is None:
+        chave = buffer.find('"responses"')
+        if chave >= 0:
+            colchete = buffer.find('[', chave)
+            if colchete >= 0:
+                pos = colchete + 1
+                break
+        if not ler_mais():
+            raise ValueError('Exportação JSON sem o array "responses"')
+
+    while True:
+        # Pular espaços e vírgulas entre os objetos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or not ler_mais():
+                break
+        if pos >= len(buffer):
+            raise ValueError('Exportação JSON truncada')
+        if buffer[pos] == ']':
+            return
+
+        try:
+            registro, fim = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Objeto incompleto: descartar o que já foi consumido e ler mais texto
+            buffer = buffer[pos:]
+            pos = 0
+            if not ler_mais():
+                raise ValueError('Exportação JSON truncada')
+            continue
+
+        yield registro
+        pos = fim
+        # Evitar que o buffer cresça com texto já consumido
+        if pos > BASE64_CHUNK_CHARS:
+            buffer = buffer[pos:]
+            pos = 0
+
+
+def records_to_frame(records: Iterable[dict]) -> pd.DataFrame:
+    """
+    Monta um DataFrame acumulando os valores por coluna
+
+    Cada registro é descartado assim que seus valores são copiados para as
+    listas de colunas. As colunas mantêm a ordem de primeira ocorrência, como
+    em pd.DataFrame(lista_de_dicts).
+    """
+    colunas: Dict[str, List] = {}
+    total = 0
+    for registro in records:
+        for coluna, valor in registro.items():
+            valores = colunas.get(coluna)
+            if valores is None:
+                valores = colunas[coluna] = [None] * total
+            valores.append(valor)
+        total += 1
+        # Completar colunas ausentes neste registro
+        if len(registro) != len(colunas):
+            for valores in colunas.values():
+                if len(valores) < total:
+                    valores.append(None)
+
+    # Converter coluna a coluna, liberando cada lista logo após a conversão
+    dados = {}
+    for coluna in list(colunas):
+        dados[coluna] = pd.Series(colunas.pop(coluna))
+    return pd.DataFrame(dados)
+
+
+def decode_json_export(payload: str) -> pd.DataFrame:
+    """Decodifica em streaming o payload base64 de uma exportação JSON"""
+    return records_to_frame(iter_json_responses(iter_base64_text(payload)))
+
+
+def decode_json_export_legacy(payload: str) -> pd.DataFrame:
+    """Decodificação original, com o documento inteiro em memória"""
+    respostas = base64.b64decode(payload).decode('utf-8')
+    dados = json.loads(respostas)
+    return pd.DataFrame(dados['responses'])
+
+
+def decode_csv_export(payload: str) -> pd.DataFrame:
+    """
+    Decodifica o payload base64 de uma exportação CSV com o parser C do pandas
+
+    Apenas campos vazios viram NaN; respostas como "NA" ou "N/A" são mantidas
+    como texto.
+    """
+    conteudo = base64.b64decode(payload)
+    if not conteudo.strip():
+        return pd.DataFrame()
+    return pd.read_csv(
+        io.BytesIO(conteudo),
+        engine='c',
+        sep=',',
+        encoding='utf-8-sig',  # o LimeSurvey inclui BOM no início do arquivo
+        dtype=CSV_DTYPES,
+        keep_default_na=False,
+        na_values=[''],
+    )
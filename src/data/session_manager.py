@@ -0,0 +1,129 @@
+"""
+Gerenciamento da chave de sessão da API RemoteControl do LimeSurvey
+
+Uma única chave de sessão é obtida por processo e emprestada a todas as
+threads e recarregamentos. Ela é renovada antes de expirar ou quando a API
+responde que a sessão é inválida, e só é liberada no encerramento.
+"""
+
+import atexit
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+class SessionKeyManager:
+    """Empresta a chave de sessão compartilhada, renovando-a quando necessário"""
+
+    def __init__(self, ttl: float = Config.LIME_SESSION_TTL,
+                 refresh_margin: float = Config.LIME_SESSION_REFRESH_MARGIN):
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._login_lock = threading.Lock()
+        self._key: Optional[str] = None
+        self._expires_at = 0.0
+        self._release: Optional[Callable[[str], None]] = None
+        self.logins = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def _valid(self) -> bool:
+        return self._key is not None and time.monotonic() < self._expires_at - self.refresh_margin
+
+    def current(self) -> Optional[str]:
+        """Chave atual, se ainda estiver dentro do prazo (sem fazer login)"""
+        with self._lock:
+            return self._key if self._valid() else None
+
+    def lease(self, login: Callable[[], Optional[str]], release: Callable[[str], None]) -> Optional[str]:
+        """
+        Retorna a chave compartilhada, fazendo login se não houver chave válida
+
+        Args:
+            login: Função que obtém uma nova chave da API (None em caso de falha)
+            release: Função que libera uma chave na API
+
+        Returns:
+            Chave de sessão ou None se o login falhar
+        """
+        with self._lock:
+            if self._valid():
+                return self._key
+
+        # Um login por vez, fora de _lock: current(), snapshot() e shutdown()
+        # não esperam o tempo limite do login
+        with self._login_lock:
+            with self._lock:
+                if self._valid():
+                    return self._key
+                antiga = self._key
+
+            nova = login()
+            if not nova:
+                return None
+
+            with self._lock:
+                self._key = nova
+                self._expires_at = time.monotonic() + self.ttl
+                self._release = release
+                self.logins += 1
+                if antiga:
+                    self.refreshes += 1
+
+        # Liberar a chave substituída fora do lock
+        if antiga and antiga != nova:
+            try:
+                release(antiga)
+            except Exception as e:
+                logger.warning(f"Erro ao liberar chave de sessão substituída: {e}")
+        return nova
+
+    def invalidate(self, key: Optional[str]):
+        """Descarta a chave se ela ainda for a atual (ex.: API respondeu sessão inválida)"""
+        with self._lock:
+            if key and key == self._key:
+                self._key = None
+                self._expires_at = 0.0
+                self.invalidations += 1
+
+    def shutdown(self):
+        """Libera a chave na API; chamado no encerramento do processo"""
+        with self._lock:
+            key, release = self._key, self._release
+            self._key = None
+            self._expires_at = 0.0
+        if key and release:
+            try:
+                release(key)
+                logger.info("Chave de sessão do LimeSurvey liberada")
+            except Exception as e:
+                logger.warning(f"Erro ao liberar chave de sessão: {e}")
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'logins': self.logins,
+                'refreshes': self.refreshes,
+                'invalidations': self.invalidations,
+                'active': self._valid(),
+            }
+
+
+_manager: Optional[SessionKeyManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionKeyManager:
+    """Retorna o gerenciador de sessão do processo, criando-o na primeira chamada"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionKeyManager()
+            atexit.register(_manager.shutdown)
+        return _manager
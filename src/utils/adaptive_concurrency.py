@@ -0,0 +1,152 @@
+"""
+Controle adaptativo de concorrência das requisições ao LimeSurvey
+
+Limita quantas requisições ficam em andamento ao mesmo tempo e ajusta esse
+limite no estilo AIMD: aumenta aditivamente enquanto as respostas chegam
+sem sinais de sobrecarga e reduz multiplicativamente ao receber 429/5xx,
+timeouts ou picos de latência.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Fator aplicado ao limite quando há sinal de sobrecarga
+DECREASE_FACTOR = 0.5
+
+# Peso de cada nova amostra na latência de referência por método (média móvel exponencial)
+LATENCY_EWMA_ALPHA = 0.2
+
+# Amostras de um método antes de considerar picos de latência
+LATENCY_MIN_SAMPLES = 5
+
+# Aumento mínimo sobre a referência para caracterizar um pico, em segundos; evita que
+# oscilações de milissegundos em chamadas rápidas sejam tratadas como sobrecarga
+LATENCY_SPIKE_MIN_SECONDS = 0.25
+
+
+class Permit:
+    """Autorização para uma requisição; guarda quando ela começou e a ocupação na hora"""
+
+    __slots__ = ('started_at', 'inflight')
+
+    def __init__(self, inflight: int):
+        self.started_at = time.monotonic()
+        self.inflight = inflight
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limite AIMD de requisições simultâneas"""
+
+    def __init__(self, initial: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, spike_factor: Optional[float] = None):
+        self.min_limit = max(1, min_limit or Config.LIME_MIN_CONCURRENCY)
+        self.max_limit = max(self.min_limit, max_limit or Config.LIME_MAX_CONCURRENCY)
+        self.spike_factor = spike_factor or Config.LIME_LATENCY_SPIKE_FACTOR
+        self._limit = float(min(max(initial or Config.LOADER_MAX_WORKERS or self.min_limit, self.min_limit),
+                                self.max_limit))
+        self._inflight = 0
+        self._condition = threading.Condition()
+        self._baseline: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._last_decrease = 0.0
+        self.throttle_events = 0
+        self.latency_spikes = 0
+        self.last_event: Optional[str] = None
+        self.last_event_at: Optional[float] = None
+        self.peak_limit = int(self._limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> Permit:
+        """Aguarda até haver espaço abaixo do limite atual"""
+        with self._condition:
+            while self._inflight >= int(self._limit):
+                self._condition.wait()
+            self._inflight += 1
+            return Permit(self._inflight)
+
+    def release(self, permit: Permit, method: str, latency: Optional[float] = None,
+                throttled: bool = False, reason: str = ''):
+        """
+        Devolve a autorização e ajusta o limite com o resultado da requisição
+
+        Args:
+            permit: Autorização obtida em acquire()
+            method: Método JSON-RPC (a latência de referência é por método)
+            latency: Tempo até a resposta, em segundos
+            throttled: Se a resposta indica sobrecarga (429/5xx, timeout)
+            reason: Descrição do sinal de sobrecarga, para o status
+        """
+        with self._condition:
+            self._inflight -= 1
+            spike = not throttled and latency is not None and self._is_spike(method, latency)
+            if throttled:
+                self.throttle_events += 1
+            elif spike:
+                self.latency_spikes += 1
+                reason = f'pico de latência em {method} ({latency:.2f}s)'
+            if throttled or spike:
+                self._decrease(permit, reason)
+            elif permit.inflight * 2 >= self._limit:
+                # Só cresce quando pelo menos metade do limite estava em uso
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self.peak_limit = max(self.peak_limit, int(self._limit))
+            self._condition.notify_all()
+
+    def _is_spike(self, method: str, latency: float) -> bool:
+        baseline = self._baseline.get(method)
+        samples = self._samples.get(method, 0) + 1
+        self._samples[method] = samples
+        self._baseline[method] = latency if baseline is None else \
+            baseline + LATENCY_EWMA_ALPHA * (latency - baseline)
+        return (baseline is not None and samples > LATENCY_MIN_SAMPLES
+                and latency > baseline * self.spike_factor
+                and latency - baseline > LATENCY_SPIKE_MIN_SECONDS)
+
+    def _decrease(self, permit: Permit, reason: str):
+        self.last_event = reason
+        self.last_event_at = time.time()
+        # Respostas de requisições enviadas antes do último corte refletem o
+        # limite antigo; reduzir de novo por causa delas seria exagerado
+        if permit.started_at < self._last_decrease:
+            return
+        anterior = int(self._limit)
+        self._limit = max(self.min_limit, self._limit * DECREASE_FACTOR)
+        self._last_decrease = time.monotonic()
+        if int(self._limit) != anterior:
+            logger.warning(f"Concorrência reduzida de {anterior} para {int(self._limit)}: {reason}")
+
+    def snapshot(self) -> Dict:
+        with self._condition:
+            return {
+                'limit': int(self._limit),
+                'inflight': self._inflight,
+                'min': self.min_limit,
+                'max': self.max_limit,
+                'peak': self.peak_limit,
+                'throttle_events': self.throttle_events,
+                'latency_spikes': self.latency_spikes,
+                'last_event': self.last_event,
+                'last_event_at': self.last_event_at,
+            }
+
+
+_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Retorna o controlador do processo, criando-o na primeira chamada"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveConcurrencyLimiter()
+        return _limiter
@@ -0,0 +1,111 @@
+"""
+Disjuntor (circuit breaker) dos recarregamentos em background
+
+Depois de um carregamento com falha, novos disparos (o callback de status
+roda a cada segundo em cada aba aberta) ficam bloqueados por um intervalo
+que dobra a cada falha consecutiva. Vencido o intervalo, o disjuntor fica
+semiaberto e libera uma única tentativa, precedida de uma sondagem barata;
+sucesso fecha o disjuntor, falha o reabre com o próximo intervalo.
+
+Enquanto o disjuntor está aberto a aplicação continua servindo os últimos
+dados carregados com sucesso.
+"""
+
+import random
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Variação aleatória aplicada a cada intervalo, para que várias instâncias
+# da aplicação não voltem a tentar todas ao mesmo tempo
+BACKOFF_JITTER = 0.1
+
+
+class ReloadCircuitBreaker:
+    """Disjuntor com backoff exponencial e tentativa semiaberta"""
+
+    CLOSED = 'fechado'
+    OPEN = 'aberto'
+    HALF_OPEN = 'semiaberto'
+
+    def __init__(self, failure_threshold: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, jitter: float = BACKOFF_JITTER):
+        self.failure_threshold = max(1, failure_threshold or Config.RELOAD_FAILURE_THRESHOLD)
+        self.base_delay = Config.RELOAD_BACKOFF_BASE if base_delay is None else base_delay
+        self.max_delay = max(self.base_delay, Config.RELOAD_BACKOFF_MAX if max_delay is None else max_delay)
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0  # aberturas seguidas, define o próximo intervalo
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self.next_attempt_at: Optional[datetime] = None
+        self._next_attempt = 0.0
+
+    def allow(self) -> bool:
+        """
+        Verifica se um recarregamento pode começar
+
+        Com o disjuntor aberto e o intervalo vencido, passa para semiaberto e
+        libera só esta tentativa; as demais são recusadas até o resultado dela.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() >= self._next_attempt:
+                self.state = self.HALF_OPEN
+                logger.info("Disjuntor semiaberto: liberando uma tentativa de recarregamento")
+                return True
+            self.rejected += 1
+            return False
+
+    @property
+    def half_open(self) -> bool:
+        with self._lock:
+            return self.state == self.HALF_OPEN
+
+    def record_success(self):
+        """Carregamento concluído: fecha o disjuntor"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Disjuntor fechado: LimeSurvey respondendo novamente")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened = 0
+            self.last_error = None
+            self.next_attempt_at = None
+
+    def record_failure(self, error: str):
+        """Carregamento com falha: abre o disjuntor ao atingir o limite de falhas seguidas"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.state != self.HALF_OPEN and self.consecutive_failures < self.failure_threshold:
+                return
+            delay = min(self.max_delay, self.base_delay * 2 ** self.opened)
+            if self.jitter:
+                delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            self.opened += 1
+            self.state = self.OPEN
+            self._next_attempt = time.monotonic() + delay
+            self.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+            logger.warning(f"Disjuntor aberto após {self.consecutive_failures} falha(s): "
+                           f"próxima tentativa em {delay:.1f}s ({error})")
+
+    def snapshot(self) -> Dict:
+        """Estado para o componente de status"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+                'next_attempt': self.next_attempt_at,
+            }
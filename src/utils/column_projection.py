@@ -0,0 +1,74 @@
+"""
+Projeção de colunas das exportações do LimeSurvey
+
+Calcula, por categoria, os códigos das perguntas realmente usados pelos
+validadores registrados e pelo resumo do processo (preview e observações),
+para que export_responses traga apenas esses campos em vez do survey inteiro.
+"""
+
+import re
+import json
+import hashlib
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
+
+from config.settings import Config
+
+# Colunas de controle da resposta, sempre exportadas
+METADATA_COLUMNS = ('id', 'submitdate', 'lastpage', 'startlanguage', 'seed', 'startdate', 'datestamp')
+
+# Código da pergunta no início do nome da coluna: "P0Q2. Texto", "P4Q8[SQ001]" ou "id"
+_CODIGO = re.compile(r'^([A-Za-z][A-Za-z0-9_]*)(?:\[[^\]]*\])?(?:\.\s|$)')
+
+
+def question_code(coluna: str) -> Optional[str]:
+    """Código da pergunta de uma coluna já renomeada (None se não houver)"""
+    match = _CODIGO.match(coluna.strip())
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=1)
+def required_columns() -> Dict[str, FrozenSet[str]]:
+    """
+    Códigos das perguntas lidos pela aplicação em cada categoria
+
+    Returns:
+        Dicionário categoria -> códigos das perguntas (sem as colunas de controle)
+    """
+    # Importados aqui: os módulos de validação e de interface não são necessários
+    # para quem usa o cliente da API com exportação completa
+    from validation.conjunto_validator import ConjuntoValidator
+    from components.process_summary import PREVIEW_COLUMNS, OBSERVACOES_COLUMNS
+
+    colunas = {categoria: set(lista) for categoria, lista in ConjuntoValidator.colunas_utilizadas().items()}
+    for categoria, lista in PREVIEW_COLUMNS.items():
+        colunas.setdefault(categoria, set()).update(lista)
+    colunas.setdefault('processo', set()).update(OBSERVACOES_COLUMNS)
+
+    codigos = {}
+    for categoria, nomes in colunas.items():
+        codigos[categoria] = frozenset(
+            codigo for codigo in map(question_code, nomes)
+            if codigo and codigo not in METADATA_COLUMNS and codigo != 'form_origem'
+        )
+    return codigos
+
+
+def columns_for(categoria: str) -> Optional[FrozenSet[str]]:
+    """
+    Códigos a exportar para a categoria
+
+    Returns:
+        Conjunto de códigos, ou None para exportar todas as colunas
+    """
+    if not Config.COLUMN_PROJECTION:
+        return None
+    return required_columns().get(categoria)
+
+
+def signature() -> str:
+    """Identifica a projeção atual; dados em cache de outra projeção exigem sincronização completa"""
+    if not Config.COLUMN_PROJECTION:
+        return 'completa'
+    base = json.dumps({c: sorted(codigos) for c, codigos in required_columns().items()}, sort_keys=True)
+    return hashlib.sha1(base.encode('utf-8')).hexdigest()
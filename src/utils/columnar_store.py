@@ -0,0 +1,224 @@
+"""
+Formato em disco dos DataFrames do cache persistente
+
+Cada categoria é gravada em um arquivo próprio com pickle protocolo 5 e
+buffers fora de banda: os arrays das colunas numéricas vão para o arquivo
+como bytes crus, sem passar pelo fluxo do pickle, e na leitura o pickle os
+reaproveita direto do buffer lido do disco. Os dtypes são preservados.
+
+Layout do arquivo:
+    cabeçalho   MAGIC, número de buffers, tamanho do fluxo pickle
+    tamanhos    um inteiro de 8 bytes por buffer
+    pickle      fluxo do pickle protocolo 5
+    buffers     bytes de cada buffer, alinhados em BUFFER_ALIGNMENT bytes
+
+Colunas de texto (StringDtype, ou object só com strings) são gravadas como
+Categorical: os códigos também vão para buffers fora de banda e só os
+valores distintos ficam no fluxo do pickle.
+Com read_frame(mapped=True) o arquivo é mapeado em memória (mmap) em vez de
+lido, e os arrays apontam direto para as páginas do arquivo; vários
+processos que mapeiam o mesmo arquivo compartilham essas páginas pelo cache
+do sistema operacional. Nesse modo as colunas de texto continuam
+Categorical (só os valores distintos ocupam memória própria do processo) e
+materialize() as devolve ao dtype de texto nos recortes usados pela busca.
+
+Os arquivos são lidos com pickle e por isso só devem vir do próprio
+diretório de cache da aplicação. Um arquivo mapeado nunca é alterado no
+lugar: cada gravação cria um arquivo temporário, sincroniza-o com o disco
+(fsync) e só então o renomeia sobre o destino, de modo que uma queda no
+meio da gravação deixa o arquivo anterior intacto.
+
+O formato antigo (surveys_cache.json, com o JSON de cada DataFrame dentro
+de outro JSON) continua legível para migrar caches existentes.
+"""
+
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+
+MAGIC = b'PDC5'
+_HEADER = struct.Struct('<4sIQ')
+_LENGTH = struct.Struct('<Q')
+
+# Alinhamento dos buffers no arquivo (permite mapear os arrays sem cópia)
+BUFFER_ALIGNMENT = 64
+
+# Extensão dos arquivos de cada categoria
+EXTENSION = '.pkl'
+
+
+def _padding(offset: int) -> int:
+    return -offset % BUFFER_ALIGNMENT
+
+
+def _encode(value: Any) -> Any:
+    """Colunas de texto viram Categorical, com os códigos em buffers fora de banda"""
+    if isinstance(value, list):
+        return [_encode(frame) for frame in value]
+    if not isinstance(value, pd.DataFrame):
+        return value
+    encoded = value.copy(deep=False)
+    for i in range(encoded.shape[1]):
+        serie = encoded.iloc[:, i]
+        if isinstance(serie.dtype, pd.StringDtype):
+            encoded.isetitem(i, serie.astype('category'))
+        elif serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) == 'string':
+            # Texto em coluna object (padrão do pandas 2.x): categorias object, para que
+            # materialize() devolva o dtype original (ausentes voltam como NaN)
+            categorias = pd.Index(serie.dropna().unique(), dtype=object)
+            encoded.isetitem(i, serie.astype(pd.CategoricalDtype(categorias)))
+    return encoded
+
+
+def materialize(value: Any) -> Any:
+    """Devolve as colunas Categorical gravadas por write_frame ao dtype de texto original"""
+    if isinstance(value, list):
+        return [materialize(frame) for frame in value]
+    if not isinstance(value, pd.DataFrame):
+        return value
+    colunas = [i for i in range(value.shape[1]) if isinstance(value.iloc[:, i].dtype, pd.CategoricalDtype)]
+    if not colunas:
+        return value
+    frame = value.copy(deep=False)
+    for i in colunas:
+        serie = frame.iloc[:, i]
+        frame.isetitem(i, serie.astype(serie.cat.categories.dtype))
+    return frame
+
+
+def durable_replace(tmp_path: Path, path: Path):
+    """
+    Renomeia tmp_path (já gravado e sincronizado) sobre path e sincroniza o diretório
+
+    Sem a sincronização do diretório, uma queda logo após a troca pode
+    desfazer a renomeação. Em sistemas sem fsync de diretórios (Windows),
+    só a renomeação é feita.
+    """
+    os.replace(tmp_path, path)
+    try:
+        fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_frame(path: Path, value: Any) -> int:
+    """
+    Grava um DataFrame (ou lista de DataFrames) no formato colunar
+
+    A gravação é feita em um arquivo temporário sincronizado e renomeado ao
+    final, para que uma falha no meio não deixe um arquivo truncado no lugar
+    do anterior.
+
+    Returns:
+        Tamanho do arquivo em bytes
+    """
+    buffers = []
+    stream = pickle.dumps(_encode(value), protocol=5, buffer_callback=buffers.append)
+    views = [buffer.raw() for buffer in buffers]
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(views), len(stream)))
+        for view in views:
+            f.write(_LENGTH.pack(view.nbytes))
+        f.write(stream)
+        for view in views:
+            f.write(b'\0' * _padding(f.tell()))
+            f.write(view)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    durable_replace(tmp_path, path)
+    return size
+
+
+def read_frame(path: Path, mapped: bool = False) -> Any:
+    """
+    Lê um arquivo gravado por write_frame
+
+    Args:
+        path: Arquivo da categoria
+        mapped: Mapear o arquivo em memória (cópia na escrita) e manter as colunas
+            de texto como Categorical (compartilhado entre processos); sem
+            mapear, o arquivo é lido para um bytearray e as colunas voltam ao
+            dtype de texto
+
+    Raises:
+        ValueError: se o arquivo não está no formato esperado
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if mapped and size:
+            # Mapeamento privado: páginas compartilhadas até que o processo altere alguma
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            data = bytearray(size)
+            f.readinto(data)
+    view = memoryview(data)
+
+    if size < _HEADER.size:
+        raise ValueError(f"Arquivo de cache truncado: {path}")
+    magic, n_buffers, stream_size = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Arquivo de cache em formato desconhecido: {path}")
+
+    offset = _HEADER.size
+    lengths = []
+    for _ in range(n_buffers):
+        lengths.append(_LENGTH.unpack_from(view, offset)[0])
+        offset += _LENGTH.size
+    stream = view[offset:offset + stream_size]
+    offset += stream_size
+
+    buffers = []
+    for length in lengths:
+        offset += _padding(offset)
+        buffers.append(view[offset:offset + length])
+        offset += length
+    if offset > size:
+        raise ValueError(f"Arquivo de cache truncado: {path}")
+    value = pickle.loads(stream, buffers=buffers)
+    return value if mapped else materialize(value)
+
+
+def dump_legacy_json(path: Path, data: Dict[str, Any]):
+    """Grava no formato antigo: to_json(orient='split') de cada DataFrame dentro de um JSON"""
+    def serializar(df):
+        if df is None or df.empty:
+            return {}
+        return {'data': df.to_json(orient='split'), 'columns': df.columns.tolist()}
+
+    cache_data = {
+        categoria: [serializar(frame) for frame in valor] if isinstance(valor, list) else serializar(valor)
+        for categoria, valor in data.items()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache_data, f, ensure_ascii=False, indent=2)
+
+
+def load_legacy_json(path: Path) -> Dict[str, Any]:
+    """Lê um cache gravado no formato antigo (surveys_cache.json)"""
+    def deserializar(frame_data):
+        if not frame_data:
+            return pd.DataFrame()
+        return pd.read_json(io.StringIO(frame_data['data']), orient='split')
+
+    with open(path, 'r', encoding='utf-8') as f:
+        cache_data = json.load(f)
+    return {
+        categoria: [deserializar(frame) for frame in valor] if isinstance(valor, list) else deserializar(valor)
+        for categoria, valor in cache_data.items()
+    }
@@ -2,63 +2,347 @@
 Serviço para carregamento de dados em background - Versão Otimizada
 """
 
+import asyncio
 import threading
 import time
+from config.settings import Config
 from data.lime_api import LimeSurveyAPI
+from data.lime_api_async import AsyncLimeSurveyAPI
 from utils.persistent_data_cache import PersistentDataCache
+from utils.circuit_breaker import ReloadCircuitBreaker
+from utils.reload_leader import get_reload_leader
+from utils.survey_catalog import SurveyCatalog, survey_tasks_from
+from utils import column_projection, columnar_store
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Ordem de download das categorias: processo primeiro, para que a busca já
+# funcione enquanto réu, vítima e provas ainda estão chegando
+PRIORIDADE_CATEGORIAS = ('processo', 'reu', 'vitima', 'provas')
+
+class _Flight:
+    """Operação em andamento e seu resultado, compartilhados pelos chamadores"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coordenador "single-flight": chamadas concorrentes com a mesma chave
+    compartilham uma única execução e o seu resultado
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.executed = 0
+        self.coalesced = 0
+    
+    def _join(self, key) -> tuple:
+        """Registra o chamador na operação da chave; retorna (operação, se é o líder)"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.executed += 1
+            return flight, True
+    
+    def _run(self, key, flight: _Flight, fn, args):
+        try:
+            flight.result = fn(*args)
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+    
+    def do(self, key, fn, *args):
+        """
+        Executa fn(*args), ou aguarda a execução já em andamento para a mesma chave
+        
+        Returns:
+            Resultado da execução (exceções são repassadas a todos os chamadores)
+        """
+        flight, leader = self._join(key)
+        if leader:
+            self._run(key, flight, fn, args)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    
+    def start(self, key, fn, *args) -> bool:
+        """
+        Inicia fn(*args) em uma thread em background, se ainda não houver
+        execução em andamento para a chave
+        
+        Returns:
+            True se a execução foi iniciada, False se foi agrupada à existente
+        """
+        flight, leader = self._join(key)
+        if leader:
+            thread = threading.Thread(target=self._run, args=(key, flight, fn, args), daemon=True)
+            thread.start()
+        return leader
+    
+    def in_flight(self, key) -> bool:
+        with self._lock:
+            return key in self._flights
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._flights),
+            }
+
+
 class DataLoaderService:
     """Serviço para carregar dados dos formulários em background com cache persistente"""
     
     def __init__(self):
         self.cache = PersistentDataCache()  # Usando o novo cache persistente
-        self.lime_api = LimeSurveyAPI()
+        self.max_workers = Config.LOADER_MAX_WORKERS  # Limite de workers paralelos (0 = um por survey)
+        self.lime_api = LimeSurveyAPI(pool_size=self.max_workers or None)
+        self._clients = threading.local()  # Um cliente da API por worker
         self.loading_thread = None
-        self.max_workers = 4  # Limite de workers paralelos
+        self.last_transport_stats = {}
+        self.last_payload_stats = {}
+        self.last_ingest_stats = {}
+        self.last_probe_stats = {}
+        # Situação de cada survey no carregamento em andamento (ou no último)
+        self.survey_progress = {}
+        self._progress_lock = threading.Lock()
+        # Recarregamentos e downloads concorrentes compartilham uma única execução
+        self.flights = SingleFlight()
+        # Após falhas, novos recarregamentos esperam um intervalo crescente
+        self.breaker = ReloadCircuitBreaker()
+        # Entre processos que usam o mesmo diretório de cache, só o líder recarrega
+        self.leader = get_reload_leader(self.cache.cache_dir)
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
     
-    def start_background_loading(self):
-        """Inicia carregamento em background se necessário"""
-        if self.cache.is_loading:
+    def start_background_loading(self, force: bool = False) -> bool:
+        """
+        Inicia carregamento em background se necessário
+        
+        Os dados atuais continuam servidos durante o carregamento, que os
+        substitui de uma vez ao final (stale-while-revalidate).
+        
+        Args:
+            force: Recarregar mesmo com o cache válido
+        
+        Returns:
+            True se há um carregamento em andamento (iniciado ou já existente)
+        """
+        if not self.flights.in_flight('reload'):
+            if not force and self.cache.is_cache_valid():
+                print("✅ Cache válido, usando dados existentes")
+                return False
+            # Outro processo detém os recarregamentos: este só adota o snapshot que ele publicar
+            if not self.leader.try_acquire():
+                return False
+            # Disjuntor aberto: continuar servindo os últimos dados até a próxima tentativa
+            if not self.breaker.allow():
+                return False
+        
+        # Executar em thread separada para não bloquear a aplicação; disparos
+        # simultâneos (app e callbacks de status) se juntam ao mesmo carregamento
+        if self.flights.start('reload', self._reload):
+            print("🚀 Iniciando carregamento dos dados...")
+        else:
             print("📡 Carregamento já em andamento...")
-            return
+        return True
+    
+    def start_leader_watch(self) -> bool:
+        """
+        Verifica o cache a cada RELOAD_LEADER_INTERVAL segundos, em uma thread em background
         
-        if self.cache.is_cache_valid():
-            print("✅ Cache válido, usando dados existentes")
-            return
+        O líder recarrega quando o cache vence mesmo que nenhuma requisição
+        chegue a este processo, e os demais assumem os recarregamentos quando
+        o líder termina.
         
-        print("🚀 Iniciando carregamento dos dados...")
+        Returns:
+            True se a verificação foi iniciada, False se já estava em andamento
+        """
+        if self._watch_thread is not None:
+            return False
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, name='reload-leader', daemon=True)
+        self._watch_thread.start()
+        return True
+    
+    def stop_leader_watch(self):
+        """Encerra a verificação periódica do cache"""
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+    
+    def _watch_loop(self):
+        while not self._watch_stop.wait(Config.RELOAD_LEADER_INTERVAL):
+            try:
+                self.start_background_loading()
+            except Exception as e:
+                logger.error(f"Erro na verificação periódica do cache: {e}")
+    
+    def _reload(self):
+        """Carregamento completo executado pelo coordenador single-flight"""
+        self.loading_thread = threading.current_thread()
+        self.lime_api.ingest.start()
         self.cache.set_loading(True)
+        self.leader.set_refreshing(True)
+        try:
+            if self.breaker.half_open and not self._probe_server():
+                self.cache.set_error("LimeSurvey indisponível (sondagem sem resposta)")
+            else:
+                self._load_all_data()
+            
+            if self.cache.load_error:
+                self.breaker.record_failure(self.cache.load_error)
+                proxima = self.breaker.snapshot()['next_attempt']
+                if proxima:
+                    print(f"⏸️ Recarregamentos suspensos até {proxima.strftime('%H:%M:%S')}")
+            else:
+                self.breaker.record_success()
+        finally:
+            self.leader.set_refreshing(False)
+    
+    def _probe_server(self) -> bool:
+        """Sondagem barata antes da tentativa semiaberta: login e get_summary de um survey"""
+        if not self.lime_api.get_session_key():
+            return False
+        # Primeiro survey configurado; sem surveys, o login basta
+        survey_id, _ = next(iter(survey_tasks_from(self.lime_api.survey_ids)), (None, None))
+        if survey_id is None:
+            return True
+        return self.lime_api.get_response_count(survey_id) is not None
+    
+    def download_survey(self, survey_id: str, from_id: int = None, to_id: int = None,
+                        question_map: dict = None, columns: frozenset = None) -> pd.DataFrame:
+        """
+        Baixa um survey (ou um intervalo de ids dele)
+        
+        Não há agrupamento por survey: os downloads só partem do carregamento,
+        que já é único (chave 'reload' de self.flights) e baixa cada bloco uma vez.
+        """
+        return self._client().download_survey_data(survey_id, from_id, to_id, question_map, columns,
+                                                   strict=True)
+    
+    def _client(self) -> LimeSurveyAPI:
+        """
+        Cliente da API da thread atual
+        
+        Cada worker usa seu próprio LimeSurveyAPI; transporte, chave de sessão
+        e mapas de perguntas continuam compartilhados entre eles.
+        """
+        client = getattr(self._clients, 'api', None)
+        if client is None:
+            client = self._clients.api = LimeSurveyAPI()
+        return client
+    
+    def _worker_count(self, total_surveys: int) -> int:
+        """
+        Número de workers do carregamento em threads
         
-        # Executar em thread separada para não bloquear a aplicação
-        self.loading_thread = threading.Thread(target=self._load_all_data)
-        self.loading_thread.daemon = True
-        self.loading_thread.start()
+        Com o controle adaptativo, há workers até o teto de concorrência e o
+        controlador decide quantas requisições ficam em andamento.
+        """
+        workers = max(1, self.max_workers or total_surveys)
+        limiter = self.lime_api.transport.limiter
+        return max(workers, limiter.max_limit) if limiter else workers
     
-    def _download_survey(self, survey_id: str, categoria: str) -> tuple:
-        """Baixa dados de um survey específico"""
+    def _download_survey(self, survey_id: str, categoria: str, from_id: int = None, to_id: int = None,
+                         question_map: dict = None, bloco: tuple = None) -> tuple:
+        """
+        Baixa dados de um survey específico, ou de um bloco de ids dele
+        
+        Args:
+            survey_id: ID do survey
+            categoria: Categoria do survey
+            from_id, to_id: Intervalo de ids a exportar (None = sem limite)
+            question_map: Mapa de perguntas já obtido no planejamento
+            bloco: Tupla (índice, total) quando o survey foi dividido em blocos
+        
+        Returns:
+            Tupla (categoria, survey_id, DataFrame); o DataFrame é vazio quando o
+            intervalo não tem respostas e None quando o download falhou
+        """
         try:
-            df = self.lime_api.download_survey_data(survey_id)
+            inicio = time.perf_counter()
+            df = self.download_survey(survey_id, from_id, to_id, question_map,
+                                      column_projection.columns_for(categoria))
+            
+            if bloco:
+                print(f"⏱️ Survey {survey_id} bloco {bloco[0] + 1}/{bloco[1]} (ids {from_id}-{to_id or 'fim'}): "
+                      f"{len(df)} respostas em {time.perf_counter() - inicio:.2f}s")
             if not df.empty:
-                print(f"✅ {categoria} - Survey {survey_id}: {len(df)} respostas")
+                if not bloco:
+                    print(f"✅ {categoria} - Survey {survey_id}: {len(df)} respostas")
                 return categoria, survey_id, df
             return categoria, survey_id, pd.DataFrame()
         except Exception as e:
             print(f"❌ Erro ao baixar survey {survey_id}: {str(e)}")
-            return categoria, survey_id, pd.DataFrame()
+            return categoria, survey_id, None
+    
+    def _plan_survey(self, survey_id: str, categoria: str, watermarks: dict) -> tuple:
+        """
+        Define os intervalos de ids a baixar de um survey
+        
+        Surveys grandes são divididos em blocos de Config.EXPORT_CHUNK_SIZE respostas
+        na sincronização completa; na incremental baixa-se apenas o intervalo novo.
+        
+        Returns:
+            Tupla (survey_id, categoria, lista de (from_id, to_id), question_map)
+        """
+        from_id = self._next_from_id(watermarks, survey_id)
+        if from_id is not None or not Config.EXPORT_CHUNK_SIZE:
+            return survey_id, categoria, [(from_id, None)], None
+        try:
+            client = self._client()
+            chunks = client.plan_export_chunks(survey_id, Config.EXPORT_CHUNK_SIZE)
+            if len(chunks) == 1:
+                return survey_id, categoria, chunks, None
+            print(f"🧩 Survey {survey_id}: exportação dividida em {len(chunks)} blocos")
+            return survey_id, categoria, chunks, client.get_question_map(survey_id)
+        except Exception as e:
+            print(f"⚠️ Não foi possível dividir o survey {survey_id} em blocos: {e}")
+            return survey_id, categoria, [(None, None)], None
     
     def _load_all_data(self):
         """Carrega todos os dados dos formulários de forma paralela"""
+        stats_inicio = self.lime_api.transport.stats.snapshot()
+        payload_inicio = self.lime_api.transport.payload_stats.snapshot()
+        ingest_inicio = self.lime_api.ingest.snapshot()
         try:
             print("📡 Conectando à API do LimeSurvey...")
             
             if not self.lime_api.get_session_key():
                 raise Exception("Falha na conexão com LimeSurvey")
             
+            # Sincronização incremental parte dos dados em cache e baixa só respostas novas;
+            # dados exportados com outra projeção de colunas são baixados de novo por inteiro
+            full_sync = self.cache.needs_full_sync() or self._projection_changed()
+            cached = self.cache.get_data()
+            existing = {} if full_sync else cached
+            # Marcas d'água derivadas dos dados realmente presentes no cache, para que
+            # uma categoria perdida seja baixada por inteiro em vez de ficar vazia
+            watermarks = self._compute_watermarks(existing)
+            print("🔁 Sincronização completa" if full_sync else "➕ Sincronização incremental")
+            
             all_data = {
                 'processo': [],
                 'reu': [],
@@ -67,30 +351,51 @@ class DataLoaderService:
             }
             
             # Preparar lista de todos os surveys para download paralelo
-            survey_tasks = []
-            for categoria, survey_ids in self.lime_api.survey_ids.items():
-                if isinstance(survey_ids, list):
-                    for survey_id in survey_ids:
-                        survey_tasks.append((survey_id, categoria))
-                else:
-                    survey_tasks.append((survey_ids, categoria))
+            survey_tasks = survey_tasks_from(self.lime_api.survey_ids)
+            
+            survey_tasks.sort(key=lambda task: self._prioridade(task[1]))
+            
+            # Sondagem barata para pular surveys sem mudanças desde a última carga
+            probes, inalterados = self._probe_surveys(survey_tasks, cached)
+            self._reset_progress(survey_tasks, inalterados)
+            survey_tasks = [task for task in survey_tasks if task[0] not in inalterados]
             
             print(f"📥 Baixando {len(survey_tasks)} surveys em paralelo...")
             
-            # Executar downloads em paralelo com número limitado de workers
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._download_survey, survey_id, categoria): (survey_id, categoria)
-                    for survey_id, categoria in survey_tasks
-                }
-                
-                for future in as_completed(futures):
-                    categoria, survey_id, df = future.result()
-                    if not df.empty:
-                        if categoria in ['processo', 'reu']:
-                            all_data[categoria].append(df)
-                        else:
-                            all_data[categoria] = df
+            # Cada survey é publicado no cache em memória assim que todos os seus blocos chegam
+            montados = {}
+            
+            def publicar(categoria: str, survey_id: str, blocos: dict):
+                df = self._assemble_survey(survey_id, categoria, blocos)
+                if df is None:
+                    vazio = all(frame is not None and frame.empty for frame in blocos.values())
+                    self._set_progress(survey_id, 'vazio' if vazio else 'falhou')
+                    return
+                montados[(categoria, survey_id)] = df
+                self.cache.publish_survey(categoria, survey_id, df, incremental=not full_sync)
+                self._set_progress(survey_id, 'pronto', len(df))
+            
+            if Config.ASYNC_LOADER:
+                asyncio.run(self._download_all_async(survey_tasks, watermarks, publicar))
+            else:
+                self._download_all_threads(survey_tasks, watermarks, publicar)
+            
+            baixados = set()
+            falhas = self.lime_api.transport.stats.snapshot()['failures'] - stats_inicio['failures']
+            for survey_id, categoria in survey_tasks:
+                df = montados.get((categoria, survey_id))
+                if df is None:
+                    continue
+                baixados.add(survey_id)
+                if categoria in ['processo', 'reu']:
+                    all_data[categoria].append(df)
+                else:
+                    all_data[categoria] = df
+            
+            # Nenhum survey baixado por falhas de rede: manter os dados atuais em vez de
+            # substituí-los por um cache vazio
+            if survey_tasks and not baixados and not inalterados and falhas:
+                raise Exception(f"nenhum survey baixado ({falhas} requisições falharam)")
             
             # Concatenar resultados de processo e réu
             if all_data['processo']:
@@ -104,9 +409,22 @@ class DataLoaderService:
             # Limpar listas vazias
             all_data = {k: v for k, v in all_data.items() if not (isinstance(v, list) and len(v) == 0)}
             
-            # Armazenar no cache
-            self.cache.set_data(all_data)
+            if not full_sync:
+                all_data = self._merge_incremental(existing, all_data)
+            elif inalterados:
+                # Sem sincronização incremental: manter do cache as respostas dos surveys inalterados
+                all_data = self._merge_incremental(self._rows_for_surveys(cached, inalterados), all_data)
+            
+            # Guardar a sondagem só dos surveys cujos dados estão atualizados no cache;
+            # os demais serão exportados novamente na próxima carga
+            probes = {sid: probe for sid, probe in probes.items() if sid in inalterados | baixados}
+            
+            # Armazenar no cache; em disco, só as categorias com surveys baixados são regravadas
+            self.cache.set_data(all_data, watermarks=self._compute_watermarks(all_data),
+                                full_sync=full_sync and not inalterados, probes=probes,
+                                projection=column_projection.signature(), changed=baixados)
             self.cache.set_loading(False)
+            self._log_save_stats()
             
             total_respostas = sum(len(df) for df in all_data.values() if isinstance(df, pd.DataFrame))
             print(f"🎉 Carregamento concluído! Total: {total_respostas} respostas")
@@ -116,22 +434,386 @@ class DataLoaderService:
             print(f"❌ {error_msg}")
             self.cache.set_error(error_msg)
         finally:
-            self.lime_api.release_session_key()
+            # A chave de sessão continua emprestada para o próximo recarregamento
+            self._log_transport_stats(stats_inicio)
+            self._log_payload_stats(payload_inicio)
+            self._log_ingest_stats(ingest_inicio)
+    
+    @staticmethod
+    def _prioridade(categoria: str) -> int:
+        """Posição da categoria na ordem de download"""
+        if categoria in PRIORIDADE_CATEGORIAS:
+            return PRIORIDADE_CATEGORIAS.index(categoria)
+        return len(PRIORIDADE_CATEGORIAS)
+    
+    @staticmethod
+    def _assemble_survey(survey_id: str, categoria: str, blocos: dict):
+        """
+        Remonta um survey na ordem dos blocos
+        
+        Blocos vazios (intervalos de ids sem respostas completas, por exclusões
+        ou lacunas na numeração) são ignorados; só um bloco com falha (None)
+        descarta o survey.
+        
+        Returns:
+            DataFrame do survey, ou None se não há respostas ou algum bloco falhou
+        """
+        frames = [blocos[i] for i in sorted(blocos)]
+        if any(df is None for df in frames):
+            if len(frames) > 1:
+                print(f"❌ Survey {survey_id}: bloco com falha, survey descartado neste carregamento")
+            return None
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return None
+        if len(frames) == 1:
+            return frames[0]
+        df = pd.concat(frames, ignore_index=True)
+        print(f"✅ {categoria} - Survey {survey_id}: {len(df)} respostas ({len(frames)} blocos)")
+        return df
+    
+    def _reset_progress(self, survey_tasks: list, inalterados: set):
+        """Marca todos os surveys do carregamento como aguardando (ou inalterados)"""
+        with self._progress_lock:
+            self.survey_progress = {
+                survey_id: {
+                    'survey_id': survey_id,
+                    'categoria': categoria,
+                    'estado': 'inalterado' if survey_id in inalterados else 'aguardando',
+                    'respostas': None,
+                }
+                for survey_id, categoria in survey_tasks
+            }
+    
+    def _set_progress(self, survey_id: str, estado: str, respostas: int = None):
+        with self._progress_lock:
+            if survey_id in self.survey_progress:
+                self.survey_progress[survey_id] = {**self.survey_progress[survey_id],
+                                                   'estado': estado, 'respostas': respostas}
+    
+    def progress_status(self) -> list:
+        """Situação de cada survey, na ordem de download"""
+        with self._progress_lock:
+            return [dict(item) for item in self.survey_progress.values()]
+    
+    def _download_all_threads(self, survey_tasks: list, watermarks: dict, on_ready=None) -> dict:
+        """
+        Baixa todos os surveys com o ThreadPoolExecutor
+        
+        Os blocos são enviados ao executor por categoria, na ordem de
+        PRIORIDADE_CATEGORIAS; on_ready(categoria, survey_id, blocos) é chamado
+        assim que todos os blocos de um survey chegam.
+        
+        Returns:
+            Dicionário {(categoria, survey_id): {índice do bloco: DataFrame}}
+        """
+        # Executar downloads em paralelo com número limitado de workers
+        workers = self._worker_count(len(survey_tasks))
+        self.lime_api.transport.ensure_pool_size(workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lime-loader') as executor:
+            # Fase 1: planejar os intervalos de ids de cada survey
+            planos = list(executor.map(
+                lambda task: self._plan_survey(task[0], task[1], watermarks), survey_tasks
+            ))
+            
+            # Fase 2: baixar todos os blocos, intercalando surveys para que
+            # um survey grande não ocupe sozinho todos os workers. No máximo
+            # EXPORT_CHUNK_CONCURRENCY blocos de cada survey são enviados ao
+            # executor; o próximo só quando um deles termina, sem workers parados
+            filas = {}
+            for survey_id, categoria, chunks, question_map in planos:
+                filas[(categoria, survey_id)] = deque(
+                    (index, (survey_id, categoria, from_id, to_id, question_map,
+                             (index, len(chunks)) if len(chunks) > 1 else None))
+                    for index, (from_id, to_id) in enumerate(chunks)
+                )
+            esperados = {chave: len(fila) for chave, fila in filas.items()}
+            por_survey = max(1, Config.EXPORT_CHUNK_CONCURRENCY)
+            futures = {}
+            
+            def enviar(chave):
+                index, args = filas[chave].popleft()
+                futures[executor.submit(self._download_survey, *args)] = (chave, index)
+            
+            for nivel in sorted({self._prioridade(categoria) for categoria, _ in filas}):
+                grupo = [chave for chave in filas if self._prioridade(chave[0]) == nivel]
+                for _ in range(por_survey):
+                    for chave in grupo:
+                        if filas[chave]:
+                            enviar(chave)
+            
+            resultados = {}
+            while futures:
+                prontos, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in prontos:
+                    chave, index = futures.pop(future)
+                    if filas[chave]:
+                        enviar(chave)
+                    categoria, survey_id, df = future.result()
+                    blocos = resultados.setdefault(chave, {})
+                    blocos[index] = df
+                    if on_ready and len(blocos) == esperados[chave]:
+                        on_ready(categoria, survey_id, blocos)
+        return resultados
+    
+    async def _download_all_async(self, survey_tasks: list, watermarks: dict, on_ready=None) -> dict:
+        """
+        Baixa todos os surveys de uma vez com o cliente asyncio
+        
+        Exportações e chamadas de metadados de todos os surveys são disparadas
+        juntas, na ordem de survey_tasks; o semáforo do cliente limita as chamadas
+        em andamento. Como no carregamento em threads, surveys grandes são
+        divididos em blocos de Config.EXPORT_CHUNK_SIZE respostas na sincronização
+        completa, com no máximo EXPORT_CHUNK_CONCURRENCY blocos de cada survey em
+        andamento. on_ready(categoria, survey_id, blocos) é chamado assim que
+        todos os blocos de um survey chegam.
+        
+        Returns:
+            Dicionário {(categoria, survey_id): {índice do bloco: DataFrame}}
+        """
+        client = AsyncLimeSurveyAPI()
+        resultados = {}
+        
+        async def planejar(survey_id: str) -> tuple:
+            """Mesma divisão de _plan_survey: (lista de (from_id, to_id), question_map)"""
+            from_id = self._next_from_id(watermarks, survey_id)
+            if from_id is not None or not Config.EXPORT_CHUNK_SIZE:
+                return [(from_id, None)], None
+            try:
+                chunks = await client.plan_export_chunks(survey_id, Config.EXPORT_CHUNK_SIZE)
+                if len(chunks) == 1:
+                    return chunks, None
+                print(f"🧩 Survey {survey_id}: exportação dividida em {len(chunks)} blocos")
+                return chunks, await client.get_question_map(survey_id)
+            except Exception as e:
+                print(f"⚠️ Não foi possível dividir o survey {survey_id} em blocos: {e}")
+                return [(None, None)], None
+        
+        async def baixar(survey_id: str, categoria: str):
+            chunks, question_map = await planejar(survey_id)
+            por_survey = asyncio.Semaphore(max(1, Config.EXPORT_CHUNK_CONCURRENCY))
+            
+            async def baixar_bloco(index: int, from_id, to_id):
+                async with por_survey:
+                    try:
+                        inicio = time.perf_counter()
+                        df = await client.download_survey_data(survey_id, from_id, to_id, question_map,
+                                                               column_projection.columns_for(categoria),
+                                                               strict=True)
+                    except Exception as e:
+                        # None distingue a falha de um intervalo sem respostas
+                        print(f"❌ Erro ao baixar survey {survey_id}: {str(e)}")
+                        return None
+                if len(chunks) > 1:
+                    print(f"⏱️ Survey {survey_id} bloco {index + 1}/{len(chunks)} (ids {from_id}-{to_id or 'fim'}): "
+                          f"{len(df)} respostas em {time.perf_counter() - inicio:.2f}s")
+                elif not df.empty:
+                    print(f"✅ {categoria} - Survey {survey_id}: {len(df)} respostas")
+                return df
+            
+            frames = await asyncio.gather(*(baixar_bloco(index, from_id, to_id)
+                                            for index, (from_id, to_id) in enumerate(chunks)))
+            blocos = resultados[(categoria, survey_id)] = dict(enumerate(frames))
+            if on_ready:
+                on_ready(categoria, survey_id, blocos)
+        
+        try:
+            await asyncio.gather(*(baixar(survey_id, categoria) for survey_id, categoria in survey_tasks))
+        finally:
+            await client.close()
+        return resultados
+    
+    def _probe_surveys(self, survey_tasks: list, cached: dict) -> tuple:
+        """
+        Sonda todos os surveys em paralelo e identifica os inalterados
+        
+        Um survey é pulado quando a sondagem coincide com a da última carga e
+        suas respostas estão no cache. Na ressincronização completa periódica
+        nenhum survey é pulado, para que respostas editadas sejam atualizadas.
+        
+        Returns:
+            Tupla (sondagens por survey_id, conjunto de survey_ids inalterados)
+        """
+        if not Config.CHANGE_PROBE or not survey_tasks:
+            self.last_probe_stats = {}
+            return {}, set()
+        
+        inicio = time.perf_counter()
+        survey_ids = [survey_id for survey_id, _ in survey_tasks]
+        
+        # A sondagem é a atualização do catálogo de surveys exibido na interface
+        entries = self.lime_api.catalog.refresh(self._client, survey_tasks, force=True,
+                                                workers=self._worker_count(len(survey_ids)))
+        probes = {sid: SurveyCatalog.probe_of(entry) for sid, entry in entries.items()}
+        for survey_id in survey_ids:
+            if survey_id not in probes:
+                print(f"⚠️ Falha na sondagem do survey {survey_id}")
+        
+        inalterados = set()
+        if not self.cache.full_sync_due() and not self._projection_changed():
+            em_cache = self._compute_watermarks(cached)
+            inalterados = {
+                sid for sid, probe in probes.items()
+                if sid in em_cache and probe == self.cache.probes.get(sid)
+            }
+        
+        duracao = time.perf_counter() - inicio
+        self.last_probe_stats = {
+            'surveys': len(survey_ids),
+            'skipped': len(inalterados),
+            'seconds': round(duracao, 3),
+        }
+        print(f"🔎 Sondagem: {len(inalterados)} de {len(survey_ids)} surveys sem mudanças ({duracao:.2f}s)")
+        return probes, inalterados
+    
+    def _projection_changed(self) -> bool:
+        """Se os dados em cache foram exportados com outra projeção de colunas"""
+        return bool(self.cache.cached_data) and self.cache.projection != column_projection.signature()
+    
+    @staticmethod
+    def _rows_for_surveys(data: dict, survey_ids: set) -> dict:
+        """Respostas dos surveys indicados em cada categoria"""
+        filtrado = {}
+        for categoria, df in data.items():
+            if isinstance(df, pd.DataFrame) and 'form_origem' in df.columns:
+                df = df[df['form_origem'].astype(str).isin(survey_ids)]
+                if not df.empty:
+                    filtrado[categoria] = df.reset_index(drop=True)
+        return filtrado
+    
+    @staticmethod
+    def _next_from_id(watermarks: dict, survey_id: str):
+        """Primeiro id a exportar na sincronização incremental (None = survey inteiro)"""
+        watermark = watermarks.get(survey_id)
+        return watermark + 1 if watermark is not None else None
+    
+    @staticmethod
+    def _merge_incremental(existing: dict, new_data: dict) -> dict:
+        """Acrescenta as respostas novas aos DataFrames em cache de cada categoria"""
+        merged = {}
+        for categoria in set(existing) | set(new_data):
+            frames = [
+                df for df in (existing.get(categoria), new_data.get(categoria))
+                if isinstance(df, pd.DataFrame) and not df.empty
+            ]
+            if not frames:
+                continue
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            if {'form_origem', 'id'} <= set(df.columns):
+                # O cache lido do disco pode trazer form_origem como número
+                df['form_origem'] = df['form_origem'].astype(str)
+                df = df.drop_duplicates(subset=['form_origem', 'id'], keep='last', ignore_index=True)
+            merged[categoria] = df
+            if len(frames) > 1:
+                print(f"➕ {categoria}: {len(new_data[categoria])} respostas novas ({len(df)} no total)")
+        return merged
+    
+    @staticmethod
+    def _compute_watermarks(all_data: dict) -> dict:
+        """Maior id de resposta presente nos dados para cada survey"""
+        watermarks = {}
+        for df in all_data.values():
+            if not isinstance(df, pd.DataFrame) or not {'form_origem', 'id'} <= set(df.columns):
+                continue
+            maximos = pd.to_numeric(df['id'], errors='coerce').groupby(df['form_origem'].astype(str)).max()
+            for survey_id, max_id in maximos.dropna().items():
+                watermarks[survey_id] = int(max_id)
+        return watermarks
+    
+    def _log_transport_stats(self, stats_inicio: dict):
+        """Registra o uso do pool de conexões durante o carregamento"""
+        stats_fim = self.lime_api.transport.stats.snapshot()
+        self.last_transport_stats = {k: stats_fim[k] - stats_inicio.get(k, 0) for k in stats_fim}
+        s = self.last_transport_stats
+        print(f"🔌 HTTP: {s['requests']} requisições, {s['connections_opened']} conexões abertas, "
+              f"{s['connections_reused']} reutilizadas, {s['retries']} novas tentativas")
+    
+    def _log_payload_stats(self, payload_inicio: dict):
+        """Registra os bytes recebidos no carregamento, a compressão e o tempo economizado"""
+        stats = self.lime_api.transport.payload_stats
+        delta = stats.delta(stats.snapshot(), payload_inicio)
+        total = stats.summary(delta)
+        self.last_payload_stats = {**delta, 'total': total}
+        if not total['responses']:
+            return
+        mib = 2 ** 20
+        print(f"📦 Payload: {total['bytes'] / mib:.1f} MiB em {total['wire_bytes'] / mib:.1f} MiB transferidos "
+              f"(compressão {total['ratio']:.1f}x em {total['compressed_responses']}/{total['responses']} respostas, "
+              f"~{total['saved_seconds']:.2f}s de transferência economizados)")
+        for method, c in sorted(delta['by_method'].items(), key=lambda item: -item[1]['wire_bytes']):
+            logger.info(f"Payload {method}: {c['responses']} respostas, {c['wire_bytes']} bytes no fio, "
+                        f"{c['bytes']} descomprimidos")
+        for survey_id, c in sorted(delta['by_survey'].items()):
+            logger.info(f"Payload survey {survey_id}: {c['wire_bytes']} bytes no fio, {c['bytes']} descomprimidos")
+    
+    def _log_ingest_stats(self, ingest_inicio: dict):
+        """Registra as exportações decodificadas fora do processo web e o custo de recebê-las"""
+        fim = self.lime_api.ingest.snapshot()
+        self.last_ingest_stats = {
+            k: (round(v - ingest_inicio.get(k, 0), 3) if k != 'processes' else v) for k, v in fim.items()
+        }
+        s = self.last_ingest_stats
+        if s['decoded'] or s['failures']:
+            print(f"🧮 Decodificação: {s['decoded']} exportações em {s['processes']} processos "
+                  f"({s['worker_seconds']:.2f}s nos processos, {s['unpack_seconds']:.2f}s para remontar, "
+                  f"{s['failures']} falhas)")
+    
+    def _log_save_stats(self):
+        """Registra o tempo e os bytes escritos na gravação do cache em disco"""
+        s = self.cache.last_save_stats
+        if s:
+            print(f"💾 Cache gravado: {s['written']} de {s['written'] + s['reused']} categorias "
+                  f"({s['bytes_written'] / 2**20:.1f} MiB escritos) em {s['seconds']:.2f}s")
+    
+    def concurrency_status(self) -> dict:
+        """Limite atual de requisições simultâneas e eventos de limitação"""
+        limiter = self.lime_api.transport.limiter
+        return limiter.snapshot() if limiter else {}
+    
+    def is_refreshing(self) -> bool:
+        """Se há um recarregamento em andamento, neste processo ou no líder"""
+        return self.cache.is_loading or self.leader.snapshot()['refreshing']
     
     def get_cached_data(self) -> dict:
         """Retorna dados do cache com informações de status"""
+        # Dados, geração e horário do mesmo snapshot
+        snapshot = self.cache.snapshot()
         return {
-            'data': self.cache.get_data(),
+            'data': snapshot.data.copy(),
             'is_loading': self.cache.is_loading,
-            'last_update': self.cache.last_update,
+            'refreshing': self.is_refreshing(),
+            'generation': snapshot.generation,
+            'last_update': snapshot.last_update,
             'error': self.cache.load_error,
-            'is_valid': self.cache.is_cache_valid()
+            'is_valid': self.cache.is_cache_valid(),
+            'last_full_sync': self.cache.last_full_sync,
+            'transport': self.last_transport_stats,
+            'payload': self.last_payload_stats,
+            'ingest': self.last_ingest_stats,
+            'probe': self.last_probe_stats,
+            'save': self.cache.last_save_stats,
+            'concurrency': self.concurrency_status(),
+            'single_flight': self.flights.snapshot(),
+            'breaker': self.breaker.snapshot(),
+            'surveys': self.progress_status(),
+            'catalog': self.lime_api.catalog.snapshot(),
+            'leader': self.leader.snapshot(),
+            'session': self.lime_api.sessions.snapshot()
         }
     
-    def force_reload(self):
-        """Força recarregamento dos dados"""
-        self.cache.clear_cache()
-        self.start_background_loading()
+    def force_reload(self) -> bool:
+        """
+        Força o recarregamento completo dos dados
+        
+        Os dados atuais continuam disponíveis para busca até o fim do
+        carregamento. Em um processo que não é o líder, o pedido é recusado:
+        os dados chegam pelo snapshot que o líder publicar.
+        
+        Returns:
+            True se há um carregamento em andamento
+        """
+        self.cache.request_full_sync()
+        return self.start_background_loading(force=True)
     
     def filter_by_processo(self, processo_numero: str) -> dict:
         """
@@ -167,7 +849,7 @@ class DataLoaderService:
             
             if col_processo and col_processo in df.columns:
                 # Filtrar usando o mesmo método que você usa
-                filtered_df = df[df[col_processo].isin(lista_processos)]
+                filtered_df = columnar_store.materialize(df[df[col_processo].isin(lista_processos)])
                 
                 if not filtered_df.empty:
                     filtered_data[categoria] = filtered_df
@@ -180,7 +862,9 @@ class DataLoaderService:
                 
                 if processo_cols:
                     col_found = processo_cols[0]
-                    filtered_df = df[df[col_found].astype(str).str.contains(str(processo_numero), na=False, case=False)]
+                    filtered_df = columnar_store.materialize(
+                        df[df[col_found].astype(str).str.contains(str(processo_numero), na=False, case=False)]
+                    )
                     
                     if not filtered_df.empty:
                         filtered_data[categoria] = filtered_df
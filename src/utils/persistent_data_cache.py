@@ -3,14 +3,16 @@ Sistema de cache persistente para dados dos formulários
 """
 
 import json
+import os
+import time
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import threading
 from datetime import datetime, timedelta
-import os
 from pathlib import Path
 import logging
 from config.settings import Config
+from utils import columnar_store
 
 # Configurar logging
 logging.basicConfig(
@@ -20,6 +22,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class CacheSnapshot:
+    """
+    Dados servidos pelo cache em um instante
+    
+    Publicado por inteiro, em uma única atribuição, e nunca alterado depois:
+    quem lê o snapshot atual vê dados, geração e horário consistentes entre
+    si, mesmo durante um recarregamento.
+    """
+    
+    __slots__ = ('data', 'generation', 'last_update')
+    
+    def __init__(self, data: Dict[str, pd.DataFrame], generation: int, last_update: Optional[datetime]):
+        self.data = data
+        self.generation = generation  # Cresce a cada troca; gravada nos metadados
+        self.last_update = last_update  # Fim da última carga completa dos dados
+
 class PersistentDataCache:
     """Cache persistente para dados dos formulários"""
     
@@ -38,17 +56,40 @@ class PersistentDataCache:
         if not hasattr(self, '_initialized') or not self._initialized:
             # Configurações básicas
             self.cache_dir = Path("data_cache")
+            # Um arquivo colunar por categoria (ver utils/columnar_store.py)
+            self.frames_dir = self.cache_dir / "frames"
+            # Formato antigo (JSON), lido só para migrar caches existentes
             self.cache_file = self.cache_dir / "surveys_cache.json"
             self.backup_file = self.cache_dir / "surveys_cache.backup.json"
             self.metadata_file = self.cache_dir / "cache_metadata.json"
             self.log_file = self.cache_dir / "cache.log"
             
-            # Cache em memória
-            self.cached_data = {}
-            self.last_update = None
+            # Cache em memória; o snapshot é substituído por inteiro a cada publicação,
+            # para que leitores concorrentes sempre vejam um dicionário consistente
+            self._snapshot = CacheSnapshot({}, 0, None)
+            self._publish_lock = threading.Lock()
             self.is_loading = False
             self.load_error = None
             
+            # Sincronização incremental: maior id de resposta visto por survey
+            self.watermarks = {}
+            self.last_full_sync = None
+            
+            # Resultado da última sondagem de mudanças de cada survey
+            self.probes = {}
+            
+            # Projeção de colunas com que os dados em cache foram exportados
+            self.projection = None
+            
+            # Arquivo, surveys e linhas de cada categoria gravada (manifesto dos metadados)
+            self.manifest = {}
+            self.last_save_stats = {}
+            
+            # Versão dos metadados em disco refletida em memória (mtime), para
+            # recarregar o snapshot gravado por outro processo
+            self._snapshot_mtime = None
+            self._snapshot_lock = threading.Lock()
+            
             # Tempo de cache (12 horas em produção, 5 minutos em desenvolvimento)
             self.cache_timeout = timedelta(hours=12) if not Config.DEBUG else timedelta(minutes=5)
             
@@ -73,126 +114,356 @@ class PersistentDataCache:
         ))
         logger.addHandler(file_handler)
     
-    def _serialize_dataframe(self, df: pd.DataFrame) -> dict:
-        """Serializa DataFrame para formato JSON"""
-        if df is None or df.empty:
-            return {}
-        return {
-            'data': df.to_json(orient='split'),
-            'columns': df.columns.tolist()
-        }
-    
-    def _deserialize_dataframe(self, data: dict) -> pd.DataFrame:
-        """Deserializa DataFrame do formato JSON"""
-        if not data:
-            return pd.DataFrame()
-        try:
-            return pd.read_json(data['data'], orient='split')
-        except Exception as e:
-            logger.error(f"Erro ao deserializar DataFrame: {e}")
-            return pd.DataFrame()
+    def _swap(self, data: Dict[str, pd.DataFrame], last_update: Optional[datetime],
+              generation: Optional[int] = None):
+        """Publica um novo snapshot (a próxima geração, se não informada)"""
+        with self._publish_lock:
+            if generation is None:
+                generation = self._snapshot.generation + 1
+            self._snapshot = CacheSnapshot(data, generation, last_update)
     
-    def _save_to_disk(self):
-        """Salva cache no disco com backup"""
+    def snapshot(self) -> CacheSnapshot:
+        """Snapshot servido no momento (não deve ser alterado)"""
+        self._sync_from_disk()
+        return self._snapshot
+    
+    @property
+    def cached_data(self) -> Dict[str, pd.DataFrame]:
+        return self._snapshot.data
+    
+    @cached_data.setter
+    def cached_data(self, data: Dict[str, pd.DataFrame]):
+        self._swap(data, self._snapshot.last_update)
+    
+    @property
+    def last_update(self) -> Optional[datetime]:
+        return self._snapshot.last_update
+    
+    @last_update.setter
+    def last_update(self, last_update: Optional[datetime]):
+        # Só o horário muda: os dados, e portanto a geração, são os mesmos
+        atual = self._snapshot
+        self._swap(atual.data, last_update, atual.generation)
+    
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+    
+    @staticmethod
+    def _surveys_in(df) -> Optional[List[str]]:
+        """Surveys (form_origem) presentes nos dados de uma categoria"""
+        if not isinstance(df, pd.DataFrame):
+            return None
+        if df.empty:
+            return []
+        if 'form_origem' not in df.columns:
+            return None
+        return sorted({str(survey_id) for survey_id in df['form_origem'].unique()})
+    
+    def _reusable(self, category: str, df, surveys: Optional[List[str]], changed: Optional[set]) -> bool:
+        """Se o arquivo gravado da categoria já corresponde aos dados (nenhum survey dela mudou)"""
+        entry = self.manifest.get(category)
+        if changed is None or surveys is None or not isinstance(entry, dict):
+            return False
+        return (entry.get('surveys') == surveys and entry.get('rows') == len(df)
+                and not changed.intersection(surveys) and (self.frames_dir / entry['file']).exists())
+    
+    def _save_to_disk(self, snapshot: CacheSnapshot, changed: Optional[set] = None) -> Optional[dict]:
+        """
+        Salva as categorias alteradas do snapshot e depois os metadados (manifesto)
+        
+        Cada categoria gravada vai para um arquivo novo, com a geração no nome;
+        as categorias sem surveys alterados continuam no arquivo anterior. Os
+        metadados, trocados atomicamente, são o único ponto de publicação: até
+        eles serem trocados, os metadados anteriores e seus arquivos continuam
+        íntegros, e só então os arquivos que deixaram de ser usados são removidos.
+        
+        Args:
+            snapshot: Dados a gravar
+            changed: Surveys cujas respostas mudaram desde a última gravação
+                (None = gravar todas as categorias)
+        
+        Returns:
+            Os metadados gravados, ou None se a gravação falhou
+        """
         try:
-            # Criar backup do cache atual se existir
-            if self.cache_file.exists():
-                self.cache_file.rename(self.backup_file)
-            
-            # Serializar dados
-            cache_data = {}
-            for category, df in self.cached_data.items():
-                if isinstance(df, list):
-                    cache_data[category] = [
-                        self._serialize_dataframe(frame) for frame in df
-                    ]
-                else:
-                    cache_data[category] = self._serialize_dataframe(df)
+            inicio = time.perf_counter()
+            self.frames_dir.mkdir(parents=True, exist_ok=True)
             
-            # Salvar novo cache
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            manifest = {}
+            size = 0
+            written = 0
+            bytes_written = 0
+            for category, df in snapshot.data.items():
+                surveys = self._surveys_in(df)
+                if self._reusable(category, df, surveys, changed):
+                    manifest[category] = self.manifest[category]
+                else:
+                    name = f"{category}.{snapshot.generation}{columnar_store.EXTENSION}"
+                    file_size = columnar_store.write_frame(self.frames_dir / name, df)
+                    manifest[category] = {
+                        'file': name,
+                        'surveys': surveys,
+                        'rows': sum(len(frame) for frame in df) if isinstance(df, list) else len(df),
+                        'size': file_size,
+                        'generation': snapshot.generation,
+                    }
+                    written += 1
+                    bytes_written += file_size
+                size += manifest[category]['size']
             
             # Salvar metadata
             metadata = {
-                'last_update': self.last_update.isoformat() if self.last_update else None,
+                'last_update': snapshot.last_update.isoformat() if snapshot.last_update else None,
                 'next_update': (datetime.now() + self.cache_timeout).isoformat(),
-                'entries': len(self.cached_data),
-                'size': os.path.getsize(self.cache_file)
+                'generation': snapshot.generation,
+                'entries': len(snapshot.data),
+                'format': 'pickle5',
+                'files': manifest,
+                'size': size,
+                'watermarks': self.watermarks,
+                'probes': self.probes,
+                'projection': self.projection,
+                'last_full_sync': self.last_full_sync.isoformat() if self.last_full_sync else None
             }
             
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
+            # Metadados trocados atomicamente: outros processos leem o snapshot por eles
+            tmp_path = self.metadata_file.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            columnar_store.durable_replace(tmp_path, self.metadata_file)
+            self._snapshot_mtime = self.metadata_file.stat().st_mtime_ns
+            self.manifest = manifest
+            
+            # Arquivos fora do manifesto (categorias removidas, gerações anteriores,
+            # temporários de uma gravação interrompida) e o cache no formato antigo
+            em_uso = {entry['file'] for entry in manifest.values()}
+            for path in self.frames_dir.iterdir():
+                if path.name not in em_uso:
+                    try:
+                        path.unlink()
+                    except OSError as e:
+                        # Arquivo ainda aberto por outro processo (Windows): removido na próxima gravação
+                        logger.warning(f"Não foi possível remover {path.name}: {e}")
+            for file in [self.cache_file, self.backup_file]:
+                if file.exists():
+                    file.unlink()
             
-            logger.info(f"Cache salvo em disco - Próxima atualização: {metadata['next_update']}")
+            duracao = time.perf_counter() - inicio
+            self.last_save_stats = {
+                'seconds': round(duracao, 3),
+                'bytes_written': bytes_written,
+                'written': written,
+                'reused': len(manifest) - written,
+                'size': size,
+            }
+            logger.info(f"Cache salvo em disco: {written} de {len(manifest)} categorias gravadas "
+                        f"({bytes_written / 2**20:.1f} MiB escritos de {size / 2**20:.1f} MiB) em {duracao:.2f}s - "
+                        f"Próxima atualização: {metadata['next_update']}")
+            return metadata
             
         except Exception as e:
             logger.error(f"Erro ao salvar cache: {e}")
-            # Restaurar backup se houver erro
-            if self.backup_file.exists():
-                self.backup_file.rename(self.cache_file)
+            return None
     
-    def _load_from_disk(self):
-        """Carrega cache do disco"""
+    def _read_frames(self, metadata: dict) -> Optional[dict]:
+        """
+        Lê os arquivos colunares listados nos metadados, ou o cache no formato antigo (None se não há)
+        
+        Com SHARED_SNAPSHOT os arquivos são mapeados em memória, e os processos
+        da aplicação compartilham as mesmas páginas em vez de uma cópia cada.
+        """
+        if metadata.get('format') == 'pickle5':
+            # Manifesto com um dicionário por categoria; versões anteriores guardavam só o nome
+            return {
+                category: columnar_store.read_frame(
+                    self.frames_dir / (entry['file'] if isinstance(entry, dict) else entry),
+                    mapped=Config.SHARED_SNAPSHOT)
+                for category, entry in metadata.get('files', {}).items()
+            }
+        if self.cache_file.exists():
+            logger.info("Migrando cache do formato JSON; será gravado no formato colunar na próxima carga")
+            return columnar_store.load_legacy_json(self.cache_file)
+        return None
+    
+    def _load_from_disk(self, reset_on_error: bool = True):
+        """
+        Carrega cache do disco
+        
+        Args:
+            reset_on_error: Esvaziar o cache em memória se a leitura falhar (na
+                adoção do snapshot de outro processo, os dados atuais são mantidos)
+        """
         try:
-            if not self.cache_file.exists():
+            if not self.metadata_file.exists():
                 logger.info("Cache não encontrado em disco")
                 return
             
             # Carregar metadata primeiro
-            if self.metadata_file.exists():
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    
-                last_update = datetime.fromisoformat(metadata['last_update']) if metadata.get('last_update') else None
-                next_update = datetime.fromisoformat(metadata['next_update'])
+            mtime = self.metadata_file.stat().st_mtime_ns
+            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
                 
-                # Se cache ainda é válido
-                if last_update and datetime.now() < next_update:
-                    # Carregar dados do cache
-                    with open(self.cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    # Deserializar dados
-                    for category, data in cache_data.items():
-                        if isinstance(data, list):
-                            self.cached_data[category] = [
-                                self._deserialize_dataframe(frame_data)
-                                for frame_data in data
-                            ]
-                        else:
-                            self.cached_data[category] = self._deserialize_dataframe(data)
-                    
-                    self.last_update = last_update
-                    logger.info(f"Cache carregado do disco - Última atualização: {last_update}")
-                else:
-                    logger.info("Cache expirado, será atualizado na próxima requisição")
+            last_update = datetime.fromisoformat(metadata['last_update']) if metadata.get('last_update') else None
+            next_update = datetime.fromisoformat(metadata['next_update'])
+            
+            # Carregar dados do cache mesmo se expirado: eles continuam
+            # servindo de base para a sincronização incremental
+            inicio = time.perf_counter()
+            cached_data = self._read_frames(metadata)
+            if cached_data is None:
+                logger.info("Cache não encontrado em disco")
+                return
+            # Marcas d'água e sondagens atualizadas antes da troca, para acompanharem os dados
+            self.watermarks = metadata.get('watermarks') or {}
+            self.probes = metadata.get('probes') or {}
+            self.projection = metadata.get('projection')
+            self.manifest = metadata.get('files') or {}
+            if metadata.get('last_full_sync'):
+                self.last_full_sync = datetime.fromisoformat(metadata['last_full_sync'])
+            self._swap(cached_data, last_update, metadata.get('generation'))
+            self._snapshot_mtime = mtime
+            
+            duracao = time.perf_counter() - inicio
+            if last_update and datetime.now() < next_update:
+                logger.info(f"Cache carregado do disco em {duracao:.2f}s - Última atualização: {last_update}")
+            else:
+                logger.info("Cache expirado, será atualizado na próxima requisição")
             
         except Exception as e:
             logger.error(f"Erro ao carregar cache: {e}")
-            self.cached_data = {}
-            self.last_update = None
+            if not reset_on_error:
+                return
+            self._swap({}, None)
+            self.watermarks = {}
+            self.probes = {}
+            self.projection = None
+            self.manifest = {}
+            self.last_full_sync = None
+    
+    def _sync_from_disk(self):
+        """
+        Adota o snapshot gravado em disco por outro processo da aplicação
+        
+        É assim que os processos que não recarregam (ver utils/reload_leader.py)
+        recebem os dados novos. Não roda durante um carregamento deste processo,
+        que está publicando os próprios dados. Custa um stat por chamada.
+        """
+        if self.is_loading:
+            return
+        try:
+            mtime = self.metadata_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._snapshot_mtime:
+            return
+        with self._snapshot_lock:
+            if mtime != self._snapshot_mtime:
+                logger.info("Snapshot do cache atualizado por outro processo; adotando")
+                self._load_from_disk(reset_on_error=False)
+                # Mesmo com falha, não tentar de novo a cada chamada até a próxima gravação
+                self._snapshot_mtime = mtime
     
     def get_data(self) -> Dict[str, pd.DataFrame]:
         """Retorna os dados em cache"""
-        return self.cached_data.copy()
+        return self.snapshot().data.copy()
     
-    def set_data(self, data: Dict[str, pd.DataFrame]):
-        """Armazena dados no cache e persiste em disco"""
-        self.cached_data = data
-        self.last_update = datetime.now()
+    def set_data(self, data: Dict[str, pd.DataFrame], watermarks: Optional[Dict[str, int]] = None,
+                 full_sync: bool = True, probes: Optional[Dict[str, dict]] = None,
+                 projection: Optional[str] = None, changed: Optional[set] = None):
+        """
+        Armazena dados no cache e persiste em disco
+        
+        Args:
+            data: DataFrames por categoria
+            watermarks: Maior id de resposta por survey presente em data
+            full_sync: Se os dados vieram de uma sincronização completa
+            probes: Sondagem de mudanças de cada survey presente em data
+            projection: Assinatura da projeção de colunas usada na exportação
+            changed: Surveys cujas respostas mudaram; só as categorias deles são
+                regravadas (None = todas)
+        """
+        last_update = datetime.now()
         self.load_error = None
+        if watermarks is not None:
+            self.watermarks = watermarks
+        if probes is not None:
+            self.probes = probes
+        if projection is not None:
+            self.projection = projection
+        if full_sync:
+            self.last_full_sync = last_update
         
-        # Salvar em disco
-        self._save_to_disk()
+        # Salvar em disco; o snapshot anterior continua servido até a troca abaixo
+        snapshot = CacheSnapshot(data, self._snapshot.generation + 1, last_update)
+        metadata = self._save_to_disk(snapshot, changed)
         
-        logger.info(f"Cache atualizado - {len(data)} categorias de dados")
+        # Passar a servir o próprio snapshot mapeado, como os demais processos,
+        # em vez de manter uma cópia privada dos DataFrames
+        if metadata and Config.SHARED_SNAPSHOT:
+            try:
+                data = self._read_frames(metadata)
+            except Exception as e:
+                logger.error(f"Erro ao mapear o snapshot gravado: {e}")
+        self._swap(data, last_update, snapshot.generation)
+        
+        logger.info(f"Cache atualizado - {len(data)} categorias de dados (geração {snapshot.generation})")
+    
+    def publish_survey(self, categoria: str, survey_id: str, df: pd.DataFrame, incremental: bool = False):
+        """
+        Publica em memória os dados de um survey assim que chegam, antes do fim do carregamento
+        
+        A gravação em disco continua sendo feita uma única vez por set_data.
+        
+        Cada publicação troca o snapshot servido e avança a geração, também
+        numa recarga forçada: até o fim do carregamento os leitores veem
+        surveys já recarregados ao lado de surveys da carga anterior (nunca
+        um survey pela metade). Acumular as publicações fora do snapshot
+        servido e trocá-lo uma só vez evitaria a mistura, mas adiaria os
+        surveys prioritários para o fim da carga.
+        
+        Args:
+            categoria: Categoria do survey
+            survey_id: ID do survey
+            df: Respostas baixadas do survey
+            incremental: Se df traz só respostas novas (acrescentadas às existentes);
+                caso contrário, substitui as respostas do survey em cache
+        """
+        with self._publish_lock:
+            atual = self._snapshot.data.get(categoria)
+            frames = []
+            if isinstance(atual, pd.DataFrame) and not atual.empty:
+                if 'form_origem' in atual.columns:
+                    atual = atual.assign(form_origem=atual['form_origem'].astype(str))
+                    if not incremental:
+                        atual = atual[atual['form_origem'] != str(survey_id)]
+                frames.append(atual)
+            frames.append(df)
+            novo = pd.concat(frames, ignore_index=True) if len(frames) > 1 else df
+            if incremental and len(frames) > 1 and {'form_origem', 'id'} <= set(novo.columns):
+                novo = novo.drop_duplicates(subset=['form_origem', 'id'], keep='last', ignore_index=True)
+            # Próxima geração com os dados do survey; a última carga completa continua a mesma
+            self._snapshot = CacheSnapshot({**self._snapshot.data, categoria: novo},
+                                           self._snapshot.generation + 1, self._snapshot.last_update)
+    
+    def needs_full_sync(self) -> bool:
+        """Verifica se a próxima carga deve baixar todas as respostas"""
+        return not Config.INCREMENTAL_SYNC or self.full_sync_due()
+    
+    def full_sync_due(self) -> bool:
+        """Verifica se venceu a ressincronização completa periódica (ou se não há dados)"""
+        if not self.cached_data or not self.last_full_sync:
+            return True
+        return datetime.now() - self.last_full_sync >= timedelta(hours=Config.FULL_SYNC_INTERVAL_HOURS)
     
     def is_cache_valid(self) -> bool:
         """Verifica se o cache ainda é válido"""
-        if not self.last_update:
+        last_update = self.snapshot().last_update
+        if not last_update:
             return False
-        return datetime.now() - self.last_update < self.cache_timeout
+        return datetime.now() - last_update < self.cache_timeout
     
     def set_loading(self, loading: bool):
         """Define status de carregamento"""
@@ -208,14 +479,28 @@ class PersistentDataCache:
         self.is_loading = False
         logger.error(f"Erro no cache: {error}")
     
+    def request_full_sync(self):
+        """
+        Faz a próxima carga baixar todas as respostas de todos os surveys
+        
+        Os dados atuais continuam servidos até a carga publicar os novos.
+        """
+        self.last_full_sync = None
+    
     def clear_cache(self):
         """Limpa o cache em memória e em disco"""
-        self.cached_data = {}
-        self.last_update = None
+        self._swap({}, None)
         self.load_error = None
+        self.watermarks = {}
+        self.probes = {}
+        self.projection = None
+        self.manifest = {}
+        self.last_full_sync = None
+        self._snapshot_mtime = None
         
         # Remover arquivos de cache
-        for file in [self.cache_file, self.backup_file, self.metadata_file]:
+        frames = list(self.frames_dir.iterdir()) if self.frames_dir.exists() else []
+        for file in [self.cache_file, self.backup_file, self.metadata_file, *frames]:
             if file.exists():
                 file.unlink()
         
@@ -0,0 +1,165 @@
+"""
+Cache em disco dos mapas de perguntas (código -> texto) de cada survey
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionMapCache:
+    """
+    Guarda o question_map de cada survey associado a uma impressão digital
+    da estrutura do survey. Enquanto a impressão digital não mudar, o mapa
+    é reaproveitado sem novas chamadas a list_questions.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Diretório dos arquivos (padrão: Config.QUESTION_MAP_CACHE_DIR)
+        """
+        self.cache_dir = Path(cache_dir or Config.QUESTION_MAP_CACHE_DIR)
+        self.max_age = timedelta(hours=Config.QUESTION_MAP_MAX_AGE_HOURS)
+        self._memory: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, survey_id: str) -> Path:
+        return self.cache_dir / f"{survey_id}.json"
+
+    def _read(self, survey_id: str) -> Optional[dict]:
+        if survey_id in self._memory:
+            return self._memory[survey_id]
+        path = self._path(survey_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            self._memory[survey_id] = entry
+            return entry
+        except Exception as e:
+            logger.error(f"Erro ao ler mapa de perguntas do survey {survey_id}: {e}")
+            return None
+
+    def get(self, survey_id: str, fingerprint: str) -> Optional[Dict[str, str]]:
+        """
+        Retorna o mapa em cache se a impressão digital confere e não expirou
+
+        Args:
+            survey_id: ID do survey
+            fingerprint: Impressão digital atual da estrutura do survey
+
+        Returns:
+            Mapa código -> texto, ou None se precisar ser recarregado
+        """
+        with self._lock:
+            entry = self._read(survey_id)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return None
+        try:
+            updated_at = datetime.fromisoformat(entry['updated_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if datetime.now() - updated_at > self.max_age:
+            return None
+        # Entradas gravadas antes da projeção de colunas não têm os campos da exportação
+        if 'fields' not in entry:
+            return None
+        return entry.get('question_map')
+
+    def set(self, survey_id: str, fingerprint: str, question_map: Dict[str, str],
+            fields: Optional[Dict[str, List[str]]] = None):
+        """
+        Armazena o mapa em memória e em disco
+
+        Args:
+            survey_id: ID do survey
+            fingerprint: Impressão digital da estrutura do survey
+            question_map: Mapa código -> texto
+            fields: Campos de export_responses de cada código de pergunta
+        """
+        entry = {
+            'fingerprint': fingerprint,
+            'updated_at': datetime.now().isoformat(),
+            'question_map': question_map,
+            'fields': fields or {}
+        }
+        with self._lock:
+            self._write(survey_id, entry)
+
+    def _write(self, survey_id: str, entry: dict):
+        """Grava a entrada em memória e em disco (chamado com o lock adquirido)"""
+        self._memory[survey_id] = entry
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(survey_id)
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Erro ao salvar mapa de perguntas do survey {survey_id}: {e}")
+
+    def _matching_entry(self, survey_id: str, question_map: Dict[str, str]) -> Optional[dict]:
+        entry = self._read(survey_id)
+        if not entry:
+            return None
+        cached_map = entry.get('question_map')
+        if cached_map is not question_map and cached_map != question_map:
+            return None
+        return entry
+
+    def get_header_map(self, survey_id: str, question_map: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Mapeamento coluna exportada -> nome final guardado junto com o question_map
+
+        Returns:
+            O mapeamento, ou None se o question_map informado não é o que está em cache
+        """
+        with self._lock:
+            entry = self._matching_entry(survey_id, question_map)
+            return entry.get('header_map', {}) if entry else None
+
+    def get_fields(self, survey_id: str, question_map: Dict[str, str]) -> Optional[Dict[str, List[str]]]:
+        """Campos de export_responses de cada código, se o question_map informado é o que está em cache"""
+        with self._lock:
+            entry = self._matching_entry(survey_id, question_map)
+            return entry.get('fields') if entry else None
+
+    def update_header_map(self, survey_id: str, question_map: Dict[str, str], header_map: Dict[str, str]):
+        """Guarda o mapeamento de colunas se o question_map ainda for o que está em cache"""
+        with self._lock:
+            entry = self._matching_entry(survey_id, question_map)
+            if entry:
+                self._write(survey_id, {**entry, 'header_map': header_map})
+
+    def clear(self):
+        """Remove os mapas em memória e em disco"""
+        with self._lock:
+            self._memory.clear()
+            for path in self.cache_dir.glob('*.json'):
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.error(f"Erro ao remover {path}: {e}")
+
+
+_cache: Optional[QuestionMapCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_question_map_cache() -> QuestionMapCache:
+    """Retorna o cache de mapas de perguntas do processo, criando-o na primeira chamada"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QuestionMapCache()
+        return _cache
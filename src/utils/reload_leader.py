@@ -0,0 +1,205 @@
+"""
+Eleição do processo que recarrega o cache compartilhado
+
+Quando vários processos da aplicação (workers) usam o mesmo diretório
+data_cache/, só um deles baixa os surveys e grava o cache: o que detém o
+lock exclusivo de data_cache/reload.lock. Os demais apenas acompanham os
+metadados do cache e adotam o snapshot novo quando ele é publicado (ver
+PersistentDataCache._sync_from_disk).
+
+O lock pertence ao processo e é liberado pelo sistema operacional quando
+ele termina, mesmo em uma queda; o primeiro processo que tentar de novo
+assume os recarregamentos. O líder atual e o horário em que assumiu ficam
+em data_cache/reload_leader.json, lido pelo componente de status de todos
+os processos.
+
+Usa fcntl.flock (POSIX) ou msvcrt.locking (Windows). Sem nenhum dos dois,
+cada processo recarrega por conta própria, como antes da eleição.
+"""
+
+import json
+import os
+import socket
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from config.settings import Config
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_file(fd: int) -> bool:
+    """Tenta o lock exclusivo sem bloquear; True se obtido (ou se não há lock de arquivo)"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _lock_held(path: Path) -> bool:
+    """
+    Sonda sem bloquear se algum processo detém o lock de path
+
+    A sonda obtém e libera o lock na hora; se um processo tentar assumir
+    nesse instante, ele perde a vez e tenta de novo na próxima verificação.
+    """
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        if not _lock_file(fd):
+            return True
+        _unlock_file(fd)
+        return False
+    finally:
+        os.close(fd)
+
+
+class ReloadLeader:
+    """Lock de recarregamento de um diretório de cache, mantido enquanto o processo viver"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.lock_file = self.cache_dir / "reload.lock"
+        self.leader_file = self.cache_dir / "reload_leader.json"
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self.acquired_at: Optional[datetime] = None
+        self.attempts = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """
+        Assume os recarregamentos se nenhum outro processo os detém
+
+        Barato o bastante para ser chamado a cada disparo: o líder não
+        repete a tentativa, e para os demais é um open e um flock.
+
+        Returns:
+            True se este processo é o líder
+        """
+        if not Config.RELOAD_LEADER_ELECTION:
+            return True
+        with self._lock:
+            if self._fd is not None:
+                return True
+            self.attempts += 1
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError as e:
+                logger.error(f"Erro ao abrir o lock de recarregamento: {e}")
+                return False
+            if not _lock_file(fd):
+                os.close(fd)
+                return False
+
+            self._fd = fd
+            self.acquired_at = datetime.now()
+            anterior = self.read_info()
+            info = {
+                'pid': os.getpid(),
+                'host': socket.gethostname(),
+                'since': self.acquired_at.isoformat(),
+                'previous_pid': anterior.get('pid') if anterior else None,
+                'refreshing': False,
+            }
+            self._write_info(info)
+            if anterior and anterior.get('pid') != info['pid']:
+                logger.info(f"Processo {info['pid']} assumiu os recarregamentos do cache "
+                            f"(líder anterior: {anterior.get('pid')}@{anterior.get('host')})")
+            else:
+                logger.info(f"Processo {info['pid']} assumiu os recarregamentos do cache")
+            return True
+
+    def _write_info(self, info: Dict):
+        try:
+            tmp_path = self.leader_file.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+            tmp_path.replace(self.leader_file)
+        except OSError as e:
+            logger.error(f"Erro ao registrar o líder dos recarregamentos: {e}")
+
+    def set_refreshing(self, refreshing: bool):
+        """Registra, para os demais processos, se o líder está recarregando o cache"""
+        with self._lock:
+            info = self.read_info() if self._fd is not None else None
+            if info and info.get('pid') == os.getpid():
+                self._write_info({**info, 'refreshing': refreshing})
+
+    def release(self):
+        """Libera o lock (o sistema operacional também o libera quando o processo termina)"""
+        with self._lock:
+            if self._fd is None:
+                return
+            os.close(self._fd)
+            self._fd = None
+            self.acquired_at = None
+
+    def read_info(self) -> Optional[Dict]:
+        """Líder registrado em disco, ou None se nenhum processo assumiu ainda"""
+        try:
+            with open(self.leader_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def snapshot(self) -> Dict:
+        """Estado para o componente de status"""
+        info = self.read_info() or {}
+        since = info.get('since')
+        refreshing = bool(info.get('refreshing'))
+        if refreshing and not self.is_leader and Config.RELOAD_LEADER_ELECTION:
+            # Um líder que terminou no meio do recarregamento deixa o sinal gravado;
+            # ele só vale enquanto o lock continua detido
+            refreshing = _lock_held(self.lock_file)
+        return {
+            'enabled': Config.RELOAD_LEADER_ELECTION,
+            'is_leader': self.is_leader,
+            'pid': info.get('pid'),
+            'host': info.get('host'),
+            'since': datetime.fromisoformat(since) if since else None,
+            'previous_pid': info.get('previous_pid'),
+            'refreshing': refreshing,
+        }
+
+
+_leaders: Dict[Path, ReloadLeader] = {}
+_leaders_lock = threading.Lock()
+
+
+def get_reload_leader(cache_dir: Path) -> ReloadLeader:
+    """Retorna o lock de recarregamento do diretório de cache, um por processo"""
+    chave = Path(cache_dir).resolve()
+    with _leaders_lock:
+        if chave not in _leaders:
+            _leaders[chave] = ReloadLeader(chave)
+        return _leaders[chave]
@@ -0,0 +1,195 @@
+"""
+Catálogo dos surveys configurados
+
+Guarda, para cada survey, título, situação (ativo), número de respostas
+completas e data de modificação. As consultas ao LimeSurvey são feitas em
+paralelo, as entradas valem por SURVEY_CATALOG_TTL segundos e ficam em
+data_cache/survey_catalog.json, ao lado dos metadados do cache de dados.
+
+A interface só lê o catálogo. O carregador o atualiza na sondagem de
+mudanças e compara as mesmas entradas com a carga anterior, sem chamadas
+adicionais; a impressão digital dos mapas de perguntas reaproveita a data
+de modificação enquanto a entrada estiver dentro da validade.
+"""
+
+import json
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Campos comparados com a carga anterior para detectar surveys inalterados
+PROBE_FIELDS = ('completed_responses', 'lastmodified')
+
+
+def survey_tasks_from(survey_ids: Dict) -> List[tuple]:
+    """Lista (survey_id, categoria) dos surveys configurados (um id ou uma lista por categoria)"""
+    tasks = []
+    for categoria, ids in survey_ids.items():
+        for survey_id in (ids if isinstance(ids, list) else [ids]):
+            tasks.append((str(survey_id), categoria))
+    return tasks
+
+
+class SurveyCatalog:
+    """Catálogo dos surveys com validade (TTL), em memória e em disco"""
+
+    def __init__(self, cache_dir: str = "data_cache", ttl: Optional[float] = None):
+        self.cache_dir = Path(cache_dir)
+        self.catalog_file = self.cache_dir / "survey_catalog.json"
+        self.ttl = timedelta(seconds=Config.SURVEY_CATALOG_TTL if ttl is None else ttl)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._loaded = False
+        self.fetched = 0
+        self.failures = 0
+        self.last_refresh_seconds = 0.0
+
+    def _load(self):
+        """Lê o catálogo do disco na primeira consulta (chamado com o lock adquirido)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.catalog_file.exists():
+            return
+        try:
+            with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self._entries = {str(sid): entry for sid, entry in entries.items() if isinstance(entry, dict)}
+        except Exception as e:
+            logger.error(f"Erro ao carregar catálogo de surveys: {e}")
+
+    def _save(self):
+        """Grava o catálogo em disco (chamado com o lock adquirido)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.catalog_file.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.catalog_file)
+        except Exception as e:
+            logger.error(f"Erro ao salvar catálogo de surveys: {e}")
+
+    def _is_fresh(self, entry: Optional[Dict]) -> bool:
+        if not entry:
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return datetime.now() - fetched_at <= self.ttl
+
+    def get(self, survey_id: str) -> Optional[Dict]:
+        """Entrada do survey, se ainda estiver dentro da validade"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(str(survey_id))
+            return dict(entry) if self._is_fresh(entry) else None
+
+    def refresh(self, client: Callable, surveys: List[tuple], force: bool = False,
+                workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Atualiza em paralelo as entradas vencidas (ou todas, com force)
+
+        Args:
+            client: Função que retorna o LimeSurveyAPI da thread atual
+            surveys: Lista (survey_id, categoria)
+            force: Consultar mesmo as entradas dentro da validade
+            workers: Consultas simultâneas (padrão: tamanho do pool de conexões)
+
+        Returns:
+            Entradas válidas dos surveys pedidos; surveys cuja consulta falhou agora
+            ficam de fora, mesmo que a entrada anterior ainda esteja na validade
+        """
+        with self._lock:
+            self._load()
+            atuais = {sid: dict(entry) for sid, entry in self._entries.items()}
+        pendentes = [(str(sid), categoria) for sid, categoria in surveys
+                     if force or not self._is_fresh(atuais.get(str(sid)))]
+
+        falhas = set()
+        if pendentes:
+            inicio = time.perf_counter()
+
+            def consultar(task):
+                survey_id, categoria = task
+                anterior = atuais.get(survey_id) or {}
+                try:
+                    overview = client().survey_overview(
+                        survey_id, anterior.get('title'), anterior.get('lastmodified')
+                    )
+                except Exception as e:
+                    logger.warning(f"Falha ao consultar o survey {survey_id} para o catálogo: {e}")
+                    return None
+                if overview is None:
+                    return None
+                return {**overview, 'survey_id': survey_id, 'categoria': categoria,
+                        'fetched_at': datetime.now().isoformat()}
+
+            if workers is None:
+                workers = client().transport.pool_size
+            with ThreadPoolExecutor(max_workers=max(1, min(len(pendentes), workers)),
+                                    thread_name_prefix='lime-catalog') as executor:
+                novas = list(executor.map(consultar, pendentes))
+
+            with self._lock:
+                for (survey_id, _), entry in zip(pendentes, novas):
+                    if entry:
+                        self._entries[survey_id] = entry
+                    else:
+                        falhas.add(survey_id)
+                self.fetched += sum(1 for entry in novas if entry)
+                self.failures += sum(1 for entry in novas if not entry)
+                self.last_refresh_seconds = time.perf_counter() - inicio
+                self._save()
+
+        with self._lock:
+            resultado = {}
+            for survey_id, _ in surveys:
+                entry = self._entries.get(str(survey_id))
+                if str(survey_id) not in falhas and self._is_fresh(entry):
+                    resultado[str(survey_id)] = dict(entry)
+            return resultado
+
+    @staticmethod
+    def probe_of(entry: Dict) -> Dict:
+        """Campos da entrada usados pela sondagem de mudanças do carregador"""
+        return {field: entry.get(field) for field in PROBE_FIELDS}
+
+    def snapshot(self) -> List[Dict]:
+        """Entradas para o componente de status (sem consultar o LimeSurvey)"""
+        with self._lock:
+            self._load()
+            return [dict(entry, fresh=self._is_fresh(entry)) for entry in self._entries.values()]
+
+    def clear(self):
+        """Remove o catálogo em memória e em disco"""
+        with self._lock:
+            self._entries = {}
+            self._loaded = True
+            if self.catalog_file.exists():
+                try:
+                    self.catalog_file.unlink()
+                except OSError as e:
+                    logger.error(f"Erro ao remover {self.catalog_file}: {e}")
+
+
+_catalog: Optional[SurveyCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_survey_catalog() -> SurveyCatalog:
+    """Retorna o catálogo de surveys do processo, criando-o na primeira chamada"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = SurveyCatalog()
+        return _catalog
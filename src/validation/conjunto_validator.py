@@ -10,12 +10,25 @@ from validation.reu_validator import ReuValidator
 from validation.provas_validator import ProvasValidator
 
 class ConjuntoValidator:
+    # Validador de cada categoria
+    VALIDADORES = {
+        'processo': ProcessoValidator,
+        'vitima': VitimaValidator,
+        'reu': ReuValidator,
+        'provas': ProvasValidator
+    }
+    
     def __init__(self):
         self.processo_validator = ProcessoValidator()
         self.vitima_validator = VitimaValidator()
         self.reu_validator = ReuValidator()
         self.provas_validator = ProvasValidator()
     
+    @classmethod
+    def colunas_utilizadas(cls) -> Dict[str, Tuple[str, ...]]:
+        """Colunas lidas pelos validadores de cada categoria"""
+        return {categoria: validador.COLUNAS_UTILIZADAS for categoria, validador in cls.VALIDADORES.items()}
+    
     def validate_all(self, all_data: Dict[str, pd.DataFrame]) -> Dict:
         """
         Executa todas as validações nos dados
@@ -8,6 +8,46 @@ from typing import List, Dict, Any
 from config.settings import Config
 
 class ProcessoValidator:
+    # Marcos processuais em ordem cronológica esperada (nome amigável: nome da coluna)
+    MARCOS_PROCESSUAIS = {
+        'Data do Crime': 'P1Q1. Qual a data do crime?',
+        'Data abertura IP': 'P3Q1. Data da abertura do Inquérito Policial:',
+        'Data Relatório Final IP': 'P3Q28. Data do relatório final do Inquérito Policial:',
+        'Data oferecimento da Denúncia': 'P4Q7. Data do oferecimento da denúncia:',
+        'Data decisão imediatamente após Denúncia': 'P4Q14. Qual a data da decisão/despacho do juiz imediatamente após a denúncia?',
+        'Data do Recebimento da Denúncia': 'P6Q0. Qual a data em que a denúncia foi recebida?',
+        'Data 1a AIJ': 'P6Q1. Data da primeira audiência de instrução realizada:',
+        'Data última AIJ': 'P6Q3. Se sim, qual a data da última audiência de instrução realizada?',
+        'Data decisão 1a fase do Juri': 'P7Q2. Data da decisão que finaliza a primeira fase do Júri:',
+        'Data nova decisão da 1a Fase': 'P7Q31. Data da nova decisão de primeira fase',
+        'Data agendamento audiência Juri': 'P8Q0. Primeira data de agendamento da audiência de júri:',
+        'Data realização audiência Júri': 'P8Q4. Data em que a audiência de júri foi realizada:',
+        'Data prolação sentença de júri': 'P8Q20. Data em que a sentença de júri foi prolatada:',
+        'Data nova decisão de 2a fase': 'P8Q57. Qual a data da nova decisão de segunda fase?',
+        'Data do trânsito em julgado': 'P9Q1. Data do trânsito em julgado da sentença:',
+        'Data do arquivamento definitivo': 'P9Q2. Data do arquivamento definitivo do processo:'
+    }
+    
+    # Colunas lidas pelas validações (usadas na projeção de colunas da exportação)
+    COLUNAS_UTILIZADAS = (
+        'id',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q1A. Número de controle para casos em que há mais de uma vítima:',
+        'P0Q2. Número do Processo:',
+        'P0Q14. Número de réus no processo:',
+        'P0Q014. Número de réus que tiveram decisão com trânsito em julgado neste processo',
+        'P0Q17. Quantos suspeitos foram apontados e identificados pela polícia?',
+        'P0Q18. Qual o número de vítimas no processo?',
+        'P0Q20. Quantas vítimas NÃO foram identificadas pela polícia?',
+        'P0Q21. Data do crime:',
+        'P1Q1. Houve prisão em flagrante desse réu?',
+        'P1Q2. Data da prisão em flagrante:',
+        'P4Q8[SQ001]',
+        'P6Q6[SQ009]',
+        *MARCOS_PROCESSUAIS.values(),
+    )
+    
     def __init__(self):
         # Padrões de validação
         self.padrao_controle = re.compile(r'^\d{1,4}[RV]0[1-9]$')
@@ -511,25 +551,7 @@ class ProcessoValidator:
         """
         erros = []
         
-        # Definir os marcos processuais em ordem cronológica esperada (nome amigável: nome da coluna)
-        marcos_processuais = {
-        'Data do Crime': 'P1Q1. Qual a data do crime?',
-        'Data abertura IP': 'P3Q1. Data da abertura do Inquérito Policial:',
-        'Data Relatório Final IP': 'P3Q28. Data do relatório final do Inquérito Policial:',
-        'Data oferecimento da Denúncia': 'P4Q7. Data do oferecimento da denúncia:',
-        'Data decisão imediatamente após Denúncia': 'P4Q14. Qual a data da decisão/despacho do juiz imediatamente após a denúncia?',
-        'Data do Recebimento da Denúncia': 'P6Q0. Qual a data em que a denúncia foi recebida?',
-        'Data 1a AIJ': 'P6Q1. Data da primeira audiência de instrução realizada:',
-        'Data última AIJ': 'P6Q3. Se sim, qual a data da última audiência de instrução realizada?',
-        'Data decisão 1a fase do Juri': 'P7Q2. Data da decisão que finaliza a primeira fase do Júri:',
-        'Data nova decisão da 1a Fase': 'P7Q31. Data da nova decisão de primeira fase',
-        'Data agendamento audiência Juri': 'P8Q0. Primeira data de agendamento da audiência de júri:',
-        'Data realização audiência Júri': 'P8Q4. Data em que a audiência de júri foi realizada:',
-        'Data prolação sentença de júri': 'P8Q20. Data em que a sentença de júri foi prolatada:',
-        'Data nova decisão de 2a fase': 'P8Q57. Qual a data da nova decisão de segunda fase?',
-        'Data do trânsito em julgado': 'P9Q1. Data do trânsito em julgado da sentença:',
-        'Data do arquivamento definitivo': 'P9Q2. Data do arquivamento definitivo do processo:'
-        }
+        marcos_processuais = self.MARCOS_PROCESSUAIS
         
         # Converter todas as datas para datetime
         df_temp = df.copy()
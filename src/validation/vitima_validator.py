@@ -7,6 +7,14 @@ import re
 from typing import List, Dict, Any
 
 class VitimaValidator:
+    # Colunas lidas pelas validações (usadas na projeção de colunas da exportação)
+    COLUNAS_UTILIZADAS = (
+        'id',
+        'P0Q0. Pesquisador responsável pelo preenchimento:',
+        'P0Q1. Número de controle (dado pela equipe)',
+        'P0Q2. Número do Processo (Formato: 0000000-00.0000.0.00.0000):'
+    )
+    
     def __init__(self):
         # Padrões de validação
         self.padrao_controle = re.compile(r'^\d{1,4}[V]0[1-9]$')
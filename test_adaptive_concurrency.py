@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Script de teste do controle adaptativo de concorrência (AIMD)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.session_manager import SessionKeyManager
+from utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from utils.question_map_cache import QuestionMapCache
+from utils.survey_catalog import SurveyCatalog
+from lime_stub_server import LimeStubServer, StubSurvey
+
+
+def _rodada(limiter: AdaptiveConcurrencyLimiter, latencia: float = 0.01, **kwargs):
+    """Ocupa todo o limite atual e devolve as autorizações"""
+    permits = [limiter.acquire() for _ in range(limiter.limit)]
+    for permit in permits:
+        limiter.release(permit, 'export_responses', latency=latencia, **kwargs)
+
+
+def test_aumento_aditivo():
+    """Sem sinais de sobrecarga o limite cresce até o teto"""
+    print("🧪 Testando aumento aditivo...")
+    limiter = AdaptiveConcurrencyLimiter(initial=2, min_limit=1, max_limit=8)
+    limites = []
+    for _ in range(20):
+        _rodada(limiter)
+        limites.append(limiter.limit)
+
+    assert limites == sorted(limites), f"O limite não deve cair: {limites}"
+    assert limiter.limit == 8, limites
+    print(f"   ✅ Limite por rodada: {limites}")
+
+
+def test_sem_aumento_ocioso():
+    """Requisições esparsas não inflam o limite"""
+    print("🧪 Testando limite ocioso...")
+    limiter = AdaptiveConcurrencyLimiter(initial=4, min_limit=1, max_limit=16)
+    for _ in range(50):
+        limiter.release(limiter.acquire(), 'list_groups', latency=0.01)
+    assert limiter.limit == 4, limiter.limit
+    print("   ✅ Limite mantido em 4")
+
+
+def test_reducao_multiplicativa():
+    """429 reduz o limite pela metade uma vez por janela"""
+    print("🧪 Testando redução multiplicativa...")
+    limiter = AdaptiveConcurrencyLimiter(initial=8, min_limit=1, max_limit=16)
+    permits = [limiter.acquire() for _ in range(8)]
+    time.sleep(0.001)
+
+    limiter.release(permits[0], 'export_responses', throttled=True, reason='HTTP 429')
+    assert limiter.limit == 4, limiter.limit
+
+    # As demais respostas da mesma janela não reduzem de novo
+    for permit in permits[1:]:
+        limiter.release(permit, 'export_responses', throttled=True, reason='HTTP 429')
+    assert limiter.limit == 4, limiter.limit
+
+    # Uma nova requisição com 429 reduz outra vez
+    limiter.release(limiter.acquire(), 'export_responses', throttled=True, reason='HTTP 429')
+    snapshot = limiter.snapshot()
+    assert snapshot['limit'] == 2 and snapshot['throttle_events'] == 9, snapshot
+    assert snapshot['last_event'] == 'HTTP 429'
+    print(f"   ✅ 8 → 4 → 2, {snapshot['throttle_events']} eventos registrados")
+
+
+def test_pico_de_latencia():
+    """Latência muito acima da média do método reduz o limite"""
+    print("🧪 Testando pico de latência...")
+    limiter = AdaptiveConcurrencyLimiter(initial=8, min_limit=1, max_limit=8, spike_factor=3)
+    for _ in range(10):
+        limiter.release(limiter.acquire(), 'list_groups', latency=0.02)
+    # Outro método, mais lento, tem sua própria referência
+    for _ in range(10):
+        limiter.release(limiter.acquire(), 'export_responses', latency=1.0)
+    assert limiter.limit == 8
+
+    limiter.release(limiter.acquire(), 'list_groups', latency=0.5)
+    assert limiter.limit == 4 and limiter.latency_spikes == 1, limiter.snapshot()
+    print("   ✅ Pico detectado por método")
+
+
+def test_limite_respeitado_entre_threads():
+    """Nunca há mais requisições em andamento que o limite"""
+    print("🧪 Testando limite entre threads...")
+    limiter = AdaptiveConcurrencyLimiter(initial=3, min_limit=3, max_limit=3)
+    lock = threading.Lock()
+    em_andamento = [0, 0]  # atual, máximo
+
+    def requisicao(_):
+        permit = limiter.acquire()
+        with lock:
+            em_andamento[0] += 1
+            em_andamento[1] = max(em_andamento[1], em_andamento[0])
+        time.sleep(0.005)
+        with lock:
+            em_andamento[0] -= 1
+        limiter.release(permit, 'list_groups', latency=0.005)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(requisicao, range(100)))
+    assert em_andamento[1] == 3, em_andamento
+    print("   ✅ Máximo de 3 requisições simultâneas")
+
+
+def test_servidor_com_capacidade_limitada():
+    """Contra um servidor que recusa excedentes com 429, o limite converge e tudo é baixado"""
+    print("🧪 Testando servidor com capacidade limitada...")
+    originais = (Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES, Config.LIME_API_URL)
+    Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES = 0.01, 0.05, 8
+    survey = StubSurvey.synthetic('917441', 400, 6, n_grupos=2)
+    api = None
+    try:
+        with tempfile.TemporaryDirectory() as diretorio, \
+                LimeStubServer({'917441': survey}, latency=0.02, max_concurrent=3) as stub:
+            Config.LIME_API_URL = stub.url
+            # Mapas de perguntas e catálogo no diretório temporário, fora do cache do repositório
+            api = LimeSurveyAPI(pool_size=16, question_maps=QuestionMapCache(os.path.join(diretorio, 'question_maps')))
+            api.sessions = SessionKeyManager()
+            api.catalog = SurveyCatalog(diretorio)
+            limiter = AdaptiveConcurrencyLimiter(initial=12, min_limit=1, max_limit=16)
+            limiter_original, api.transport.limiter = api.transport.limiter, limiter
+            try:
+                question_map = api.get_question_map('917441')
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    tamanhos = list(executor.map(
+                        lambda i: len(api.download_survey_data('917441', i * 10 + 1, (i + 1) * 10, question_map)),
+                        range(40)
+                    ))
+            finally:
+                api.transport.limiter = limiter_original
+    finally:
+        if api is not None:
+            api.sessions.shutdown()
+        Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES, Config.LIME_API_URL = originais
+
+    snapshot = limiter.snapshot()
+    assert tamanhos == [10] * 40, tamanhos
+    assert stub.rejected > 0 and snapshot['throttle_events'] > 0, snapshot
+    assert snapshot['limit'] <= 6, snapshot
+    print(f"   ✅ {stub.rejected} recusas, limite final {snapshot['limit']}")
+
+
+def test_autorizacao_devolvida_em_qualquer_erro():
+    """Erros que não são de conexão também devolvem a autorização do limite"""
+    print("🧪 Testando erros fora das novas tentativas...")
+    api = LimeSurveyAPI()
+    limiter = AdaptiveConcurrencyLimiter(initial=1, min_limit=1, max_limit=1)
+    limiter_original, api.transport.limiter = api.transport.limiter, limiter
+    try:
+        for url in ('127.0.0.1/sem-esquema', 'ftp://127.0.0.1/esquema-invalido'):
+            resultado = []
+
+            def chamar():
+                try:
+                    api.transport.post(url, 'list_groups', '{}')
+                except requests.RequestException as e:
+                    resultado.append(e)
+
+            # Com a autorização retida, a segunda chamada ficaria bloqueada em acquire()
+            for _ in range(2):
+                thread = threading.Thread(target=chamar, daemon=True)
+                thread.start()
+                thread.join(timeout=5)
+                assert not thread.is_alive(), f"Autorização não devolvida após erro em {url}"
+            assert len(resultado) == 2 and not isinstance(resultado[0], requests.ConnectionError), resultado
+    finally:
+        api.transport.limiter = limiter_original
+
+    snapshot = limiter.snapshot()
+    assert snapshot['inflight'] == 0 and snapshot['throttle_events'] == 4, snapshot
+    print(f"   ✅ Autorizações devolvidas ({snapshot['last_event']})")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do controle adaptativo de concorrência...\n")
+
+    testes = [
+        test_aumento_aditivo,
+        test_sem_aumento_ocioso,
+        test_reducao_multiplicativa,
+        test_pico_de_latencia,
+        test_limite_respeitado_entre_threads,
+        test_servidor_com_capacidade_limitada,
+        test_autorizacao_devolvida_em_qualquer_erro,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Script de teste da gravação incremental e à prova de quedas do cache em disco
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+from datetime import datetime
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from utils import columnar_store
+from utils.persistent_data_cache import PersistentDataCache
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+
+def _frame(survey_ids: list, n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': np.tile(np.arange(1, n + 1, dtype=float), len(survey_ids)),
+        'P0Q1': [f'resposta {i}' for i in range(n * len(survey_ids))],
+        'form_origem': [sid for sid in survey_ids for _ in range(n)],
+    })
+
+
+def _arquivos(cache) -> dict:
+    return {p.name: p.stat().st_mtime_ns for p in cache.frames_dir.iterdir()}
+
+
+def test_so_categorias_alteradas():
+    """Uma gravação com um survey alterado regrava só o arquivo da categoria dele"""
+    print("🧪 Testando gravação das categorias alteradas...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            dados = {'processo': _frame(['917441', '736121'], 50), 'provas': _frame(['389137'], 20)}
+            cache.set_data(dados)
+            assert cache.last_save_stats['written'] == 2
+            antes = _arquivos(cache)
+
+            dados = {**cache.get_data(), 'provas': _frame(['389137'], 25)}
+            cache.set_data(dados, changed={'389137'})
+            stats = cache.last_save_stats
+            assert stats['written'] == 1 and stats['reused'] == 1, stats
+            assert 0 < stats['bytes_written'] < stats['size']
+            depois = _arquivos(cache)
+            processo = cache.manifest['processo']['file']
+            assert depois[processo] == antes[processo], "Arquivo de processo não deveria ser regravado"
+            assert cache.manifest['provas']['file'] not in antes and len(depois) == 2, depois
+
+            # Linhas diferentes do manifesto regravam a categoria mesmo sem o survey em changed
+            dados = {**cache.get_data(), 'processo': _frame(['917441', '736121'], 40)}
+            cache.set_data(dados, changed=set())
+            assert cache.last_save_stats['written'] == 1 and cache.manifest['processo']['rows'] == 80
+
+            # Outro processo lê o manifesto gravado
+            cache.cached_data = {}
+            cache._load_from_disk()
+            lidos = cache.get_data()
+            assert len(lidos['processo']) == 80 and len(lidos['provas']) == 25
+        finally:
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Só a categoria alterada regravada")
+
+
+def test_gravacao_interrompida():
+    """Uma falha no meio da gravação mantém os metadados e os arquivos anteriores"""
+    print("🧪 Testando gravação interrompida...")
+    diretorio_original = os.getcwd()
+    write_frame = columnar_store.write_frame
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            cache.set_data({'processo': _frame(['917441'], 30), 'provas': _frame(['389137'], 10)})
+            metadata_antes = cache.metadata_file.read_text(encoding='utf-8')
+
+            # Queda simulada: o primeiro arquivo é gravado, o segundo fica pela metade
+            gravados = []
+
+            def gravar_e_cair(path, value):
+                if gravados:
+                    path.with_name(path.name + '.tmp').write_bytes(b'PDC5 incompleto')
+                    raise OSError("disco cheio")
+                gravados.append(path)
+                return write_frame(path, value)
+
+            columnar_store.write_frame = gravar_e_cair
+            cache.set_data({'processo': _frame(['917441'], 35), 'provas': _frame(['389137'], 15)})
+            columnar_store.write_frame = write_frame
+            assert cache.metadata_file.read_text(encoding='utf-8') == metadata_antes
+
+            # Um novo processo lê o snapshot anterior, íntegro
+            cache.cached_data = {}
+            cache._load_from_disk()
+            lidos = cache.get_data()
+            assert len(lidos['processo']) == 30 and len(lidos['provas']) == 10
+
+            # A próxima gravação remove o arquivo e o temporário deixados pela queda
+            cache.set_data({'processo': _frame(['917441'], 35), 'provas': _frame(['389137'], 15)})
+            with open(cache.metadata_file, encoding='utf-8') as f:
+                arquivos = {entry['file'] for entry in json.load(f)['files'].values()}
+            assert set(_arquivos(cache)) == arquivos, _arquivos(cache)
+        finally:
+            columnar_store.write_frame = write_frame
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Snapshot anterior preservado e restos da queda removidos")
+
+
+def test_recarga_regrava_so_o_survey_alterado():
+    """Na sincronização incremental, só a categoria do survey com respostas novas vai ao disco"""
+    print("🧪 Testando recarga com um survey alterado...")
+    surveys = {
+        sid: StubSurvey.synthetic(sid, 30 * (i + 1), 4, n_grupos=1, seed=i)
+        for i, sid in enumerate(['917441', '736121', '286476', '389137'])
+    }
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = {'processo': ['917441', '736121'], 'reu': ['286476'],
+                                           'provas': '389137'}
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            assert service.start_background_loading()
+            while service.flights.in_flight('reload'):
+                time.sleep(0.02)
+            # processo, reu, provas e vitima (sem surveys configurados, vazia)
+            assert service.cache.last_save_stats['written'] == 4
+            antes = dict(service.cache.manifest)
+
+            surveys['389137'].add_responses(5)
+            service.cache.last_update = datetime(2000, 1, 1)
+            assert service.start_background_loading()
+            while service.flights.in_flight('reload'):
+                time.sleep(0.02)
+            status = service.get_cached_data()
+            assert status['error'] is None and len(status['data']['provas']) == 125
+            assert status['save']['written'] == 1, status['save']
+            assert all(service.cache.manifest[c] == antes[c] for c in ('processo', 'reu'))
+            assert service.cache.manifest['provas']['file'] != antes['provas']['file']
+        finally:
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Só a categoria de provas regravada")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da gravação do cache em disco...\n")
+
+    testes = [test_so_categorias_alteradas, test_gravacao_interrompida, test_recarga_regrava_so_o_survey_alterado]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script de teste da sondagem de mudanças antes de exportar os surveys
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_IDS = {'processo': ['917441', '245785'], 'provas': '389137'}
+
+
+def _surveys() -> dict:
+    return {
+        '917441': StubSurvey.synthetic('917441', 120, 8, n_grupos=2, seed=1),
+        '245785': StubSurvey.synthetic('245785', 80, 8, n_grupos=2, seed=2),
+        '389137': StubSurvey.synthetic('389137', 40, 5, n_grupos=1, seed=3),
+    }
+
+
+def _total(service) -> int:
+    return sum(len(df) for df in service.cache.get_data().values())
+
+
+def test_sondagem_pula_surveys_inalterados():
+    """Recargas sem mudanças não exportam; apenas o survey alterado é baixado"""
+    print("🧪 Testando sondagem de mudanças...")
+    diretorio_original = os.getcwd()
+    incremental_original = Config.INCREMENTAL_SYNC
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(_surveys()) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        try:
+            from utils.data_service_optimized import DataLoaderService
+            service = DataLoaderService()
+            service.lime_api.survey_ids = SURVEY_IDS
+            service.cache.clear_cache()
+
+            # Primeira carga: tudo é exportado
+            service._load_all_data()
+            assert _total(service) == 240, _total(service)
+            exportacoes = stub.calls['export_responses']
+
+            # Nada mudou: nenhuma exportação
+            service._load_all_data()
+            assert stub.calls['export_responses'] == exportacoes
+            assert service.last_probe_stats['skipped'] == 3, service.last_probe_stats
+
+            # Novas respostas em um survey: só ele é exportado
+            stub.surveys['389137'].add_responses(5)
+            service._load_all_data()
+            assert service.last_probe_stats['skipped'] == 2, service.last_probe_stats
+            assert _total(service) == 245, _total(service)
+
+            # Sem sincronização incremental, os surveys inalterados vêm do cache
+            Config.INCREMENTAL_SYNC = False
+            stub.surveys['917441'].add_responses(3)
+            service._load_all_data()
+            assert service.last_probe_stats['skipped'] == 2, service.last_probe_stats
+            assert _total(service) == 248, _total(service)
+
+            # Ressincronização completa periódica: nenhum survey é pulado
+            service.cache.last_full_sync = datetime.now() - timedelta(hours=Config.FULL_SYNC_INTERVAL_HOURS + 1)
+            service._load_all_data()
+            assert service.last_probe_stats['skipped'] == 0, service.last_probe_stats
+            assert _total(service) == 248, _total(service)
+        finally:
+            Config.INCREMENTAL_SYNC = incremental_original
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+
+    print("   ✅ Surveys inalterados pulados e dados completos em todas as cargas")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da sondagem de mudanças...\n")
+
+    falhas = 0
+    for teste in [test_sondagem_pula_surveys_inalterados]:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Script de teste da projeção de colunas nas exportações
+"""
+
+import sys
+import os
+import re
+import tempfile
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.session_manager import SessionKeyManager
+from utils.column_projection import question_code, required_columns
+from utils.question_map_cache import QuestionMapCache
+from utils.survey_catalog import SurveyCatalog
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_ID = '917441'
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def _survey_processo(n_extras: int = 60) -> StubSurvey:
+    """Survey de processo com as perguntas usadas pela aplicação e muitas outras"""
+    perguntas = [
+        {'qid': 1, 'gid': 1, 'title': 'P0Q0', 'question': 'Pesquisador responsável pelo preenchimento:'},
+        {'qid': 2, 'gid': 1, 'title': 'P0Q1', 'question': 'Número de controle (dado pela equipe)'},
+        {'qid': 3, 'gid': 1, 'title': 'P0Q2', 'question': 'Número do Processo:'},
+        {'qid': 4, 'gid': 2, 'title': 'P4Q8', 'question': 'Tipos penais na denúncia', 'other': 'Y'},
+        {'qid': 5, 'gid': 2, 'title': 'SQ001', 'question': 'Homicídio Simples', 'parent_qid': 4},
+        {'qid': 6, 'gid': 2, 'title': 'SQ002', 'question': 'Homicídio Privilegiado', 'parent_qid': 4},
+    ]
+    perguntas += [
+        {'qid': 100 + i, 'gid': 3, 'title': f'P5Q{100 + i}', 'question': f'Pergunta extra {i}'}
+        for i in range(n_extras)
+    ]
+    respostas = []
+    for response_id in range(1, 21):
+        resposta = {'id': response_id, 'submitdate': '2024-05-01 10:00:00', 'lastpage': 3, 'startlanguage': 'pt-BR',
+                    'P0Q0': 'Ana', 'P0Q1': f'{response_id}R01', 'P0Q2': f'{response_id:07d}-89.2023.8.26.0001',
+                    'P4Q8[SQ001]': 'Sim', 'P4Q8[SQ002]': 'Não', 'P4Q8[other]': None}
+        resposta.update({f'P5Q{100 + i}': f'valor {i} ' * 5 for i in range(n_extras)})
+        respostas.append(resposta)
+    grupos = [{'gid': g, 'group_name': f'Grupo {g}'} for g in (1, 2, 3)]
+    questoes = {str(g['gid']): [q for q in perguntas if q['gid'] == g['gid']] for g in grupos}
+    return StubSurvey(SURVEY_ID, grupos, questoes, responses=respostas)
+
+
+def test_codigo_da_coluna():
+    """Código da pergunta extraído do nome final da coluna"""
+    print("🧪 Testando extração do código...")
+    assert question_code('P0Q2. Número do Processo:') == 'P0Q2'
+    assert question_code('P0Q1A. Número de controle para casos em que há mais de uma vítima:') == 'P0Q1A'
+    assert question_code('P4Q8[SQ001]') == 'P4Q8'
+    assert question_code('submitdate') == 'submitdate'
+    assert question_code('Nº Controle') is None
+    print("   ✅ Códigos extraídos")
+
+
+def test_colunas_cobrem_validadores_e_resumo():
+    """Toda coluna citada nos validadores e no resumo do processo está na projeção"""
+    print("🧪 Testando cobertura da projeção...")
+    codigos = required_columns()
+    fontes = {
+        'processo': ['validation/processo_validator.py', 'components/process_summary.py'],
+        'vitima': ['validation/vitima_validator.py'],
+        'reu': ['validation/reu_validator.py'],
+        'provas': ['validation/provas_validator.py'],
+    }
+    for categoria, arquivos in fontes.items():
+        for arquivo in arquivos:
+            with open(os.path.join(RAIZ, 'src', arquivo), encoding='utf-8') as f:
+                citados = {question_code(m) for m in re.findall(r"""['"](P\d+Q[^'"]*)['"]""", f.read())}
+            # O resumo lista colunas de todas as categorias; o processo as reúne
+            if arquivo.startswith('components'):
+                citados -= set().union(*(codigos[c] for c in codigos if c != 'processo'))
+            faltando = citados - codigos[categoria]
+            assert not faltando, f"{categoria}: {sorted(faltando)} ausentes da projeção ({arquivo})"
+    assert {'P4Q8', 'P6Q6', 'P1Q1', 'P9Q2', 'P9Q3'} <= codigos['processo'], sorted(codigos['processo'])
+    print(f"   ✅ {sum(len(c) for c in codigos.values())} códigos em {len(codigos)} categorias")
+
+
+def test_exportacao_projetada():
+    """Só os campos pedidos são exportados e os valores conferem com a exportação completa"""
+    print("🧪 Testando exportação projetada...")
+    url_original = Config.LIME_API_URL
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer({SURVEY_ID: _survey_processo()}) as stub:
+        Config.LIME_API_URL = stub.url
+        # Cache de mapas de perguntas e catálogo próprios, sem tocar no ./data_cache do desenvolvedor
+        api = LimeSurveyAPI(question_maps=QuestionMapCache(os.path.join(diretorio, 'question_maps')))
+        api.sessions = SessionKeyManager()
+        api.catalog = SurveyCatalog(diretorio)
+        try:
+            completo = api.download_survey_data(SURVEY_ID)
+            projetado = api.download_survey_data(SURVEY_ID, columns=required_columns()['processo'])
+        finally:
+            api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+
+    colunas = set(projetado.columns)
+    assert {'P0Q2. Número do Processo:', 'P4Q8[SQ001]', 'P4Q8[SQ002]', 'P4Q8[other]'} <= colunas, colunas
+    assert not any(c.startswith('P5Q') for c in colunas), colunas
+    assert colunas <= set(completo.columns)
+    assert {'id', 'submitdate', 'lastpage', 'form_origem'} <= colunas
+    comuns = list(projetado.columns)
+    assert projetado.equals(completo[comuns]), "Valores divergentes da exportação completa"
+    print(f"   ✅ {len(projetado.columns)} de {len(completo.columns)} colunas exportadas")
+
+
+def test_mudanca_de_projecao_ressincroniza():
+    """Trocar a projeção força uma sincronização completa com as novas colunas"""
+    print("🧪 Testando troca de projeção...")
+    diretorio_original = os.getcwd()
+    projecao_original = Config.COLUMN_PROJECTION
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer({SURVEY_ID: _survey_processo(10)}) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        from utils.data_service_optimized import DataLoaderService
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = {'processo': [SURVEY_ID]}
+            service.cache.clear_cache()
+            service.lime_api.question_maps.clear()
+
+            Config.COLUMN_PROJECTION = True
+            service._load_all_data()
+            df = service.cache.get_data()['processo']
+            assert not any(c.startswith('P5Q') for c in df.columns), list(df.columns)
+            assert len(df) == 20
+
+            # Sem mudanças na projeção, a próxima carga não exporta nada
+            exportacoes = stub.calls['export_responses']
+            service._load_all_data()
+            assert stub.calls['export_responses'] == exportacoes
+
+            # Exportação completa: o cache projetado não serve de base incremental
+            Config.COLUMN_PROJECTION = False
+            service._load_all_data()
+            df = service.cache.get_data()['processo']
+            assert stub.calls['export_responses'] == exportacoes + 1
+            assert sum(c.startswith('P5Q') for c in df.columns) == 10, list(df.columns)
+            assert len(df) == 20 and service.cache.projection == 'completa'
+        finally:
+            Config.COLUMN_PROJECTION = projecao_original
+            service.cache.clear_cache()
+            service.lime_api.question_maps.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Sincronização completa ao trocar a projeção")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da projeção de colunas...\n")
+
+    testes = [
+        test_codigo_da_coluna,
+        test_colunas_cobrem_validadores_e_resumo,
+        test_exportacao_projetada,
+        test_mudanca_de_projecao_ressincroniza,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
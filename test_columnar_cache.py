@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Script de teste do formato colunar do cache persistente
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+
+from utils import columnar_store
+from utils.persistent_data_cache import PersistentDataCache
+
+
+def _dados() -> dict:
+    processo = pd.DataFrame({
+        'id': np.arange(1, 6, dtype=float),
+        'submitdate': pd.to_datetime(['2024-01-0%d 10:00:00' % i for i in range(1, 6)]),
+        'P0Q0': ['0001234-89.2023.8.26.0001', None, 'Sim', 'Não', 'Sim'],
+        'form_origem': ['917441'] * 5,
+    })
+    provas = pd.DataFrame({'id': [1.0, 2.0], 'P0Q1': ['Laudo', 'Perícia'], 'form_origem': ['389137'] * 2})
+    return {'processo': processo, 'provas': provas}
+
+
+def test_arquivo_colunar():
+    """write_frame/read_frame preservam valores e dtypes e detectam arquivos inválidos"""
+    print("🧪 Testando arquivo colunar...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        path = Path(diretorio) / f'processo{columnar_store.EXTENSION}'
+        df = _dados()['processo']
+        tamanho = columnar_store.write_frame(path, df)
+        assert tamanho == path.stat().st_size and not list(Path(diretorio).glob('*.tmp'))
+
+        lido = columnar_store.read_frame(path)
+        assert lido.equals(df) and (lido.dtypes == df.dtypes).all(), lido.dtypes
+        # Os arrays lidos do disco podem ser alterados
+        lido.loc[0, 'id'] = 10.0
+        assert lido['id'].iloc[0] == 10.0
+
+        path.write_bytes(path.read_bytes()[:40])
+        try:
+            columnar_store.read_frame(path)
+            assert False, "Arquivo truncado deveria falhar"
+        except ValueError:
+            pass
+    print(f"   ✅ {tamanho} bytes, dtypes preservados")
+
+
+def test_cache_colunar_e_migracao():
+    """O cache grava um arquivo por categoria, listado no manifesto, e migra o surveys_cache.json antigo"""
+    print("🧪 Testando gravação e migração do cache...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            dados = _dados()
+            cache.set_data(dados, watermarks={'917441': 5, '389137': 2})
+            geracao = cache.generation
+            arquivos = sorted(p.name for p in cache.frames_dir.iterdir())
+            assert arquivos == [f'processo.{geracao}.pkl', f'provas.{geracao}.pkl'], arquivos
+            with open(cache.metadata_file, encoding='utf-8') as f:
+                metadata = json.load(f)
+            assert metadata['format'] == 'pickle5' and metadata['files']['provas']['file'] == f'provas.{geracao}.pkl'
+            assert metadata['files']['processo']['surveys'] == ['917441'] and metadata['files']['processo']['rows'] == 5
+
+            # Releitura do disco (como em um novo processo); mapeados, os textos ficam Categorical
+            cache.cached_data = {}
+            cache._load_from_disk()
+            lidos = {c: columnar_store.materialize(df) for c, df in cache.get_data().items()}
+            assert all(lidos[c].equals(dados[c]) for c in dados)
+            assert lidos['processo']['submitdate'].dtype == dados['processo']['submitdate'].dtype
+
+            # Categoria removida: o arquivo dela também sai do disco
+            cache.set_data({'processo': dados['processo']})
+            assert sorted(p.name for p in cache.frames_dir.iterdir()) == [f'processo.{cache.generation}.pkl']
+
+            # Cache antigo: metadados sem formato e surveys_cache.json
+            cache.clear_cache()
+            columnar_store.dump_legacy_json(cache.cache_file, dados)
+            with open(cache.metadata_file, 'w', encoding='utf-8') as f:
+                json.dump({'last_update': None, 'next_update': '2000-01-01T00:00:00',
+                           'watermarks': {'917441': 5}}, f)
+            cache._load_from_disk()
+            assert sum(len(df) for df in cache.get_data().values()) == 7
+            assert cache.watermarks == {'917441': 5}
+
+            cache.set_data(cache.get_data())
+            assert not cache.cache_file.exists(), "O JSON antigo deve ser removido após a migração"
+            assert (cache.frames_dir / f'processo.{cache.generation}.pkl').exists()
+        finally:
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Um arquivo por categoria e migração do formato JSON")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do cache colunar...\n")
+
+    testes = [test_arquivo_colunar, test_cache_colunar_e_migracao]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script de teste da normalização dos cabeçalhos das exportações
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.lime_api import LimeSurveyAPI
+from utils.question_map_cache import QuestionMapCache
+from bench_headers import finalize_frame_anterior, survey_largo
+
+SURVEY_ID = '917441'
+
+
+def _api(diretorio: str) -> LimeSurveyAPI:
+    """Cliente sem rede, apenas com o cache de mapas de perguntas"""
+    api = LimeSurveyAPI.__new__(LimeSurveyAPI)
+    api.question_maps = QuestionMapCache(Path(diretorio))
+    return api
+
+
+def test_mesmo_resultado_do_pipeline_anterior():
+    """Colunas, form_origem e id iguais aos do pipeline anterior"""
+    print("🧪 Testando equivalência com o pipeline anterior...")
+    question_map, bruto = survey_largo(40, 20)
+    question_map['P1Q1'] = ' P1Q1.\n<b>Data</b>\xa0do  fato<br/> '
+    with tempfile.TemporaryDirectory() as diretorio:
+        api = _api(diretorio)
+        api.question_maps.set(SURVEY_ID, 'v1', question_map)
+        esperado = finalize_frame_anterior(bruto.copy(), SURVEY_ID, question_map)
+        for _ in range(2):  # mapeamento calculado, depois reaproveitado
+            df = api.normalize_frame(bruto.copy(), SURVEY_ID, question_map)
+            assert list(df.columns) == list(esperado.columns)
+            assert df.equals(esperado)
+    assert 'P1Q1. Data do fato' in esperado.columns
+    print(f"   ✅ {len(esperado.columns)} colunas idênticas")
+
+
+def test_mapeamento_guardado_com_question_map():
+    """O mapeamento é persistido junto do question_map e descartado quando ele muda"""
+    print("🧪 Testando persistência do mapeamento...")
+    question_map, bruto = survey_largo(10, 5)
+    with tempfile.TemporaryDirectory() as diretorio:
+        api = _api(diretorio)
+        api.question_maps.set(SURVEY_ID, 'v1', question_map)
+        api.normalize_frame(bruto.copy(), SURVEY_ID, question_map)
+
+        # Outro processo lê o mapeamento do disco
+        header_map = QuestionMapCache(Path(diretorio)).get_header_map(SURVEY_ID, dict(question_map))
+        assert header_map and set(header_map) == set(bruto.columns), header_map
+        assert header_map['P0Q0'] == 'P0Q0. Pergunta 0&nbsp;sobre o processo  detalhes 0', header_map['P0Q0']
+
+        # Colunas novas na exportação estendem o mapeamento
+        bruto['P9Q99'] = 'A1'
+        api.normalize_frame(bruto.copy(), SURVEY_ID, question_map)
+        assert 'P9Q99' in api.question_maps.get_header_map(SURVEY_ID, question_map)
+
+        # Estrutura alterada: o mapeamento antigo não vale para o novo question_map
+        novo_map = {**question_map, 'P0Q0': 'P0Q0. Pergunta renomeada'}
+        assert api.question_maps.get_header_map(SURVEY_ID, novo_map) is None
+        api.question_maps.set(SURVEY_ID, 'v2', novo_map)
+        assert api.question_maps.get_header_map(SURVEY_ID, novo_map) == {}
+        df = api.normalize_frame(bruto.copy(), SURVEY_ID, novo_map)
+        assert 'P0Q0. Pergunta renomeada' in df.columns
+    print("   ✅ Mapeamento persistido, estendido e invalidado")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da normalização de cabeçalhos...\n")
+
+    falhas = 0
+    for teste in [test_mesmo_resultado_do_pipeline_anterior, test_mapeamento_guardado_com_question_map]:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
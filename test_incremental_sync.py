@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Script de teste da sincronização incremental (marcas d'água e mesclagem das respostas novas)
+"""
+
+import sys
+import os
+import tempfile
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from config.settings import Config
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+
+def _respostas(survey_id, ids, valor: str = 'original') -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': [float(i) for i in ids],
+        'P0Q0': [f'{valor} {i}' for i in ids],
+        'form_origem': [survey_id] * len(ids),
+    })
+
+
+def test_mesclagem_e_marcas_dagua():
+    """Ids novos são acrescentados, ids repetidos ficam com a versão nova e a marca d'água avança"""
+    print("🧪 Testando mesclagem incremental...")
+    # form_origem numérico, como no cache antigo lido do disco
+    existente = {
+        'processo': pd.concat([_respostas(917441, range(1, 6)), _respostas(736121, range(1, 4))],
+                              ignore_index=True),
+        'provas': _respostas('389137', range(1, 3)),
+    }
+    marcas = DataLoaderService._compute_watermarks(existente)
+    assert marcas == {'917441': 5, '736121': 3, '389137': 2}, marcas
+    assert DataLoaderService._next_from_id(marcas, '917441') == 6
+    assert DataLoaderService._next_from_id(marcas, '286476') is None
+
+    # A resposta 5 foi editada e reaparece junto com as novas 6 e 7
+    novos = {'processo': _respostas('917441', range(5, 8), valor='editada')}
+    mesclado = DataLoaderService._merge_incremental(existente, novos)
+
+    processo = mesclado['processo']
+    chaves = list(zip(processo['form_origem'], processo['id']))
+    assert len(chaves) == len(set(chaves)) == 10, chaves
+    do_survey = processo[processo['form_origem'] == '917441'].set_index('id')['P0Q0']
+    assert sorted(do_survey.index) == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    assert do_survey[5.0] == 'editada 5' and do_survey[1.0] == 'original 1'
+    assert len(processo[processo['form_origem'] == '736121']) == 3
+    assert mesclado['provas'].equals(existente['provas'])
+
+    marcas = DataLoaderService._compute_watermarks(mesclado)
+    assert marcas == {'917441': 7, '736121': 3, '389137': 2}, marcas
+    print("   ✅ Ids novos acrescentados, editados substituídos e marca d'água em 7")
+
+
+def test_carga_incremental_pelo_servidor():
+    """A segunda carga pede só os ids acima da marca d'água e acrescenta as respostas novas"""
+    print("🧪 Testando carga incremental contra o servidor local...")
+    surveys = {
+        '917441': StubSurvey.synthetic('917441', 30, 4, n_grupos=1, seed=1),
+        '389137': StubSurvey.synthetic('389137', 10, 4, n_grupos=1, seed=2),
+    }
+    pedidos = []
+    exportar = surveys['917441'].export
+
+    def export(formato, from_id=None, to_id=None, fields=None):
+        pedidos.append(from_id)
+        return exportar(formato, from_id, to_id, fields)
+
+    surveys['917441'].export = export
+    diretorio_original = os.getcwd()
+    url_original = Config.LIME_API_URL
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = {'processo': ['917441'], 'provas': '389137'}
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service._load_all_data()
+            assert service.cache.watermarks.get('917441') == 30, service.cache.watermarks
+
+            surveys['917441'].add_responses(5)
+            pedidos.clear()
+            service._load_all_data()
+            assert 31 in pedidos and None not in pedidos, pedidos
+            processo = service.cache.get_data()['processo']
+            assert len(processo) == 35 and processo['id'].is_unique
+            assert service.cache.watermarks.get('917441') == 35, service.cache.watermarks
+        finally:
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+            os.chdir(diretorio_original)
+    print("   ✅ Exportação a partir do id 31 e marca d'água em 35")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da sincronização incremental...\n")
+
+    testes = [test_mesclagem_e_marcas_dagua, test_carga_incremental_pelo_servidor]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
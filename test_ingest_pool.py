@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Script de teste da decodificação das exportações em processos separados
+"""
+
+import sys
+import os
+import signal
+import subprocess
+import tempfile
+import textwrap
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from data.ingest_pool import IngestPool, decode_export, pack_frame, unpack_frame
+from bench_ingest import gerar_respostas, gerar_payload_json, gerar_payload_csv
+
+
+def _respostas():
+    respostas = gerar_respostas(300, 12, seed=3)
+    respostas[5]['P0Q0'] = 'Conceição <b>ação</b> — “aspas”'
+    respostas[7]['P0Q2'] = None
+    return respostas
+
+
+def test_forma_colunar():
+    """pack_frame/unpack_frame preservam valores, tipos e ausentes"""
+    print("🧪 Testando forma colunar...")
+    for payload, formato in ((gerar_payload_json(_respostas()), 'json'), (gerar_payload_csv(_respostas()), 'csv')):
+        original = decode_export(payload, formato)
+        remontado = unpack_frame(pack_frame(original))
+        assert list(remontado.columns) == list(original.columns)
+        assert list(remontado.dtypes) == list(original.dtypes), (formato, remontado.dtypes)
+        assert remontado.equals(original), f"DataFrame divergente ({formato})"
+        assert remontado['P0Q2'].isna().sum() == original['P0Q2'].isna().sum() == 1
+
+    misto = pd.DataFrame({'a': pd.Series(['x', 1, None], dtype=object), 'b': [1.5, None, 2.0]})
+    assert unpack_frame(pack_frame(misto)).equals(misto)
+    assert unpack_frame(pack_frame(pd.DataFrame())).empty
+    print("   ✅ JSON, CSV e colunas mistas remontados")
+
+
+def test_pool_equivale_a_decodificacao_local():
+    """O pool devolve o mesmo DataFrame que a decodificação na thread"""
+    print("🧪 Testando decodificação no pool...")
+    payload = gerar_payload_json(_respostas())
+    pool = IngestPool(processes=2)
+    local = IngestPool(processes=0)
+    try:
+        no_pool = pool.decode(payload, 'json')
+        assert no_pool.equals(local.decode(payload, 'json'))
+        assert pool.snapshot()['decoded'] == 1 and local.snapshot()['local_decodes'] == 1
+
+        try:
+            pool.decode('eyJ4IjogMX0=', 'json')  # {"x": 1}, sem o array de respostas
+            assert False, "Payload inválido deveria falhar"
+        except ValueError:
+            pass
+    finally:
+        pool.shutdown()
+    print(f"   ✅ {len(no_pool)} respostas decodificadas em outro processo")
+
+
+def test_processo_encerrado():
+    """Se um processo do pool morre, a exportação é decodificada localmente e o pool recriado"""
+    print("🧪 Testando processo encerrado...")
+    payload = gerar_payload_json(_respostas())
+    pool = IngestPool(processes=1)
+    try:
+        pool.decode(payload, 'json')
+        for processo in list(pool._executor._processes.values()):
+            os.kill(processo.pid, signal.SIGKILL)
+            processo.join()
+        df = pool.decode(payload, 'json')
+        assert len(df) == 300
+        assert pool.snapshot()['failures'] == 1, pool.snapshot()
+        assert len(pool.decode(payload, 'json')) == 300
+        assert pool.snapshot()['decoded'] == 2
+    finally:
+        pool.shutdown()
+    print("   ✅ Pool recriado após a falha")
+
+
+def test_app_reimportado_pelos_processos():
+    """Reimportado como módulo principal de um processo spawn, app.py não inicia a aplicação"""
+    print("🧪 Testando reimportação de app.py nos processos...")
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+    # O spawn executa o script principal com run_name='__mp_main__' em cada processo
+    codigo = textwrap.dedent(f"""
+        import sys, runpy, threading
+        sys.path.insert(0, {src!r})
+        runpy.run_path({os.path.join(src, 'app.py')!r}, run_name='__mp_main__')
+        modulos = [m for m in ('dash', 'utils.data_service_optimized', 'utils.persistent_data_cache')
+                   if m in sys.modules]
+        print(modulos, threading.active_count())
+    """)
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultado = subprocess.run([sys.executable, '-c', codigo], cwd=diretorio,
+                                   capture_output=True, text=True, timeout=120)
+        criados = os.listdir(diretorio)
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.strip() == '[] 1', resultado.stdout
+    assert not criados, f"Arquivos criados pelo processo: {criados}"
+    print("   ✅ Nenhuma aplicação, cache ou thread de carregamento nos processos")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da decodificação em processos...\n")
+
+    testes = [test_forma_colunar, test_pool_equivale_a_decodificacao_local, test_processo_encerrado,
+              test_app_reimportado_pelos_processos]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Script de teste do cliente asyncio da API e do carregamento asyncio em blocos
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api_async import AsyncLimeSurveyAPI
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_ID = '917441'
+
+
+def _registrar_exportacoes(survey, intervalos: list, picos: dict):
+    """Registra os intervalos exportados e o pico de exportações simultâneas"""
+    exportar = survey.export
+    lock = threading.Lock()
+    ativos = [0]
+
+    def export(formato, from_id=None, to_id=None, fields=None):
+        with lock:
+            intervalos.append((from_id, to_id))
+            ativos[0] += 1
+            picos[survey.survey_id] = max(picos.get(survey.survey_id, 0), ativos[0])
+        try:
+            return exportar(formato, from_id, to_id, fields)
+        finally:
+            with lock:
+                ativos[0] -= 1
+
+    survey.export = export
+
+
+def test_download_assincrono():
+    """O cliente asyncio exporta o survey inteiro ou um intervalo de ids"""
+    print("🧪 Testando download com o cliente asyncio...")
+    survey = StubSurvey.synthetic(SURVEY_ID, 30, 4, n_grupos=2, seed=1)
+    diretorio_original = os.getcwd()
+    url_original = Config.LIME_API_URL
+
+    async def baixar(client: AsyncLimeSurveyAPI):
+        try:
+            completo = await client.download_survey_data(SURVEY_ID)
+            question_map = await client.get_question_map(SURVEY_ID)
+            intervalo = await client.download_survey_data(SURVEY_ID, 11, 20, question_map)
+            return completo, intervalo, question_map
+        finally:
+            await client.close()
+
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer({SURVEY_ID: survey}) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        client = AsyncLimeSurveyAPI(max_inflight=4)
+        try:
+            completo, intervalo, question_map = asyncio.run(baixar(client))
+        finally:
+            client._api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+            os.chdir(diretorio_original)
+
+    assert len(completo) == 30 and (completo['form_origem'] == SURVEY_ID).all()
+    assert len(question_map) == 4
+    ids = sorted(int(i) for i in intervalo['id'])
+    assert ids == list(range(11, 21)), ids
+    # Mapa recebido: o download do intervalo não consulta as perguntas de novo
+    assert stub.calls['list_questions'] == 2, stub.calls
+    print(f"   ✅ {len(completo)} respostas no survey inteiro e {len(intervalo)} no intervalo 11-20")
+
+
+def test_carregador_assincrono_em_blocos():
+    """Com ASYNC_LOADER, surveys grandes também são divididos em blocos de EXPORT_CHUNK_SIZE"""
+    print("🧪 Testando carregamento asyncio em blocos...")
+    from utils.data_service_optimized import DataLoaderService
+
+    surveys = {
+        '917441': StubSurvey.synthetic('917441', 40, 4, n_grupos=1, seed=1),
+        '389137': StubSurvey.synthetic('389137', 8, 4, n_grupos=1, seed=2),
+    }
+    intervalos, picos = [], {}
+    _registrar_exportacoes(surveys['917441'], intervalos, picos)
+    diretorio_original = os.getcwd()
+    url_original = Config.LIME_API_URL
+    originais = (Config.ASYNC_LOADER, Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY)
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            Config.ASYNC_LOADER, Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY = True, 10, 2
+            service.lime_api.survey_ids = {'processo': ['917441'], 'provas': '389137'}
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service._load_all_data()
+
+            dados = service.cache.get_data()
+            assert len(dados['processo']) == 40 and dados['processo']['id'].is_unique
+            assert len(dados['provas']) == 8
+        finally:
+            Config.ASYNC_LOADER, Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY = originais
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+            os.chdir(diretorio_original)
+
+    # 4 blocos de 10 respostas, o último sem limite superior (sem a listagem de ids do planejamento)
+    intervalos = [intervalo for intervalo in intervalos if intervalo[0] is not None]
+    assert sorted(intervalos) == [(1, 10), (11, 20), (21, 30), (31, None)], intervalos
+    # No máximo EXPORT_CHUNK_CONCURRENCY blocos do survey ao mesmo tempo
+    assert picos['917441'] <= 2, picos
+    print(f"   ✅ {len(intervalos)} blocos exportados (pico de {picos['917441']} simultâneos)")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do cliente asyncio...\n")
+
+    testes = [test_download_assincrono, test_carregador_assincrono_em_blocos]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
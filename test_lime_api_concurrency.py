@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Teste de estresse do cliente da API do LimeSurvey sob concorrência
+
+Sobe um servidor HTTP local que imita a API RemoteControl e dispara muitas
+chamadas simultâneas pelo mesmo cliente e pelos clientes por worker do
+carregador.
+"""
+
+import sys
+import os
+import json
+import base64
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.session_manager import SessionKeyManager
+
+THREADS = 32
+CHAMADAS_POR_THREAD = 20
+
+
+class _ApiLocal(BaseHTTPRequestHandler):
+    """Imita a API: login numerado, exportação sintética e eco dos demais métodos"""
+
+    protocol_version = 'HTTP/1.1'
+    logins = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        corpo = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        metodo, params = corpo['method'], corpo['params']
+        if metodo == 'get_session_key':
+            with _ApiLocal.lock:
+                _ApiLocal.logins += 1
+                resultado = f'CHAVE{_ApiLocal.logins}'
+        elif metodo == 'export_responses':
+            respostas = [{'id': i, 'P0Q1': f'{params[1]}-{i}'} for i in range(1, 11)]
+            resultado = base64.b64encode(json.dumps({'responses': respostas}).encode()).decode()
+        elif metodo in ('list_groups', 'get_survey_properties', 'get_summary'):
+            resultado = {'status': 'No groups found'} if metodo == 'list_groups' else {}
+        else:
+            resultado = {'method': metodo, 'params': params}
+        saida = json.dumps({'id': corpo['id'], 'result': resultado, 'error': None}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(saida)))
+        self.end_headers()
+        self.wfile.write(saida)
+
+    def log_message(self, *args):
+        pass
+
+
+def _iniciar_servidor() -> ThreadingHTTPServer:
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), _ApiLocal)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    servidor.url_original = Config.LIME_API_URL
+    Config.LIME_API_URL = f'http://127.0.0.1:{servidor.server_port}'
+    return servidor
+
+
+def _encerrar_servidor(servidor: ThreadingHTTPServer):
+    """Encerra o servidor e devolve a URL da API configurada antes dele"""
+    servidor.shutdown()
+    Config.LIME_API_URL = servidor.url_original
+
+
+def _cliente() -> LimeSurveyAPI:
+    api = LimeSurveyAPI(pool_size=8)
+    api.sessions = SessionKeyManager()
+    return api
+
+
+def test_parametros_compartilhados_entre_threads():
+    """A mesma lista de parâmetros usada por várias threads não é alterada"""
+    print("🧪 Testando chamadas simultâneas com parâmetros compartilhados...")
+    servidor = _iniciar_servidor()
+    try:
+        api = _cliente()
+        params = ['917441', 'pt-BR']
+
+        def chamar(thread: int) -> list:
+            erros = []
+            for i in range(CHAMADAS_POR_THREAD):
+                chave = f'T{thread}-{i}'
+                resposta = api.limesurvey_api_request('echo', params, session_key=chave, id_=i)
+                if resposta.get('result') != {'method': 'echo', 'params': [chave, '917441', 'pt-BR']}:
+                    erros.append(resposta)
+            return erros
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            erros = [e for lista in executor.map(chamar, range(THREADS)) for e in lista]
+
+        assert params == ['917441', 'pt-BR'], f"Lista do chamador alterada: {params}"
+        assert not erros, f"{len(erros)} respostas não correspondem à requisição: {erros[:3]}"
+        print(f"   ✅ {THREADS * CHAMADAS_POR_THREAD} chamadas corretas, parâmetros intactos")
+    finally:
+        _encerrar_servidor(servidor)
+
+
+def test_login_unico_sob_concorrencia():
+    """Threads que pedem a chave ao mesmo tempo resultam em um único login"""
+    print("🧪 Testando login simultâneo...")
+    servidor = _iniciar_servidor()
+    try:
+        _ApiLocal.logins = 0
+        api = _cliente()
+        barreira = threading.Barrier(THREADS)
+
+        def obter_chave(_):
+            barreira.wait()
+            return api.session_key
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            chaves = set(executor.map(obter_chave, range(THREADS)))
+
+        assert chaves == {'CHAVE1'}, f"Chaves obtidas: {chaves}"
+        assert _ApiLocal.logins == 1, f"{_ApiLocal.logins} logins"
+        print("   ✅ Uma única chave compartilhada")
+    finally:
+        _encerrar_servidor(servidor)
+
+
+def test_login_lento_nao_bloqueia_status():
+    """Enquanto um login demora, o status e a liberação da chave não esperam por ele"""
+    print("🧪 Testando login lento...")
+    sessions = SessionKeyManager()
+    liberar = threading.Event()
+    liberadas = []
+
+    def login():
+        liberar.wait(timeout=10)
+        return 'CHAVE-LENTA'
+
+    thread = threading.Thread(target=sessions.lease, args=(login, liberadas.append))
+    thread.start()
+    try:
+        resultado = []
+        consulta = threading.Thread(target=lambda: resultado.append((sessions.snapshot(), sessions.current())))
+        consulta.start()
+        consulta.join(timeout=2)
+        assert resultado, "snapshot() bloqueado pelo login em andamento"
+        assert resultado[0] == ({'logins': 0, 'refreshes': 0, 'invalidations': 0, 'active': False}, None)
+    finally:
+        liberar.set()
+        thread.join()
+    assert sessions.current() == 'CHAVE-LENTA'
+
+    # release_session_key não derruba a chave compartilhada pelos demais usuários
+    api = _cliente()
+    api.sessions = sessions
+    api.release_session_key()
+    assert sessions.current() == 'CHAVE-LENTA' and not liberadas
+    sessions.shutdown()
+    assert liberadas == ['CHAVE-LENTA'] and sessions.current() is None
+    print("   ✅ Status respondido durante o login e chave mantida até o encerramento")
+
+
+def test_sessoes_http_por_thread():
+    """Cada thread tem sua sessão HTTP, todas sobre o mesmo pool de conexões"""
+    print("🧪 Testando sessões HTTP por thread...")
+    transport = _cliente().transport
+    barreira = threading.Barrier(4)
+
+    def sessao(_):
+        barreira.wait()  # garante quatro threads distintas
+        s = transport.session
+        return id(s), id(s.get_adapter('http://'))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        resultados = list(executor.map(sessao, range(4)))
+    assert len({adapter for _, adapter in resultados}) == 1, "Threads devem dividir o mesmo pool"
+    assert len({s for s, _ in resultados}) > 1, "Threads não devem dividir a mesma sessão"
+    print("   ✅ Sessões separadas, pool compartilhado")
+
+
+def test_carregador_com_muitos_workers():
+    """O carregamento em threads funciona com mais workers que conexões no pool"""
+    print("🧪 Testando carregador com muitos workers...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Cache, log e mapas de perguntas ficam no diretório temporário
+        # (importar o serviço já cria o cache no diretório atual)
+        os.chdir(diretorio)
+        from utils.data_service_optimized import DataLoaderService
+        servidor = _iniciar_servidor()
+        service = DataLoaderService()
+        try:
+            service.max_workers = 0  # um worker por survey
+            survey_tasks = [(str(100000 + i), 'processo') for i in range(24)]
+
+            resultados = service._download_all_threads(survey_tasks, {})
+
+            assert len(resultados) == len(survey_tasks)
+            for (_, survey_id), blocos in resultados.items():
+                df = blocos[0]
+                assert len(df) == 10, f"Survey {survey_id}: {len(df)} respostas"
+                assert (df['form_origem'] == survey_id).all()
+            print(f"   ✅ {len(survey_tasks)} surveys baixados com {service._worker_count(len(survey_tasks))} workers")
+        finally:
+            service.lime_api.sessions.shutdown()
+            _encerrar_servidor(servidor)
+            os.chdir(diretorio_original)
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes de concorrência da API...\n")
+
+    testes = [
+        test_parametros_compartilhados_entre_threads,
+        test_login_unico_sob_concorrencia,
+        test_login_lento_nao_bloqueia_status,
+        test_sessoes_http_por_thread,
+        test_carregador_com_muitos_workers,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
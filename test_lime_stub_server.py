@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Script de teste do cliente da API contra o servidor local do LimeSurvey
+"""
+
+import sys
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.session_manager import SessionKeyManager
+from lime_stub_server import LimeStubServer, StubSurvey, load_fixtures
+
+
+@contextmanager
+def _cliente(stub: LimeStubServer) -> Iterator[LimeSurveyAPI]:
+    """Cliente apontado para o servidor local, com os mapas de perguntas em um diretório temporário"""
+    url_original = Config.LIME_API_URL
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        api = LimeSurveyAPI()
+        api.sessions = SessionKeyManager()
+        try:
+            yield api
+        finally:
+            api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+            os.chdir(diretorio_original)
+
+
+def _survey() -> StubSurvey:
+    return StubSurvey.synthetic('917441', n_respostas=250, n_colunas=12, n_grupos=3, seed=7)
+
+
+def test_exportacao_json_e_csv():
+    """JSON e CSV do mesmo survey produzem as mesmas respostas e perguntas"""
+    print("🧪 Testando exportação JSON e CSV...")
+    formatos = dict(Config.EXPORT_FORMAT_BY_SURVEY)
+    with LimeStubServer({'917441': _survey()}) as stub, _cliente(stub) as api:
+        try:
+            Config.EXPORT_FORMAT_BY_SURVEY['917441'] = 'json'
+            df_json = api.download_survey_data('917441')
+            Config.EXPORT_FORMAT_BY_SURVEY['917441'] = 'csv'
+            df_csv = api.download_survey_data('917441')
+        finally:
+            Config.EXPORT_FORMAT_BY_SURVEY.clear()
+            Config.EXPORT_FORMAT_BY_SURVEY.update(formatos)
+
+    assert len(df_json) == 250 and list(df_json.columns) == list(df_csv.columns)
+    assert 'P0Q0. Pergunta 0 do grupo 1' in df_json.columns
+    assert df_json['id'].tolist() == df_csv['id'].tolist()
+    pd.testing.assert_series_equal(df_json['P1Q1. Pergunta 1 do grupo 2'],
+                                   df_csv['P1Q1. Pergunta 1 do grupo 2'].astype(object), check_dtype=False)
+    print(f"   ✅ {len(df_json)} respostas e {len(df_json.columns)} colunas iguais nos dois formatos")
+
+
+def test_blocos_de_exportacao():
+    """O planejamento em blocos cobre todas as respostas sem repetições"""
+    print("🧪 Testando exportação em blocos...")
+    with LimeStubServer({'917441': _survey()}) as stub, _cliente(stub) as api:
+        chunks = api.plan_export_chunks('917441', 100)
+        frames = [api.download_survey_data('917441', inicio, fim) for inicio, fim in chunks]
+
+    assert chunks == [(1, 100), (101, 200), (201, None)], chunks
+    ids = pd.concat(frames)['id'].tolist()
+    assert ids == list(range(1, 251))
+    print(f"   ✅ {len(chunks)} blocos, {len(ids)} respostas")
+
+
+def test_falhas_injetadas_sao_repetidas():
+    """Erros 503 injetados são absorvidos pelas novas tentativas do transporte"""
+    print("🧪 Testando injeção de erros...")
+    base, maximo = Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX
+    Config.LIME_BACKOFF_BASE = Config.LIME_BACKOFF_MAX = 0.01
+    try:
+        with LimeStubServer({'917441': _survey()}, error_rate=0.3, seed=1,
+                            error_methods={'export_responses'}) as stub, _cliente(stub) as api:
+            tamanhos = [len(api.download_survey_data('917441', i * 50 + 1, (i + 1) * 50)) for i in range(5)]
+    finally:
+        Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX = base, maximo
+
+    assert stub.errors_injected > 0, "Nenhuma falha foi injetada"
+    assert tamanhos == [50] * 5, tamanhos
+    print(f"   ✅ {stub.errors_injected} falhas injetadas, todos os blocos baixados")
+
+
+def test_sessao_expirada_no_servidor():
+    """Uma chave recusada pelo servidor é renovada e a chamada repetida"""
+    print("🧪 Testando sessão expirada...")
+    with LimeStubServer({'917441': _survey()}) as stub, _cliente(stub) as api:
+        assert len(api.download_survey_data('917441', 1, 10)) == 10
+        stub.invalidate_sessions()
+        assert len(api.download_survey_data('917441', 1, 10)) == 10
+
+    assert stub.logins == 2, f"{stub.logins} logins"
+    print("   ✅ Chave renovada após expirar")
+
+
+def test_fixture_gravada():
+    """Um survey gravado e recarregado é servido com as mesmas respostas"""
+    print("🧪 Testando gravação de fixtures...")
+    with LimeStubServer({'917441': _survey()}) as stub, _cliente(stub) as api:
+        gravado = StubSurvey.record(api, '917441')
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        gravado.save(Path(diretorio) / '917441.json')
+        surveys = load_fixtures(Path(diretorio))
+
+    with LimeStubServer(surveys) as stub, _cliente(stub) as api:
+        df = api.download_survey_data('917441')
+
+    assert len(df) == 250 and df['id'].tolist() == list(range(1, 251))
+    assert len(gravado.groups) == 3
+    print(f"   ✅ Fixture com {gravado.total} respostas servida novamente")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes com o servidor local do LimeSurvey...\n")
+
+    testes = [
+        test_exportacao_json_e_csv,
+        test_blocos_de_exportacao,
+        test_falhas_injetadas_sao_repetidas,
+        test_sessao_expirada_no_servidor,
+        test_fixture_gravada,
+    ]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script de teste da camada de transporte HTTP (novas tentativas e reuso de conexões)
+"""
+
+import sys
+import os
+import json
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_transport import LimeTransport
+from lime_stub_server import LimeStubServer, StubSurvey
+
+CORPO = json.dumps({'method': 'get_summary', 'params': ['sem-chave', '917441'], 'id': 1})
+
+
+def _stub(**kwargs) -> LimeStubServer:
+    return LimeStubServer({'917441': StubSurvey.synthetic('917441', 10, 3, n_grupos=1)}, **kwargs)
+
+
+def _delta(transport: LimeTransport, inicio: dict) -> dict:
+    fim = transport.stats.snapshot()
+    return {chave: fim[chave] - inicio[chave] for chave in fim}
+
+
+def test_novas_tentativas():
+    """Falhas transitórias são repetidas até LIME_MAX_RETRIES e contabilizadas"""
+    print("🧪 Testando novas tentativas...")
+    originais = (Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES)
+    Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES = 0.01, 0.01, 2
+    try:
+        transport = LimeTransport(pool_size=2)
+        with _stub(error_rate=1.0, error_methods={'get_summary'}) as stub:
+            inicio = transport.stats.snapshot()
+            response = transport.post(stub.url, 'get_summary', CORPO)
+            esgotado = _delta(transport, inicio)
+
+            # Depois que o servidor se recupera, a chamada passa na primeira tentativa
+            stub.error_rate = 0.0
+            inicio = transport.stats.snapshot()
+            recuperado = transport.post(stub.url, 'get_summary', CORPO)
+            normal = _delta(transport, inicio)
+    finally:
+        Config.LIME_BACKOFF_BASE, Config.LIME_BACKOFF_MAX, Config.LIME_MAX_RETRIES = originais
+
+    assert response.status_code == 503 and stub.errors_injected == 3, (response.status_code, stub.errors_injected)
+    assert esgotado['requests'] == 3 and esgotado['retries'] == 2 and esgotado['failures'] == 1, esgotado
+    assert recuperado.status_code == 200
+    assert normal['requests'] == 1 and normal['retries'] == 0 and normal['failures'] == 0, normal
+    print(f"   ✅ {esgotado['retries']} novas tentativas e 1 falha contabilizadas")
+
+
+def test_reuso_de_conexoes():
+    """Chamadas seguidas reutilizam a conexão keep-alive; post_once não entra na conta"""
+    print("🧪 Testando reuso de conexões...")
+    transport = LimeTransport(pool_size=2)
+    with _stub() as stub:
+        inicio = transport.stats.snapshot()
+        for _ in range(10):
+            assert transport.post(stub.url, 'get_summary', CORPO).status_code == 200
+        delta = _delta(transport, inicio)
+        assert delta['requests'] == 10 and delta['connections_opened'] == 1, delta
+        assert delta['connections_reused'] == 9, delta
+
+        # Chamada fora do pool: nem requisição nem conexão do pool
+        inicio = transport.stats.snapshot()
+        transport.post_once(stub.url, 'get_summary', CORPO)
+        assert _delta(transport, inicio) == dict.fromkeys(inicio, 0)
+
+        # Pool ampliado: o adapter anterior é fechado e uma conexão nova é aberta
+        anterior = transport._adapter
+        transport.ensure_pool_size(4)
+        assert transport._adapter is not anterior and transport.pool_size == 4
+        assert not anterior.poolmanager.pools, "Conexões do pool substituído deveriam ser fechadas"
+        inicio = transport.stats.snapshot()
+        transport.post(stub.url, 'get_summary', CORPO)
+        assert _delta(transport, inicio)['connections_opened'] == 1
+    print("   ✅ 1 conexão aberta para 10 requisições")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do transporte HTTP...\n")
+
+    testes = [test_novas_tentativas, test_reuso_de_conexoes]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
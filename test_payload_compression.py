@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Script de teste da compressão das respostas e da contabilização de bytes
+"""
+
+import sys
+import os
+import tempfile
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.lime_transport import PayloadStats
+from data.session_manager import SessionKeyManager
+from utils.question_map_cache import QuestionMapCache
+from utils.survey_catalog import SurveyCatalog
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_ID = '917441'
+
+
+def _baixar(stub: LimeStubServer) -> tuple:
+    """Baixa o survey e retorna (DataFrame, bytes recebidos durante o download)"""
+    url_original = Config.LIME_API_URL
+    Config.LIME_API_URL = stub.url
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Mapas de perguntas e catálogo no diretório temporário, fora do ./data_cache
+        api = LimeSurveyAPI(question_maps=QuestionMapCache(os.path.join(diretorio, 'question_maps')))
+        api.sessions = SessionKeyManager()
+        api.catalog = SurveyCatalog(diretorio)
+        stats = api.transport.payload_stats
+        try:
+            inicio = stats.snapshot()
+            df = api.download_survey_data(SURVEY_ID)
+            return df, stats.delta(stats.snapshot(), inicio)
+        finally:
+            api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+
+
+def _survey() -> StubSurvey:
+    return StubSurvey.synthetic(SURVEY_ID, 300, 20, n_grupos=2, seed=7)
+
+
+def test_compressao_negociada():
+    """Com gzip aceito, a exportação chega comprimida e os dados não mudam"""
+    print("🧪 Testando compressão negociada...")
+    encoding_original = Config.LIME_ACCEPT_ENCODING
+    try:
+        Config.LIME_ACCEPT_ENCODING = ''
+        with LimeStubServer({SURVEY_ID: _survey()}) as stub:
+            sem_compressao, delta_sem = _baixar(stub)
+        Config.LIME_ACCEPT_ENCODING = 'gzip, deflate'
+        with LimeStubServer({SURVEY_ID: _survey()}) as stub:
+            comprimido, delta_com = _baixar(stub)
+    finally:
+        Config.LIME_ACCEPT_ENCODING = encoding_original
+
+    assert comprimido.equals(sem_compressao), "Dados divergentes com compressão"
+
+    export_sem = delta_sem['by_method']['export_responses']
+    assert export_sem['compressed_responses'] == 0
+    assert export_sem['wire_bytes'] == export_sem['bytes'], export_sem
+
+    export_com = delta_com['by_method']['export_responses']
+    assert export_com['compressed_responses'] == 1, export_com
+    assert export_com['bytes'] == export_sem['bytes'], (export_com, export_sem)
+    assert export_com['wire_bytes'] * 3 < export_com['bytes'], export_com
+
+    # Contabilização por survey inclui as chamadas de metadados do survey (list_groups, e
+    # get_survey_properties quando o catálogo de surveys não tem a data de modificação)
+    survey = delta_com['by_survey'][SURVEY_ID]
+    assert survey['responses'] >= 2 and survey['bytes'] > export_com['bytes'], survey
+    assert 'get_session_key' in delta_com['by_method'] and None not in delta_com['by_survey']
+    print(f"   ✅ {export_com['bytes']} bytes em {export_com['wire_bytes']} transferidos")
+
+
+def test_servidor_sem_compressao():
+    """Se o servidor ignora Accept-Encoding, bytes no fio e descomprimidos coincidem"""
+    print("🧪 Testando servidor sem compressão...")
+    with LimeStubServer({SURVEY_ID: _survey()}, compression=False) as stub:
+        df, delta = _baixar(stub)
+    assert len(df) == 300
+    total = PayloadStats.summary(delta)
+    assert total['compressed_responses'] == 0 and total['ratio'] == 1.0, total
+    assert total['saved_seconds'] == 0.0, total
+    print("   ✅ Razão 1.0 e nenhum tempo economizado")
+
+
+def _delimitadores(tamanho: int, chunk_size: int) -> int:
+    """Bytes de Transfer-Encoding: chunked acrescentados a um corpo de `tamanho` bytes"""
+    blocos = [min(chunk_size, tamanho - inicio) for inicio in range(0, tamanho, chunk_size)]
+    return sum(len(f'{n:x}') + 4 for n in blocos) + len('0\r\n\r\n')
+
+
+def test_resposta_chunked():
+    """Em respostas chunked, os bytes no fio são contados no socket, comprimidos"""
+    print("🧪 Testando respostas chunked...")
+    encoding_original = Config.LIME_ACCEPT_ENCODING
+    try:
+        Config.LIME_ACCEPT_ENCODING = 'gzip, deflate'
+        with LimeStubServer({SURVEY_ID: _survey()}) as stub:
+            inteiro, delta_inteiro = _baixar(stub)
+        with LimeStubServer({SURVEY_ID: _survey()}, chunk_size=4096) as stub:
+            chunked, delta_chunked = _baixar(stub)
+        Config.LIME_ACCEPT_ENCODING = ''
+        with LimeStubServer({SURVEY_ID: _survey()}, chunk_size=4096) as stub:
+            _, delta_sem = _baixar(stub)
+    finally:
+        Config.LIME_ACCEPT_ENCODING = encoding_original
+
+    assert chunked.equals(inteiro), "Dados divergentes na resposta chunked"
+    export_inteiro = delta_inteiro['by_method']['export_responses']
+    export = delta_chunked['by_method']['export_responses']
+    assert export['compressed_responses'] == 1 and export['bytes'] == export_inteiro['bytes'], export
+    assert export['wire_bytes'] * 3 < export['bytes'], export
+    assert export['wire_bytes'] == export_inteiro['wire_bytes'] + \
+        _delimitadores(export_inteiro['wire_bytes'], 4096), (export, export_inteiro)
+
+    export_sem = delta_sem['by_method']['export_responses']
+    assert export_sem['wire_bytes'] == export_sem['bytes'] + _delimitadores(export_sem['bytes'], 4096), export_sem
+    print(f"   ✅ {export['bytes']} bytes em {export['wire_bytes']} transferidos em blocos")
+
+
+def test_resumo():
+    """Razão de compressão e tempo economizado estimado pela vazão observada"""
+    print("🧪 Testando resumo dos bytes...")
+    stats = PayloadStats()
+    stats.record('export_responses', '1', wire_bytes=1000, size=5000, compressed=True, download_seconds=0.5)
+    stats.record('list_groups', '1', wire_bytes=100, size=100, compressed=False, download_seconds=0.05)
+    stats.record('get_session_key', None, wire_bytes=50, size=50, compressed=False, download_seconds=0.025)
+    total = PayloadStats.summary(stats.snapshot())
+    assert total['wire_bytes'] == 1150 and total['bytes'] == 5150, total
+    assert total['ratio'] == 4.48, total
+    # 4000 bytes poupados a 1150 bytes / 0.575s = 2000 B/s
+    assert total['saved_seconds'] == 2.0, total
+    assert stats.snapshot()['by_survey']['1']['responses'] == 2
+    print(f"   ✅ Razão {total['ratio']}x, {total['saved_seconds']}s economizados")
+
+
+def test_log_do_carregamento():
+    """O carregamento registra os bytes recebidos por survey e método"""
+    print("🧪 Testando registro no carregamento...")
+    diretorio_original = os.getcwd()
+    url_original = Config.LIME_API_URL
+    with tempfile.TemporaryDirectory() as diretorio, \
+            LimeStubServer({SURVEY_ID: _survey(), '389137': StubSurvey.synthetic('389137', 50, 5, n_grupos=1)}) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        from utils.data_service_optimized import DataLoaderService
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = {'processo': [SURVEY_ID], 'provas': '389137'}
+            service.cache.clear_cache()
+            service._load_all_data()
+            payload = service.get_cached_data()['payload']
+            assert set(payload['by_survey']) == {SURVEY_ID, '389137'}, payload['by_survey']
+            assert payload['total']['ratio'] > 1, payload['total']
+            assert payload['total']['wire_bytes'] < payload['total']['bytes']
+        finally:
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+            os.chdir(diretorio_original)
+    print(f"   ✅ Compressão {payload['total']['ratio']}x no carregamento")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da compressão das respostas...\n")
+
+    testes = [test_compressao_negociada, test_servidor_sem_compressao, test_resposta_chunked, test_resumo,
+              test_log_do_carregamento]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Script de teste da publicação progressiva dos surveys durante o carregamento
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from config.settings import Config
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_IDS = {'processo': ['917441', '736121'], 'reu': ['286476'], 'vitima': '712915', 'provas': '389137'}
+
+
+def _surveys() -> dict:
+    return {
+        '917441': StubSurvey.synthetic('917441', 40, 5, n_grupos=1, seed=1),
+        '736121': StubSurvey.synthetic('736121', 20, 5, n_grupos=1, seed=2),
+        '286476': StubSurvey.synthetic('286476', 30, 5, n_grupos=1, seed=3),
+        '712915': StubSurvey.synthetic('712915', 25, 5, n_grupos=1, seed=4),
+        '389137': StubSurvey.synthetic('389137', 15, 5, n_grupos=1, seed=5),
+    }
+
+
+def test_publicacao_de_um_survey():
+    """publish_survey substitui as respostas do survey ou acrescenta as novas"""
+    print("🧪 Testando publicação de um survey...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        from utils.persistent_data_cache import PersistentDataCache
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            cache.publish_survey('processo', '1', pd.DataFrame({'id': [1, 2], 'form_origem': ['1', '1']}))
+            cache.publish_survey('processo', '2', pd.DataFrame({'id': [1], 'form_origem': ['2']}))
+            assert len(cache.get_data()['processo']) == 3
+
+            # Sincronização completa: as respostas do survey são trocadas pelas novas
+            cache.publish_survey('processo', '1', pd.DataFrame({'id': [1, 2, 3], 'form_origem': ['1'] * 3}))
+            df = cache.get_data()['processo']
+            assert sorted(df[df['form_origem'] == '1']['id']) == [1, 2, 3] and len(df) == 4
+
+            # Incremental: respostas novas acrescentadas, sem duplicar ids já em cache
+            cache.publish_survey('processo', '2', pd.DataFrame({'id': [1, 2], 'form_origem': ['2', '2']}),
+                                 incremental=True)
+            df = cache.get_data()['processo']
+            assert sorted(df[df['form_origem'] == '2']['id']) == [1, 2] and len(df) == 5
+            assert not cache.metadata_file.exists(), "Publicação não deve gravar em disco"
+        finally:
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Substituição e acréscimo incremental")
+
+
+def _carregar_registrando(service) -> list:
+    """Executa uma carga registrando, a cada publicação, o que já estava buscável"""
+    publicacoes = []
+    publicar = service.cache.publish_survey
+
+    def registrar(categoria, survey_id, df, incremental=False):
+        publicar(categoria, survey_id, df, incremental)
+        dados = service.cache.get_data()
+        estados = {s['survey_id']: s['estado'] for s in service.progress_status()}
+        publicacoes.append((categoria, survey_id, {c: len(d) for c, d in dados.items()}, estados))
+
+    service.cache.publish_survey = registrar
+    try:
+        service._load_all_data()
+    finally:
+        del service.cache.publish_survey
+    return publicacoes
+
+
+def test_processo_primeiro():
+    """Com um worker, os surveys de processo chegam e ficam buscáveis antes das demais categorias"""
+    print("🧪 Testando publicação progressiva...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(_surveys()) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        limiter = service.lime_api.transport.limiter
+        try:
+            service.lime_api.survey_ids = SURVEY_IDS
+            service.cache.clear_cache()
+            service.max_workers = 1
+            service.lime_api.transport.limiter = None
+            publicacoes = _carregar_registrando(service)
+
+            ordem = [categoria for categoria, *_ in publicacoes]
+            assert ordem == ['processo', 'processo', 'reu', 'vitima', 'provas'], ordem
+            # Ao publicar o réu, os processos já estavam buscáveis e as provas ainda não
+            _, _, dados, estados = publicacoes[2]
+            assert dados.get('processo') == 60 and 'provas' not in dados, dados
+            assert estados['389137'] == 'aguardando' and estados['917441'] == 'pronto', estados
+
+            final = service.cache.get_data()
+            assert {c: len(df) for c, df in final.items()} == {'processo': 60, 'reu': 30, 'vitima': 25, 'provas': 15}
+            assert all(s['estado'] == 'pronto' for s in service.get_cached_data()['surveys'])
+        finally:
+            service.lime_api.transport.limiter = limiter
+            service.max_workers = Config.LOADER_MAX_WORKERS
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print(f"   ✅ Ordem de publicação: {', '.join(ordem)}")
+
+
+def test_publicacao_async_e_incremental():
+    """O carregador asyncio também publica cada survey, e a carga incremental acrescenta as novas respostas"""
+    print("🧪 Testando publicação no carregador asyncio...")
+    diretorio_original = os.getcwd()
+    async_original = Config.ASYNC_LOADER
+    surveys = _surveys()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            Config.ASYNC_LOADER = True
+            service.lime_api.survey_ids = SURVEY_IDS
+            service.cache.clear_cache()
+            publicacoes = _carregar_registrando(service)
+            assert sorted(sid for _, sid, *_ in publicacoes) == sorted(surveys)
+
+            # Cinco respostas novas em um survey de processo
+            surveys['736121'].add_responses(5)
+            publicacoes = _carregar_registrando(service)
+            assert [sid for _, sid, *_ in publicacoes] == ['736121'], publicacoes
+            assert publicacoes[0][2]['processo'] == 65
+            assert len(service.cache.get_data()['processo']) == 65
+        finally:
+            Config.ASYNC_LOADER = async_original
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Surveys publicados no asyncio e respostas novas acrescentadas")
+
+
+def _instrumentar(survey, vazios=(), falhas=(), picos=None):
+    """Responde sem respostas ou com erro em alguns blocos e registra o pico de exportações simultâneas"""
+    exportar = survey.export
+    lock = threading.Lock()
+    ativos = [0]
+
+    def export(formato, from_id=None, to_id=None, fields=None):
+        with lock:
+            ativos[0] += 1
+            if picos is not None:
+                picos[survey.survey_id] = max(picos.get(survey.survey_id, 0), ativos[0])
+        try:
+            time.sleep(0.02)
+            if from_id in vazios:
+                return {'status': 'No Response found'}
+            if from_id in falhas:
+                return {'status': 'Error: falha simulada'}
+            return exportar(formato, from_id, to_id, fields)
+        finally:
+            with lock:
+                ativos[0] -= 1
+
+    survey.export = export
+
+
+def test_blocos_vazios_e_com_falha():
+    """Um bloco sem respostas não descarta o survey; um bloco com falha, sim"""
+    print("🧪 Testando blocos vazios e com falha...")
+    surveys = {
+        '917441': StubSurvey.synthetic('917441', 40, 5, n_grupos=1, seed=1),
+        '389137': StubSurvey.synthetic('389137', 40, 5, n_grupos=1, seed=5),
+    }
+    picos = {}
+    _instrumentar(surveys['917441'], vazios={11}, picos=picos)
+    _instrumentar(surveys['389137'], falhas={21}, picos=picos)
+    diretorio_original = os.getcwd()
+    chunk_original = (Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY)
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY = 10, 2
+            service.lime_api.survey_ids = {'processo': ['917441'], 'provas': '389137'}
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service._load_all_data()
+
+            dados = service.cache.get_data()
+            assert len(dados['processo']) == 30 and dados['provas'].empty, {c: len(d) for c, d in dados.items()}
+            estados = {s['survey_id']: s['estado'] for s in service.progress_status()}
+            assert estados == {'917441': 'pronto', '389137': 'falhou'}, estados
+            # No máximo EXPORT_CHUNK_CONCURRENCY blocos de cada survey ao mesmo tempo
+            assert picos and max(picos.values()) <= 2, picos
+        finally:
+            Config.EXPORT_CHUNK_SIZE, Config.EXPORT_CHUNK_CONCURRENCY = chunk_original
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print(f"   ✅ Survey com bloco vazio mantido, com falha descartado (picos por survey: {picos})")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da publicação progressiva...\n")
+
+    testes = [test_publicacao_de_um_survey, test_processo_primeiro, test_publicacao_async_e_incremental,
+              test_blocos_vazios_e_com_falha]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Script de teste do cache em disco dos mapas de perguntas
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from data.session_manager import SessionKeyManager
+from utils.question_map_cache import QuestionMapCache
+from utils.survey_catalog import SurveyCatalog
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_ID = '917441'
+
+
+def test_acerto_falha_e_invalidacao():
+    """O mapa é reaproveitado enquanto a impressão digital não muda e baixado de novo quando ela muda"""
+    print("🧪 Testando acerto, falha e invalidação do mapa de perguntas...")
+    survey = StubSurvey.synthetic(SURVEY_ID, 20, 6, n_grupos=3, seed=2)
+    url_original = Config.LIME_API_URL
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer({SURVEY_ID: survey}) as stub:
+        Config.LIME_API_URL = stub.url
+        api = LimeSurveyAPI(question_maps=QuestionMapCache(Path(diretorio) / 'question_maps'))
+        api.sessions = SessionKeyManager()
+        api.catalog = SurveyCatalog(diretorio)
+        try:
+            # Falha: as perguntas de cada grupo são baixadas e o mapa gravado no diretório do cache
+            mapa = api.get_question_map(SURVEY_ID)
+            assert len(mapa) == 6 and stub.calls['list_questions'] == 3, stub.calls
+            assert (Path(diretorio) / 'question_maps' / f'{SURVEY_ID}.json').exists()
+
+            # Acerto, inclusive em outro processo (cache novo lendo o mesmo diretório)
+            assert api.get_question_map(SURVEY_ID) == mapa
+            api.question_maps = QuestionMapCache(Path(diretorio) / 'question_maps')
+            assert api.get_question_map(SURVEY_ID) == mapa
+            assert stub.calls['list_questions'] == 3, stub.calls
+
+            # Survey alterado: a impressão digital muda e o mapa é baixado de novo
+            survey.properties['lastmodified'] = '2024-06-01 12:00:00'
+            assert api.get_question_map(SURVEY_ID) == mapa
+            assert stub.calls['list_questions'] == 6, stub.calls
+            assert api.get_question_map(SURVEY_ID) == mapa and stub.calls['list_questions'] == 6
+        finally:
+            api.sessions.shutdown()
+            Config.LIME_API_URL = url_original
+    print("   ✅ Baixado na falha, reaproveitado no acerto e renovado com a estrutura alterada")
+
+
+def test_entrada_vencida_ou_divergente():
+    """Entradas com outra impressão digital ou mais antigas que QUESTION_MAP_MAX_AGE_HOURS não são usadas"""
+    print("🧪 Testando validade das entradas...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache = QuestionMapCache(Path(diretorio))
+        assert cache.get(SURVEY_ID, 'abc') is None
+        cache.set(SURVEY_ID, 'abc', {'P0Q0': 'P0Q0. Pergunta'}, {'P0Q0': ['P0Q0']})
+        assert cache.get(SURVEY_ID, 'abc') == {'P0Q0': 'P0Q0. Pergunta'}
+        assert cache.get(SURVEY_ID, 'outra') is None
+
+        cache._memory[SURVEY_ID] = {**cache._memory[SURVEY_ID], 'updated_at': '2000-01-01T00:00:00'}
+        assert cache.get(SURVEY_ID, 'abc') is None
+
+        cache.clear()
+        assert cache.get(SURVEY_ID, 'abc') is None and not list(Path(diretorio).glob('*.json'))
+    print("   ✅ Impressão digital divergente e entrada vencida recusadas")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do cache de mapas de perguntas...\n")
+
+    testes = [test_acerto_falha_e_invalidacao, test_entrada_vencida_ou_divergente]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
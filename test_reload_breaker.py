@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Script de teste do disjuntor dos recarregamentos em background
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from utils.circuit_breaker import ReloadCircuitBreaker
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+
+def test_backoff_exponencial():
+    """Intervalos dobram a cada falha e só uma tentativa passa no estado semiaberto"""
+    print("🧪 Testando backoff do disjuntor...")
+    breaker = ReloadCircuitBreaker(failure_threshold=2, base_delay=0.1, max_delay=0.3, jitter=0)
+    assert breaker.allow()
+    breaker.record_failure('falha 1')
+    assert breaker.state == breaker.CLOSED and breaker.allow(), "Abaixo do limite continua fechado"
+
+    breaker.record_failure('falha 2')
+    assert breaker.state == breaker.OPEN and not breaker.allow()
+    assert breaker.snapshot()['next_attempt'] > datetime.now()
+
+    time.sleep(0.12)
+    assert breaker.allow() and breaker.half_open
+    assert not breaker.allow(), "Só uma tentativa no estado semiaberto"
+
+    # Falha no semiaberto reabre com o dobro do intervalo, limitado ao máximo
+    breaker.record_failure('falha 3')
+    espera = (breaker.snapshot()['next_attempt'] - datetime.now()).total_seconds()
+    assert 0.15 < espera <= 0.2, espera
+    time.sleep(0.21)
+    assert breaker.allow()
+    breaker.record_failure('falha 4')
+    espera = (breaker.snapshot()['next_attempt'] - datetime.now()).total_seconds()
+    assert 0.25 < espera <= 0.3, espera
+
+    time.sleep(0.31)
+    assert breaker.allow()
+    breaker.record_success()
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == breaker.CLOSED and snapshot['next_attempt'] is None, snapshot
+    assert snapshot['rejected'] == 2, snapshot
+    print("   ✅ 0.1s → 0.2s → 0.3s (máximo) e fechamento após sucesso")
+
+
+def _aguardar_carga(service):
+    while service.flights.in_flight('reload'):
+        time.sleep(0.02)
+
+
+def test_indisponibilidade():
+    """Durante uma queda os disparos são recusados e os últimos dados continuam servidos"""
+    print("🧪 Testando recarregamentos durante indisponibilidade...")
+    surveys = {
+        '917441': StubSurvey.synthetic('917441', 60, 5, n_grupos=1, seed=1),
+        '389137': StubSurvey.synthetic('389137', 30, 5, n_grupos=1, seed=2),
+    }
+    diretorio_original = os.getcwd()
+    tentativas_original = Config.LIME_MAX_RETRIES
+    with tempfile.TemporaryDirectory() as diretorio, \
+            LimeStubServer(surveys, error_methods={'export_responses', 'get_summary'}) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        Config.LIME_MAX_RETRIES = 0
+        service = DataLoaderService()
+        service.breaker = ReloadCircuitBreaker(base_delay=0.3, max_delay=5, jitter=0)
+        try:
+            service.lime_api.survey_ids = {'processo': ['917441'], 'provas': '389137'}
+            service.cache.clear_cache()
+            assert service.start_background_loading()
+            _aguardar_carga(service)
+            assert sum(len(df) for df in service.cache.get_data().values()) == 90
+
+            # Cache vencido e LimeSurvey fora do ar
+            service.cache.last_update = datetime.now() - timedelta(days=1)
+            stub.error_rate = 1.0
+            assert service.start_background_loading()
+            _aguardar_carga(service)
+            status = service.get_cached_data()
+            assert status['error'] and status['breaker']['state'] == 'aberto', status['breaker']
+            assert sum(len(df) for df in status['data'].values()) == 90, "Últimos dados devem ser mantidos"
+
+            # O callback de status dispara a cada segundo: nenhuma nova carga até o intervalo vencer
+            exportacoes, recargas = stub.calls['export_responses'], service.flights.snapshot()['executed']
+            assert not any(service.start_background_loading() for _ in range(20))
+            assert stub.calls['export_responses'] == exportacoes
+            assert service.flights.snapshot()['executed'] == recargas
+
+            # Tentativa semiaberta: a sondagem falha e nada é exportado
+            time.sleep(0.31)
+            assert service.start_background_loading()
+            _aguardar_carga(service)
+            assert stub.calls['export_responses'] == exportacoes, "A sondagem deve barrar a exportação"
+            breaker = service.breaker.snapshot()
+            assert breaker['state'] == 'aberto' and breaker['consecutive_failures'] == 2, breaker
+            assert (breaker['next_attempt'] - datetime.now()).total_seconds() > 0.5
+
+            # LimeSurvey de volta: a próxima tentativa recarrega e fecha o disjuntor
+            stub.error_rate = 0.0
+            time.sleep(0.61)
+            assert service.start_background_loading()
+            _aguardar_carga(service)
+            status = service.get_cached_data()
+            assert status['error'] is None and status['breaker']['state'] == 'fechado', status['breaker']
+            assert status['is_valid'] and sum(len(df) for df in status['data'].values()) == 90
+        finally:
+            Config.LIME_MAX_RETRIES = tentativas_original
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Disparos recusados, dados mantidos e disjuntor fechado após a volta")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do disjuntor de recarregamentos...\n")
+
+    testes = [test_backoff_exponencial, test_indisponibilidade]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
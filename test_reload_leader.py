@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Script de teste da eleição do processo que recarrega o cache compartilhado
+"""
+
+import sys
+import os
+import time
+import tempfile
+import subprocess
+import textwrap
+from datetime import datetime
+
+# Adicionar o diretório src ao path
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.insert(0, SRC)
+
+from config.settings import Config
+from utils.reload_leader import ReloadLeader
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+# Outro processo da aplicação: assume os recarregamentos, publica um snapshot
+# com `n` respostas de processo (opcionalmente marcando um recarregamento em
+# andamento) e só termina quando a entrada padrão fecha
+LIDER = textwrap.dedent("""
+    import sys, os
+    sys.path.insert(0, {src!r})
+    os.chdir({diretorio!r})
+    import numpy as np, pandas as pd
+    from utils.reload_leader import ReloadLeader
+    from utils.persistent_data_cache import PersistentDataCache
+    lider = ReloadLeader('data_cache')
+    assert lider.try_acquire()
+    lider.set_refreshing({refreshing})
+    n = {n}
+    if n:
+        PersistentDataCache().set_data({{'processo': pd.DataFrame({{
+            'id': np.arange(1, n + 1, dtype=float), 'form_origem': ['917441'] * n}})}})
+    print('pronto', flush=True)
+    sys.stdin.readline()
+""")
+
+
+def _iniciar_lider(diretorio: str, n: int = 0, refreshing: bool = False) -> subprocess.Popen:
+    codigo = LIDER.format(src=SRC, diretorio=diretorio, n=n, refreshing=refreshing)
+    processo = subprocess.Popen([sys.executable, '-c', codigo],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    assert processo.stdout.readline().strip() == 'pronto', "O processo líder não iniciou"
+    return processo
+
+
+def _encerrar(processo: subprocess.Popen):
+    processo.stdin.close()
+    processo.wait(timeout=30)
+
+
+def test_eleicao_entre_processos():
+    """Só um processo detém o lock; quando ele termina, outro assume e registra a troca"""
+    print("🧪 Testando eleição entre processos...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache_dir = os.path.join(diretorio, 'data_cache')
+        lider = _iniciar_lider(diretorio)
+        try:
+            seguidor = ReloadLeader(cache_dir)
+            assert not seguidor.try_acquire() and not seguidor.is_leader
+            snapshot = seguidor.snapshot()
+            assert snapshot['pid'] == lider.pid and not snapshot['is_leader'], snapshot
+        finally:
+            _encerrar(lider)
+
+        # O lock foi liberado com o fim do processo: a próxima tentativa assume
+        antes = datetime.now()
+        assert seguidor.try_acquire() and seguidor.is_leader
+        snapshot = seguidor.snapshot()
+        assert snapshot['pid'] == os.getpid() and snapshot['previous_pid'] == lider.pid, snapshot
+        assert snapshot['is_leader'] and snapshot['since'] >= antes.replace(microsecond=0)
+        assert seguidor.attempts == 2 and seguidor.try_acquire() and seguidor.attempts == 2
+
+        # Uma segunda instância no mesmo processo não divide o lock com a primeira
+        assert not ReloadLeader(cache_dir).try_acquire()
+        seguidor.release()
+        assert ReloadLeader(cache_dir).try_acquire()
+    print("   ✅ Um líder por vez e troca registrada")
+
+
+def test_seguidor_adota_snapshot():
+    """Sem o lock, o processo não baixa nada e serve o snapshot publicado pelo líder"""
+    print("🧪 Testando processo seguidor...")
+    surveys = {'917441': StubSurvey.synthetic('917441', 40, 4, n_grupos=1, seed=1)}
+    diretorio_original = os.getcwd()
+    intervalo_original = Config.RELOAD_LEADER_INTERVAL
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        lider = None
+        try:
+            service.lime_api.survey_ids = {'processo': ['917441']}
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+
+            lider = _iniciar_lider(diretorio, n=25)
+            assert not service.start_background_loading(), "Seguidor não deve recarregar"
+            assert stub.calls['export_responses'] == 0 and stub.calls['get_summary'] == 0
+            status = service.get_cached_data()
+            assert len(status['data']['processo']) == 25 and status['is_valid']
+            assert status['leader']['pid'] == lider.pid and not status['leader']['is_leader']
+
+            # Líder encerrado e cache vencido: a verificação periódica assume e recarrega
+            _encerrar(lider)
+            lider = None
+            service.cache.last_update = datetime(2000, 1, 1)
+            Config.RELOAD_LEADER_INTERVAL = 0.05
+            assert service.start_leader_watch() and not service.start_leader_watch()
+            limite = time.monotonic() + 30
+            while service.cache.get_data().get('processo') is None or \
+                    len(service.cache.get_data()['processo']) != 40:
+                assert time.monotonic() < limite, "O seguidor deveria assumir e recarregar"
+                time.sleep(0.05)
+            service.stop_leader_watch()
+            assert service.leader.is_leader and stub.calls['export_responses'] >= 1
+            assert service.get_cached_data()['leader']['is_leader']
+        finally:
+            Config.RELOAD_LEADER_INTERVAL = intervalo_original
+            service.stop_leader_watch()
+            while service.flights.in_flight('reload'):
+                time.sleep(0.02)
+            if lider:
+                _encerrar(lider)
+            service.leader.release()
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Snapshot do líder adotado e recarregamentos assumidos após o fim dele")
+
+
+def test_recarregamento_interrompido():
+    """O sinal de recarregamento de um líder encerrado não fica preso no status"""
+    print("🧪 Testando recarregamento interrompido...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache_dir = os.path.join(diretorio, 'data_cache')
+        lider = _iniciar_lider(diretorio, refreshing=True)
+        seguidor = ReloadLeader(cache_dir)
+        try:
+            assert seguidor.snapshot()['refreshing'], "Líder vivo está recarregando"
+            # Encerrado sem limpar o sinal, como numa queda no meio do recarregamento
+            lider.kill()
+            lider.wait(timeout=30)
+            assert seguidor.read_info()['refreshing']
+            assert not seguidor.snapshot()['refreshing'], "Sinal do líder encerrado deveria ser ignorado"
+        finally:
+            lider.stdin.close()
+        # A sonda não impede que o seguidor assuma
+        assert seguidor.try_acquire() and not seguidor.snapshot()['refreshing']
+        seguidor.release()
+    print("   ✅ Sinal ignorado sem o lock detido")
+
+
+def test_sinal_limpo_apos_erro():
+    """Uma exceção no recarregamento não deixa o sinal de recarregamento gravado"""
+    print("🧪 Testando sinal após erro no recarregamento...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        service = DataLoaderService()
+        sinais = []
+
+        def falhar():
+            sinais.append(service.leader.read_info()['refreshing'])
+            raise RuntimeError('queda simulada')
+
+        try:
+            service.cache.clear_cache()
+            service._load_all_data = falhar
+            assert service.start_background_loading(force=True)
+            while service.flights.in_flight('reload'):
+                time.sleep(0.02)
+            assert sinais == [True], sinais
+            assert not service.leader.read_info()['refreshing']
+            assert not service.leader.snapshot()['refreshing']
+        finally:
+            del service._load_all_data
+            service.cache.set_loading(False)
+            service.leader.release()
+            service.cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Sinal limpo mesmo com a exceção")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da eleição do recarregador...\n")
+
+    testes = [test_eleicao_entre_processos, test_seguidor_adota_snapshot, test_recarregamento_interrompido,
+              test_sinal_limpo_apos_erro]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
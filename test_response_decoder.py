@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Script de teste da decodificação das exportações do LimeSurvey
+"""
+
+import sys
+import os
+import json
+import base64
+import pandas as pd
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.response_decoder import (
+    decode_csv_export, decode_json_export, decode_json_export_legacy,
+    iter_base64_text, iter_json_responses, records_to_frame
+)
+
+
+def _payload(documento: dict) -> str:
+    return base64.b64encode(json.dumps(documento, ensure_ascii=False).encode('utf-8')).decode('ascii')
+
+
+def _respostas_teste() -> list:
+    respostas = []
+    for i in range(1, 301):
+        resposta = {
+            'id': i,
+            'submitdate': None if i % 5 == 0 else '2024-01-01 10:00:00',
+            'P0Q1': f'{i}R01',
+            'P0Q2': 'Ação "penal" \\ número ' * (i % 3)
+        }
+        if i % 7 == 0:
+            resposta['P9Q1'] = '2024-02-01'
+        if i % 11 == 0:
+            del resposta['P0Q1']
+        respostas.append(resposta)
+    return respostas
+
+
+def test_streaming_igual_ao_original():
+    """A decodificação em streaming deve produzir o mesmo DataFrame que a original"""
+    print("🧪 Testando decodificação JSON em streaming...")
+
+    payload = _payload({'responses': _respostas_teste()})
+    esperado = decode_json_export_legacy(payload)
+
+    # Blocos pequenos forçam objetos e caracteres UTF-8 divididos entre blocos
+    for tamanho_bloco in (4, 64, 1000, len(payload)):
+        obtido = records_to_frame(iter_json_responses(iter_base64_text(payload, tamanho_bloco)))
+        pd.testing.assert_frame_equal(esperado, obtido)
+
+    pd.testing.assert_frame_equal(esperado, decode_json_export(payload))
+    print(f"   ✅ {len(esperado)} respostas e {len(esperado.columns)} colunas idênticas")
+
+
+def test_exportacao_vazia():
+    """Exportação sem respostas gera DataFrame vazio"""
+    print("🧪 Testando exportação vazia...")
+
+    df = decode_json_export(_payload({'responses': []}))
+    assert df.empty
+    print("   ✅ DataFrame vazio")
+
+
+def test_exportacao_truncada():
+    """Documento truncado deve gerar erro em vez de dados parciais silenciosos"""
+    print("🧪 Testando exportação truncada...")
+
+    documento = json.dumps({'responses': _respostas_teste()})
+    payload = base64.b64encode(documento[:len(documento) // 2].encode('utf-8')).decode('ascii')
+    try:
+        decode_json_export(payload)
+    except ValueError:
+        print("   ✅ ValueError levantado")
+        return
+    raise AssertionError("Exportação truncada deveria levantar ValueError")
+
+
+def test_exportacao_csv():
+    """CSV com BOM, aspas e quebras de linha é lido com os tipos explícitos"""
+    print("🧪 Testando decodificação CSV...")
+
+    conteudo = '\ufeff"id","P0Q1","P0Q2","P4Q8[SQ001]"\n"1","1R01","Linha 1\nLinha 2","N/A"\n"2","2R01","",""\n'
+    payload = base64.b64encode(conteudo.encode('utf-8')).decode('ascii')
+    df = decode_csv_export(payload)
+
+    assert list(df.columns) == ['id', 'P0Q1', 'P0Q2', 'P4Q8[SQ001]']
+    assert df['id'].tolist() == [1, 2]
+    assert df.loc[0, 'P0Q2'] == 'Linha 1\nLinha 2'
+    assert df.loc[0, 'P4Q8[SQ001]'] == 'N/A'
+    assert pd.isna(df.loc[1, 'P0Q2'])
+    print("   ✅ Colunas, tipos e valores corretos")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes da decodificação...\n")
+
+    testes = [test_streaming_igual_ao_original, test_exportacao_vazia, test_exportacao_truncada, test_exportacao_csv]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Script de teste do snapshot do cache mapeado em memória e compartilhado entre processos
+"""
+
+import sys
+import os
+import mmap
+import tempfile
+import subprocess
+import textwrap
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.insert(0, SRC)
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from utils import columnar_store
+from utils.persistent_data_cache import PersistentDataCache
+from utils.data_service_optimized import DataLoaderService
+
+COLUNA_PROCESSO = 'P0Q2. Número do Processo:'
+
+
+def _mapeado(array) -> bool:
+    """Se o array aponta para as páginas de um arquivo mapeado"""
+    base = array
+    while base is not None:
+        if isinstance(base, mmap.mmap):
+            return True
+        base = base.obj if isinstance(base, memoryview) else getattr(base, 'base', None)
+    return False
+
+
+def _processo(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1, dtype=float),
+        COLUNA_PROCESSO: [f'{i % 7:07d}-89.2023.8.26.0001' for i in range(n)],
+        'lastpage': np.ones(n),
+        'form_origem': ['917441'] * n,
+    })
+
+
+def test_leitura_mapeada():
+    """Arrays numéricos e códigos das colunas de texto apontam para o arquivo mapeado"""
+    print("🧪 Testando leitura mapeada...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        path = Path(diretorio) / f'processo{columnar_store.EXTENSION}'
+        df = _processo(1000)
+        columnar_store.write_frame(path, df)
+
+        mapeado = columnar_store.read_frame(path, mapped=True)
+        assert _mapeado(mapeado['id'].to_numpy()), "Coluna numérica deveria estar no arquivo mapeado"
+        assert isinstance(mapeado[COLUNA_PROCESSO].dtype, pd.CategoricalDtype)
+        assert _mapeado(mapeado[COLUNA_PROCESSO].array.codes)
+        assert len(mapeado[COLUNA_PROCESSO].cat.categories) == 7
+
+        # Alterar o DataFrame mapeado não altera o arquivo (mapeamento privado)
+        mapeado.loc[0, 'id'] = -1.0
+        assert columnar_store.read_frame(path)['id'].iloc[0] == 1.0
+        assert columnar_store.materialize(mapeado).iloc[1:].equals(df.iloc[1:])
+    print("   ✅ Colunas sobre as páginas do arquivo, sem cópia")
+
+
+def test_texto_em_colunas_object():
+    """Colunas object só com strings (padrão do pandas 2.x) também têm os códigos no arquivo"""
+    print("🧪 Testando colunas de texto object...")
+    with tempfile.TemporaryDirectory() as diretorio:
+        path = Path(diretorio) / f'processo{columnar_store.EXTENSION}'
+        df = _processo(1000).astype({COLUNA_PROCESSO: object, 'form_origem': object})
+        df.loc[3, COLUNA_PROCESSO] = None
+        df['misto'] = pd.Series(['x', 1] * 500, dtype=object)
+        columnar_store.write_frame(path, df)
+
+        mapeado = columnar_store.read_frame(path, mapped=True)
+        for coluna in (COLUNA_PROCESSO, 'form_origem'):
+            assert isinstance(mapeado[coluna].dtype, pd.CategoricalDtype), mapeado.dtypes
+            assert _mapeado(mapeado[coluna].array.codes), f"Códigos de {coluna} deveriam estar no arquivo mapeado"
+        assert mapeado[COLUNA_PROCESSO].array.codes[3] == -1
+        # Valores que não são todos strings continuam object
+        assert mapeado['misto'].dtype == object
+
+        for lido in (columnar_store.materialize(mapeado), columnar_store.read_frame(path)):
+            assert list(lido.dtypes) == list(df.dtypes), lido.dtypes
+            assert lido.equals(df)
+    print("   ✅ Códigos mapeados e dtype object restaurado")
+
+
+def test_snapshot_de_outro_processo():
+    """Um processo adota o snapshot gravado por outro, e a busca devolve texto materializado"""
+    print("🧪 Testando snapshot compartilhado entre processos...")
+    diretorio_original = os.getcwd()
+    compartilhado_original = Config.SHARED_SNAPSHOT
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        Config.SHARED_SNAPSHOT = True
+        service = DataLoaderService()
+        try:
+            service.cache.clear_cache()
+            service.cache.set_data({'processo': _processo(10)})
+            assert _mapeado(service.cache.get_data()['processo']['id'].to_numpy()), \
+                "O próprio processo deve servir o snapshot mapeado"
+
+            # Outro worker grava um snapshot novo
+            script = textwrap.dedent(f"""
+                import sys
+                sys.path.insert(0, {SRC!r})
+                import numpy as np, pandas as pd
+                from utils.persistent_data_cache import PersistentDataCache
+                n = 30
+                PersistentDataCache().set_data({{'processo': pd.DataFrame({{
+                    'id': np.arange(1, n + 1, dtype=float),
+                    {COLUNA_PROCESSO!r}: ['0000003-89.2023.8.26.0001'] * n,
+                    'lastpage': np.ones(n),
+                    'form_origem': ['736121'] * n,
+                }})}})
+            """)
+            subprocess.run([sys.executable, '-c', script], check=True, capture_output=True)
+
+            dados = service.cache.get_data()
+            assert len(dados['processo']) == 30 and service.cache.is_cache_valid()
+            assert set(dados['processo']['form_origem'].astype(str)) == {'736121'}
+
+            encontrados = service.filter_by_processo('0000003-89.2023.8.26.0001')
+            coluna = encontrados['processo'][COLUNA_PROCESSO]
+            assert len(coluna) == 30 and isinstance(coluna.dtype, pd.StringDtype), coluna.dtype
+        finally:
+            Config.SHARED_SNAPSHOT = compartilhado_original
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Snapshot de outro processo adotado sem reiniciar")
+
+
+def test_sem_snapshot_compartilhado():
+    """Com SHARED_SNAPSHOT=False o cache volta a ser lido para memória própria, com texto"""
+    print("🧪 Testando cache sem mapeamento...")
+    diretorio_original = os.getcwd()
+    compartilhado_original = Config.SHARED_SNAPSHOT
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        Config.SHARED_SNAPSHOT = False
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            df = _processo(10)
+            cache.set_data({'processo': df})
+            cache.cached_data = {}
+            cache._load_from_disk()
+            lido = cache.get_data()['processo']
+            assert lido.equals(df) and not _mapeado(lido['id'].to_numpy())
+        finally:
+            Config.SHARED_SNAPSHOT = compartilhado_original
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Leitura para memória própria")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do snapshot compartilhado...\n")
+
+    testes = [test_leitura_mapeada, test_texto_em_colunas_object, test_snapshot_de_outro_processo,
+              test_sem_snapshot_compartilhado]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
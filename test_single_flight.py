@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Script de teste do agrupamento de recargas simultâneas (single-flight)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from utils.data_service_optimized import DataLoaderService, SingleFlight
+from lime_stub_server import LimeStubServer, StubSurvey
+
+THREADS = 16
+
+
+def _em_paralelo(funcao):
+    """Executa funcao em THREADS threads liberadas ao mesmo tempo"""
+    barreira = threading.Barrier(THREADS)
+
+    def chamar(_):
+        barreira.wait()
+        return funcao()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(chamar, range(THREADS)))
+
+
+def test_chamadas_agrupadas():
+    """Chamadas simultâneas com a mesma chave executam uma única vez"""
+    print("🧪 Testando agrupamento de chamadas...")
+    flights = SingleFlight()
+    execucoes = []
+
+    def operacao():
+        execucoes.append(1)
+        time.sleep(0.2)
+        return {'resultado': 42}
+
+    resultados = _em_paralelo(lambda: flights.do('chave', operacao))
+
+    assert len(execucoes) == 1, f"{len(execucoes)} execuções"
+    assert all(r is resultados[0] for r in resultados), "Todos devem receber o mesmo resultado"
+    assert flights.snapshot() == {'executed': 1, 'coalesced': THREADS - 1, 'in_flight': 0}, flights.snapshot()
+    print(f"   ✅ 1 execução, {THREADS - 1} chamadas agrupadas")
+
+
+def test_erro_repassado():
+    """Uma falha da execução é repassada a todos os chamadores agrupados"""
+    print("🧪 Testando repasse de erros...")
+    flights = SingleFlight()
+
+    def operacao():
+        time.sleep(0.1)
+        raise RuntimeError('falha simulada')
+
+    def chamar():
+        try:
+            flights.do('chave', operacao)
+        except RuntimeError as e:
+            return str(e)
+
+    assert _em_paralelo(chamar) == ['falha simulada'] * THREADS
+    # Terminada a execução, a chave fica livre para uma nova tentativa
+    assert flights.do('chave', lambda: 'ok') == 'ok'
+    print("   ✅ Erro repassado e chave liberada")
+
+
+def test_disparos_de_recarga():
+    """Disparos simultâneos de recarga resultam em um único carregamento"""
+    print("🧪 Testando disparos simultâneos de recarga...")
+    surveys = {
+        '917441': StubSurvey.synthetic('917441', 60, 5, n_grupos=1, seed=1),
+        '389137': StubSurvey.synthetic('389137', 30, 5, n_grupos=1, seed=2),
+    }
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys, latency=0.05) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = {'processo': ['917441'], 'provas': '389137'}
+            service.cache.clear_cache()
+
+            _em_paralelo(service.start_background_loading)
+            while service.flights.in_flight('reload'):
+                time.sleep(0.05)
+
+            assert stub.calls['export_responses'] == 2, stub.calls
+            assert sum(len(df) for df in service.cache.get_data().values()) == 90
+            snapshot = service.flights.snapshot()
+            assert snapshot['executed'] == 1, snapshot
+            assert snapshot['coalesced'] == THREADS - 1, snapshot
+            print(f"   ✅ 1 carregamento, {snapshot['coalesced']} disparos agrupados")
+        finally:
+            service.cache.clear_cache()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do single-flight...\n")
+
+    testes = [test_chamadas_agrupadas, test_erro_repassado, test_disparos_de_recarga]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Script de teste dos snapshots do cache servidos durante o recarregamento
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from datetime import datetime
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from config.settings import Config
+from utils.persistent_data_cache import PersistentDataCache
+from utils.data_service_optimized import DataLoaderService
+from callbacks.main_callbacks import create_data_status_component
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_IDS = {'processo': ['917441', '736121'], 'reu': ['286476'], 'provas': '389137'}
+
+
+def test_geracoes_do_snapshot():
+    """Cada troca publica um snapshot novo, e o anterior continua intacto para quem o lê"""
+    print("🧪 Testando gerações do snapshot...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        cache = PersistentDataCache()
+        try:
+            cache.clear_cache()
+            cache.set_data({'processo': pd.DataFrame({'id': [1.0, 2.0], 'form_origem': ['1', '1']})})
+            anterior = cache.snapshot()
+            assert anterior.last_update and len(anterior.data['processo']) == 2
+
+            cache.publish_survey('processo', '2', pd.DataFrame({'id': [1.0], 'form_origem': ['2']}))
+            atual = cache.snapshot()
+            assert atual.generation == anterior.generation + 1 and atual.last_update == anterior.last_update
+            assert len(atual.data['processo']) == 3 and len(anterior.data['processo']) == 2
+
+            # Só o horário muda: mesma geração
+            cache.last_update = datetime(2000, 1, 1)
+            assert cache.generation == atual.generation and not cache.is_cache_valid()
+
+            # A geração vai para os metadados e é adotada por quem lê o disco
+            cache.set_data(cache.get_data())
+            gravada = cache.generation
+            cache.cached_data = {}
+            cache._load_from_disk()
+            assert cache.generation == gravada and len(cache.get_data()['processo']) == 3
+
+            # Pedido de carga completa não descarta os dados servidos
+            cache.request_full_sync()
+            assert cache.full_sync_due() and cache.is_cache_valid() and cache.get_data()
+        finally:
+            cache.clear_cache()
+            os.chdir(diretorio_original)
+    print("   ✅ Gerações crescentes e snapshots anteriores preservados")
+
+
+def test_recarga_forcada_serve_dados_antigos():
+    """force_reload baixa tudo de novo sem deixar as buscas sem dados"""
+    print("🧪 Testando recarga forçada com dados antigos servidos...")
+    surveys = {
+        sid: StubSurvey.synthetic(sid, 20 * (i + 1), 4, n_grupos=1, seed=i)
+        for i, sid in enumerate(['917441', '736121', '286476', '389137'])
+    }
+    total = sum(20 * (i + 1) for i in range(4))
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = SURVEY_IDS
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            assert service.start_background_loading()
+            while service.flights.in_flight('reload'):
+                time.sleep(0.02)
+            inicial = service.cache.snapshot()
+            assert sum(len(df) for df in inicial.data.values()) == total
+
+            # Leitores contínuos durante a recarga: nunca um cache vazio ou incompleto
+            stub.latency = 0.05
+            exportacoes = stub.calls['export_responses']
+            lidos, vistos, durante = [], set(), []
+            parar = threading.Event()
+
+            def ler():
+                while not parar.is_set():
+                    snapshot = service.cache.snapshot()
+                    lidos.append(sum(len(df) for df in snapshot.data.values()))
+                    vistos.add(snapshot.generation)
+                    time.sleep(0.005)
+
+            leitor = threading.Thread(target=ler)
+            leitor.start()
+            assert service.force_reload()
+            while service.flights.in_flight('reload'):
+                durante.append(service.get_cached_data())
+                time.sleep(0.02)
+            parar.set()
+            leitor.join()
+
+            assert lidos and all(n == total for n in lidos), sorted(set(lidos))
+            assert stub.calls['export_responses'] - exportacoes == len(surveys), "Recarga forçada é completa"
+            final = service.cache.snapshot()
+            assert final.generation > inicial.generation and final.last_update > inicial.last_update
+            assert service.cache.last_full_sync == final.last_update
+
+            # Status durante a recarga: dados antigos, idade e atualização em andamento
+            assert any(s['refreshing'] for s in durante)
+            status = next(s for s in durante if s['refreshing'] and s['is_loading'])
+            status.update(has_data=True, total_respostas=total, categorias={})
+            texto = str(create_data_status_component(status))
+            assert 'Dados carregados com sucesso!' in texto and 'Atualização em andamento' in texto, texto
+            assert f"geração {status['generation']}" in texto
+            assert not service.get_cached_data()['refreshing']
+        finally:
+            stub.latency = 0.0
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print(f"   ✅ {len(lidos)} leituras durante a recarga, todas com {total} respostas")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes dos snapshots do cache...\n")
+
+    testes = [test_geracoes_do_snapshot, test_recarga_forcada_serve_dados_antigos]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Script de teste do catálogo de surveys
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import Config
+from data.lime_api import LimeSurveyAPI
+from utils.survey_catalog import SurveyCatalog, survey_tasks_from
+from utils.data_service_optimized import DataLoaderService
+from lime_stub_server import LimeStubServer, StubSurvey
+
+SURVEY_IDS = {'processo': ['917441', '736121'], 'reu': '286476', 'provas': '389137'}
+
+
+def _surveys() -> dict:
+    surveys = {
+        sid: StubSurvey.synthetic(sid, 10 * (i + 1), 3, n_grupos=1, seed=i)
+        for i, sid in enumerate(['917441', '736121', '286476', '389137'])
+    }
+    surveys['917441'].title = 'Processos <b>2024</b>'
+    surveys['389137'].properties['active'] = 'N'
+    return surveys
+
+
+def test_consulta_paralela_e_validade():
+    """Surveys consultados em paralelo, reaproveitados dentro da validade e lidos do disco"""
+    print("🧪 Testando consulta e validade do catálogo...")
+    surveys = _surveys()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(surveys, latency=0.1) as stub:
+        Config.LIME_API_URL = stub.url
+        api = LimeSurveyAPI()
+        try:
+            catalogo = SurveyCatalog(cache_dir=diretorio, ttl=60)
+            tasks = survey_tasks_from(SURVEY_IDS)
+            inicio = time.perf_counter()
+            entradas = catalogo.refresh(lambda: api, tasks)
+            duracao = time.perf_counter() - inicio
+            # Em sequência seriam 12 chamadas de 100 ms
+            assert duracao < 0.9, f"Consultas deveriam ser paralelas ({duracao:.2f}s)"
+            assert entradas['917441']['title'] == 'Processos 2024'
+            assert entradas['736121']['completed_responses'] == '20'
+            assert not entradas['389137']['active'] and entradas['286476']['active']
+
+            # Dentro da validade: nenhuma chamada nova, inclusive por get_survey_info
+            chamadas = dict(stub.calls)
+            api.catalog = catalogo
+            api.survey_ids = SURVEY_IDS
+            info = api.get_survey_info()
+            assert [s['title'] for s in info['processo']] == ['Processos 2024', 'Survey 736121']
+            assert info['provas'][0]['active'] == 'N' and info['reu'][0]['responses'] == 30
+            assert all(stub.calls[m] == chamadas.get(m) for m in
+                       ('get_summary', 'get_survey_properties', 'get_language_properties'))
+
+            # Outra instância lê o catálogo gravado em disco
+            assert SurveyCatalog(cache_dir=diretorio, ttl=60).get('286476')['completed_responses'] == '30'
+
+            # Atualização forçada: o título só é consultado de novo se o survey foi modificado
+            surveys['736121'].properties['lastmodified'] = '2024-06-01 10:00:00'
+            surveys['736121'].title = 'Processos antigos'
+            titulos = stub.calls['get_language_properties']
+            entradas = catalogo.refresh(lambda: api, tasks, force=True)
+            assert stub.calls['get_language_properties'] == titulos + 1
+            assert entradas['736121']['title'] == 'Processos antigos'
+
+            # Vencida a validade, a entrada deixa de ser usada
+            assert SurveyCatalog(cache_dir=diretorio, ttl=0).get('917441') is None
+        finally:
+            api.sessions.shutdown()
+    print(f"   ✅ 4 surveys consultados em {duracao:.2f}s e reaproveitados")
+
+
+def test_carga_usa_o_catalogo():
+    """A sondagem do carregador atualiza o catálogo e os mapas de perguntas reaproveitam a data de modificação"""
+    print("🧪 Testando uso do catálogo pelo carregador...")
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio, LimeStubServer(_surveys()) as stub:
+        os.chdir(diretorio)
+        Config.LIME_API_URL = stub.url
+        service = DataLoaderService()
+        try:
+            service.lime_api.survey_ids = SURVEY_IDS
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service._load_all_data()
+            # Uma consulta de propriedades por survey: a da sondagem
+            assert stub.calls['get_survey_properties'] == 4, dict(stub.calls)
+            assert os.path.exists(os.path.join('data_cache', 'survey_catalog.json'))
+
+            status = service.get_cached_data()
+            catalogo = {e['survey_id']: e for e in status['catalog']}
+            assert catalogo['917441']['title'] == 'Processos 2024'
+            assert sum(len(df) for df in status['data'].values()) == 100
+
+            # Segunda carga: surveys inalterados segundo o catálogo, nada exportado
+            exportacoes = stub.calls['export_responses']
+            service._load_all_data()
+            assert stub.calls['export_responses'] == exportacoes
+            assert service.last_probe_stats['skipped'] == 4, service.last_probe_stats
+        finally:
+            service.cache.clear_cache()
+            service.lime_api.catalog.clear()
+            service.lime_api.sessions.shutdown()
+            os.chdir(diretorio_original)
+    print("   ✅ Sondagem pelo catálogo, sem consultas extras de propriedades")
+
+
+if __name__ == "__main__":
+    print("🚀 Iniciando testes do catálogo de surveys...\n")
+
+    testes = [test_consulta_paralela_e_validade, test_carga_usa_o_catalogo]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            falhas += 1
+            print(f"   ❌ {teste.__name__}: {e}")
+
+    if falhas:
+        print(f"\n⚠️  {falhas} teste(s) falharam.")
+    else:
+        print("\n🎉 Todos os testes passaram!")